@@ -0,0 +1,824 @@
+# FILE: bin/batik_db.py
+# ================================================================
+# BATIK STORAGE ENGINE (SQLite)
+# Satu modul penyimpanan untuk robot_pmdt, robot_maru & dashboard:
+# koneksi dipakai ulang, prepared statement di-cache, satu transaksi
+# per capture stasiun, busy_timeout agar tidak bentrok lock.
+# ================================================================
+
+import os
+import sys
+import atexit
+import sqlite3
+import hashlib
+import re
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from collections import OrderedDict
+from itertools import chain
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import config
+import batik_parser
+import batik_delta
+
+try:
+    import lzma
+    HAS_LZMA = True
+except ImportError:
+    HAS_LZMA = False
+
+BUSY_TIMEOUT_MS = 5000
+STATEMENT_CACHE = 128 # jumlah prepared statement yang disimpan sqlite3 per koneksi
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS sessions (id INTEGER PRIMARY KEY AUTOINCREMENT, station_name TEXT, timestamp DATETIME, evidence_path TEXT, raw_clipboard TEXT, tx_fwd_power TEXT, tx_ref_power TEXT, tx_status TEXT, raw_header_hash TEXT, raw_hash TEXT)",
+    "CREATE TABLE IF NOT EXISTS measurements (id INTEGER PRIMARY KEY AUTOINCREMENT, session_id INTEGER, parameter_name TEXT, value_mon1 TEXT, value_mon2 TEXT, FOREIGN KEY(session_id) REFERENCES sessions(id))",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_station_ts ON sessions (station_name, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_measurements_session ON measurements (session_id)",
+]
+# Deret waktu numerik: satu baris per (session, parameter), nilai REAL siap query
+SERIES_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS series (session_id INTEGER NOT NULL, station_name TEXT NOT NULL, parameter_name TEXT NOT NULL, ts DATETIME NOT NULL, mon1 REAL, mon2 REAL, unit TEXT, PRIMARY KEY (session_id, parameter_name))",
+    # Indeks covering: query riwayat satu parameter tidak perlu menyentuh tabel
+    "CREATE INDEX IF NOT EXISTS idx_series_station_param_ts ON series (station_name, parameter_name, ts, mon1, mon2)",
+]
+BACKFILL_CHUNK = 5000
+# Backfill data lama yang dijadwalkan migrasi; dijalankan berurutan (rollup setelah series)
+BACKFILL_TASKS = ["series", "raw", "rollups", "fts"]
+BACKFILL_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS pending_backfill (task TEXT PRIMARY KEY, position INTEGER NOT NULL DEFAULT 0, upto INTEGER)",
+]
+CAPTURE_PAIR_S = 60 # backfill: jarak maks session Monitor & Transmitter PMDT dari satu capture
+
+# Agregat per jam & per hari (station, parameter, monitor); diperbarui di transaksi insert yang sama
+ROLLUP_PERIODS = {"hourly": 13, "daily": 10} # panjang prefix ts: "YYYY-mm-dd HH" / "YYYY-mm-dd"
+ROLLUP_SCHEMA = [
+    f"CREATE TABLE IF NOT EXISTS rollup_{name} (station_name TEXT NOT NULL, parameter_name TEXT NOT NULL, monitor INTEGER NOT NULL, bucket TEXT NOT NULL, "
+    "n INTEGER NOT NULL, vmin REAL, vmax REAL, vsum REAL, last_ts DATETIME, vlast REAL, PRIMARY KEY (station_name, parameter_name, monitor, bucket)) WITHOUT ROWID"
+    for name in ROLLUP_PERIODS
+]
+SQL_UPSERT_ROLLUP = {
+    name: f"INSERT INTO rollup_{name} VALUES (?, ?, ?, substr(?, 1, {width}), 1, ?, ?, ?, ?, ?) "
+          "ON CONFLICT (station_name, parameter_name, monitor, bucket) DO UPDATE SET "
+          "n = n + 1, vmin = min(vmin, excluded.vmin), vmax = max(vmax, excluded.vmax), vsum = vsum + excluded.vsum, "
+          "vlast = CASE WHEN excluded.last_ts >= last_ts THEN excluded.vlast ELSE vlast END, last_ts = max(last_ts, excluded.last_ts)"
+    for name, width in ROLLUP_PERIODS.items()
+}
+
+# Teks mentah disimpan sekali per isi (hash), terkompresi. Session hanya menyimpan hash-nya.
+# Header RMS PMDT dipisah dari isi agar session Monitor & Transmitter berbagi satu blob header.
+RAW_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS raw_blobs (hash TEXT PRIMARY KEY, codec TEXT NOT NULL, size INTEGER NOT NULL, data BLOB NOT NULL)",
+]
+RAW_CODEC = "zlib" # "zlib" (cepat) atau "lzma" (lebih kecil, lebih lambat)
+RAW_HEADER_END = batik_parser._RAW_MARKER + "\n" + "=" * 40 + "\n" # akhir header RMS dari robot_pmdt
+
+# Indeks teks penuh (FTS5) atas isi raw_blobs. Contentless: teks tetap hanya tersimpan terkompresi
+# di raw_blobs, rowid FTS = rowid blob. Snippet dibuat di Python dari teks yang didekompresi.
+FTS_SCHEMA = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS raw_fts USING fts5(body, content='')",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_raw_hash ON sessions (raw_hash)",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_raw_header_hash ON sessions (raw_header_hash)",
+]
+SNIPPET_WIDTH = 60
+FTS_OPERATORS = {"AND", "OR", "NOT", "NEAR"}
+
+# Arsip per tahun: data/archive/batik_{tahun}.db (mirip sheet RAW_{tool}_{tahun})
+ARCHIVE_SUBDIR = "archive"
+ARCHIVE_KEEP_DAYS = 365
+MAX_ATTACHED = 8 # batas SQLite default 10 database ter-ATTACH
+ARCHIVE_TABLES = ["sessions", "measurements", "series", "raw_blobs"]
+
+# Kolom yang ditambahkan belakangan (DB lama dari robot_maru belum punya)
+SESSION_EXTRA_COLS = ["tx_fwd_power", "tx_ref_power", "tx_status", "raw_header_hash", "raw_hash"]
+
+SQL_INSERT_SESSION = "INSERT INTO sessions (station_name, timestamp, evidence_path, raw_header_hash, raw_hash, tx_fwd_power, tx_ref_power, tx_status) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+SQL_INSERT_MEASUREMENT = "INSERT INTO measurements (session_id, parameter_name, value_mon1, value_mon2) VALUES (?, ?, ?, ?)"
+SQL_INSERT_BLOB = "INSERT OR IGNORE INTO raw_blobs (hash, codec, size, data) VALUES (?, ?, ?, ?)"
+SQL_INSERT_SERIES = "INSERT OR REPLACE INTO series (session_id, station_name, parameter_name, ts, mon1, mon2, unit) VALUES (?, ?, ?, ?, ?, ?, ?)"
+
+def measurement_rows(parsed):
+    """
+    Hasil parse -> [(parameter, mon1, mon2)].
+    Terima list ParamRow batik_parser, dict PMDT '{param} (Mon1)/(Mon2)',
+    atau dict MARU 'param: nilai' (nilai masuk Monitor 1).
+    """
+    if not parsed: return []
+    if isinstance(parsed, list): return [(r[0], r[1], r[2]) for r in parsed]
+    if not any("(Mon1)" in k or "(Mon2)" in k for k in parsed):
+        return [(k, v, "-") for k, v in parsed.items()]
+
+    merged = {}
+    for full_key, val in parsed.items():
+        base_name = full_key.replace(" (Mon1)", "").replace(" (Mon2)", "")
+        slot = merged.setdefault(base_name, ["-", "-"])
+        if "(Mon1)" in full_key: slot[0] = val
+        elif "(Mon2)" in full_key: slot[1] = val
+    return [(k, m1, m2) for k, (m1, m2) in merged.items()]
+
+def parser_rows(station, raw):
+    """
+    Teks capture -> ParamRow batik_parser (baris yang sama dengan yang dikirim robot ke sheet).
+    Dipakai untuk mengisi ulang series dari raw; [] jika teks kosong.
+    """
+    if not raw: return []
+    tool = batik_delta.station_tool_type(station)
+    func = batik_parser.parse_maru_data if tool in batik_delta.MARU_TYPES else batik_parser.parse_pmdt_strict
+    return func(tool, raw)[0]
+
+def _same_capture(group, station, ts):
+    """Backfill: session berikutnya adalah Transmitter dari capture PMDT yang sama dengan group?"""
+    first_station, first_ts = group[0][1], group[0][2]
+    if len(group) > 1 or station != first_station or batik_delta.station_tool_type(station) in batik_delta.MARU_TYPES: return False
+    try: return abs((datetime.fromisoformat(ts) - datetime.fromisoformat(first_ts)).total_seconds()) <= CAPTURE_PAIR_S
+    except (TypeError, ValueError): return ts == first_ts
+
+def _numeric(val):
+    """Nilai teks monitor -> (float atau None, satuan)."""
+    num, unit, status = batik_parser.parse_numeric(batik_parser.normalize_with_unit(val))
+    return (num, unit) if status == batik_parser.STATUS_NUMERIC else (None, "")
+
+def series_rows(session_id, station, ts, rows):
+    """[(parameter, mon1, mon2)] -> baris tabel series (hanya yang punya angka)."""
+    out = []
+    for param, m1, m2 in rows:
+        v1, u1 = _numeric(m1)
+        v2, u2 = _numeric(m2)
+        if v1 is None and v2 is None: continue
+        out.append((session_id, station, param, ts, v1, v2, u1 or u2))
+    return out
+
+# --- RAW BLOB (content-addressed) ---
+def raw_hash(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+def pack_raw(text, codec=RAW_CODEC):
+    data = text.encode("utf-8")
+    if codec == "lzma" and HAS_LZMA: return "lzma", lzma.compress(data, preset=6)
+    return "zlib", zlib.compress(data, 9)
+
+def unpack_raw(codec, data):
+    if codec == "lzma": return lzma.decompress(data).decode("utf-8")
+    return zlib.decompress(data).decode("utf-8")
+
+def split_raw(text):
+    """Pisah header RMS PMDT dari isi capture. Return (header atau None, isi); header + isi == text."""
+    pos = text.find(RAW_HEADER_END)
+    if pos < 0: return None, text
+    end = pos + len(RAW_HEADER_END)
+    while end < len(text) and text[end] == "\n": end += 1
+    return text[:end], text[end:]
+
+def rollup_rows(series):
+    """Baris series -> parameter upsert rollup (satu per monitor yang berisi angka)."""
+    out = []
+    for _, station, param, ts, v1, v2, _ in series:
+        if v1 is not None: out.append((station, param, 1, ts, v1, v1, v1, ts, v1))
+        if v2 is not None: out.append((station, param, 2, ts, v2, v2, v2, ts, v2))
+    return out
+
+def _fts5_available(conn):
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+def make_snippet(text, query, width=SNIPPET_WIDTH):
+    """Potongan teks di sekitar kata query pertama yang ditemukan, kata yang cocok ditandai [..]."""
+    phrases = [r"\W+".join(map(re.escape, re.findall(r"\w+", p))) for p in re.findall(r'"([^"]+)"', query)]
+    terms = [re.escape(t) for t in re.findall(r"\w+", query) if t.upper() not in FTS_OPERATORS]
+    if not terms: return ""
+    pattern = re.compile("|".join([p for p in phrases if p] + sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    match = None
+    for p in phrases + [None]: # utamakan frasa utuh, baru kata lepas
+        match = re.search(p, text, re.IGNORECASE) if p else pattern.search(text)
+        if match: break
+    if not match: return ""
+    start, end = max(0, match.start() - width), min(len(text), match.end() + width)
+    snippet = re.sub(r"\s+", " ", text[start:end]).strip()
+    snippet = pattern.sub(lambda m: f"[{m.group(0)}]", snippet)
+    return ("..." if start else "") + snippet + ("..." if end < len(text) else "")
+
+def _schema_ddl(stmt, schema):
+    """DDL tabel/indeks untuk database ter-ATTACH: 'IF NOT EXISTS x' -> 'IF NOT EXISTS schema.x'."""
+    return stmt.replace("IF NOT EXISTS ", f"IF NOT EXISTS {schema}.", 1)
+
+def _ts_str(value):
+    return value.strftime("%Y-%m-%d %H:%M:%S") if isinstance(value, datetime) else str(value)
+
+class BatikDB:
+    def __init__(self, db_path=None, busy_timeout_ms=BUSY_TIMEOUT_MS, raw_codec=RAW_CODEC):
+        self.db_path = db_path or config.DB_PATH
+        self.raw_codec = raw_codec
+        self.busy_timeout = busy_timeout_ms / 1000.0
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        # isolation_level=None: transaksi diatur sendiri lewat transaction()
+        self.conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, isolation_level=None,
+                                    check_same_thread=False, cached_statements=STATEMENT_CACHE)
+        self.lock = threading.RLock()
+        self.archive_dir = os.path.join(os.path.dirname(os.path.abspath(self.db_path)), ARCHIVE_SUBDIR)
+        self.attached = OrderedDict() # tahun -> nama schema, urut LRU
+        self.write_seq = 0
+        self.has_fts = _fts5_available(self.conn) # modul FTS5 ada di build SQLite ini
+        self.fts_live = False # raw_fts siap diisi saat insert (setelah migrasi)
+        self.conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.migrate()
+        self.fts_live = self.has_fts and bool(self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'raw_fts'").fetchone())
+
+    def migrate(self):
+        """
+        Bawa schema ke SCHEMA_VERSION. Jalur normal = satu baca PRAGMA user_version.
+        Migrasi (hanya DDL, data lama lewat run_backfills) dijalankan berurutan dalam SATU transaksi,
+        versi dicek ulang setelah lock didapat agar dua robot tidak migrasi bersamaan.
+        Return daftar versi yang diterapkan.
+        """
+        with self.lock:
+            if self.conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION: return []
+            applied = []
+            for _ in self.iter_archives(): pass # arsip lama di-upgrade dulu; ATTACH harus di luar transaksi
+            with self.transaction() as cur:
+                current = cur.execute("PRAGMA user_version").fetchone()[0]
+                for version, _, func in MIGRATIONS:
+                    if version <= current: continue
+                    func(self, cur)
+                    applied.append(version)
+                cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            return applied
+
+    def pending_backfills(self):
+        """Backfill data yang dijadwalkan migrasi dan belum selesai: [(task, posisi, upto)] urut BACKFILL_TASKS."""
+        with self.lock:
+            rows = dict((r[0], r) for r in self.conn.execute("SELECT task, position, upto FROM pending_backfill"))
+        return [rows[t] for t in BACKFILL_TASKS if t in rows]
+
+    def run_backfills(self, log=print):
+        """
+        Jalankan backfill tertunda (lihat BACKFILL_TASKS) bertahap, satu transaksi per chunk.
+        Posisi disimpan di transaksi chunk yang sama, jadi bisa dilanjutkan jika terputus. Return {task: jumlah}.
+        """
+        done = {}
+        for task, position, upto in self.pending_backfills():
+            def save(cur, pos, upto=None, task=task):
+                cur.execute("UPDATE pending_backfill SET position = ?, upto = COALESCE(?, upto) WHERE task = ?", (pos, upto, task))
+            if log: log(f">>> Backfill {task}...")
+            if task == "series": done[task] = self.backfill_series(position, save)
+            elif task == "raw": done[task] = self.migrate_raw()
+            elif task == "rollups": done[task] = self.rebuild_rollups()
+            elif task == "fts": done[task] = self.reindex_fts("main", position if upto else 0, upto, save) if self.has_fts else 0
+            with self.transaction() as cur: cur.execute("DELETE FROM pending_backfill WHERE task = ?", (task,))
+        return done
+
+    def backfill_series(self, after_id=0, on_chunk=None):
+        """
+        Bangun ulang tabel series dari teks mentah session, diparse ulang dengan batik_parser.
+        Session Monitor + Transmitter PMDT satu capture (stasiun sama, berurutan, selisih
+        <= CAPTURE_PAIR_S) digabung seperti di robot; series menempel di session pertama.
+        Satu transaksi per BACKFILL_CHUNK session (urut id, mulai setelah after_id);
+        on_chunk(cur, id terakhir) dipanggil di dalam transaksi itu. Return jumlah baris.
+        """
+        with self.lock:
+            has_blobs = self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'raw_blobs'").fetchone()
+        blob_cols = "raw_header_hash, raw_hash" if has_blobs else "NULL, NULL"
+        sql = (f"SELECT id, station_name, timestamp, raw_clipboard, {blob_cols} FROM sessions "
+               "WHERE id > ? ORDER BY id LIMIT ?")
+        total, last_id = 0, after_id
+        while True:
+            with self.transaction() as cur:
+                chunk = cur.execute(sql, (last_id, BACKFILL_CHUNK)).fetchall()
+                if not chunk: return total
+                groups = []
+                for sid, station, ts, raw, header_hash, body_hash in chunk:
+                    if ts is None: continue
+                    if raw is None and body_hash is not None:
+                        raw = self.load_blob(header_hash) + self.load_blob(body_hash)
+                    if groups and _same_capture(groups[-1], station, ts): groups[-1].append((sid, station, ts, raw))
+                    else: groups.append([(sid, station, ts, raw)])
+                # capture terakhir bisa berlanjut ke chunk berikutnya -> diproses ulang di sana
+                end_id = chunk[-1][0]
+                if len(chunk) == BACKFILL_CHUNK and len(groups) > 1: end_id = groups.pop()[0][0] - 1
+                rows = []
+                for group in groups:
+                    sid, station, ts = group[0][:3]
+                    raw = "\n\n".join(r[3] for r in group if r[3])
+                    rows.extend(series_rows(sid, station, ts, measurement_rows(parser_rows(station, raw))))
+                cur.execute("DELETE FROM series WHERE session_id > ? AND session_id <= ?", (last_id, end_id))
+                cur.executemany(SQL_INSERT_SERIES, rows)
+                if on_chunk: on_chunk(cur, end_id)
+            total += len(rows)
+            last_id = end_id
+
+    def update_rollups(self, cur, series):
+        rows = rollup_rows(series)
+        if not rows: return
+        for sql in SQL_UPSERT_ROLLUP.values(): cur.executemany(sql, rows)
+
+    def rebuild_rollups(self):
+        """
+        Hitung ulang semua rollup dari tabel series (DB utama + arsip). Return jumlah nilai yang diproses.
+        Rollup dikosongkan bersama pencatatan id session terakhir; session yang masuk sesudahnya
+        sudah di-upsert oleh robot, sisanya diisi ulang per BACKFILL_CHUNK baris series (satu
+        transaksi per chunk). Arsip dibaca lewat koneksi terpisah per tahun.
+        """
+        for _ in self.iter_archives(): pass # pastikan schema arsip sudah terbaru
+        with self.transaction() as cur:
+            for name in ROLLUP_PERIODS: cur.execute(f"DELETE FROM rollup_{name}")
+            upto = cur.execute("SELECT MAX(COALESCE((SELECT MAX(id) FROM sessions), 0), "
+                               "COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'sessions'), 0))").fetchone()[0]
+        total = 0
+        for year in self.archive_years():
+            conn = sqlite3.connect(self.archive_path(year), timeout=self.busy_timeout)
+            try: total += self._rollup_from(conn, upto)
+            finally: conn.close()
+        with self.lock: return total + self._rollup_from(self.conn, upto)
+
+    def _rollup_from(self, conn, upto):
+        sql = ("SELECT session_id, station_name, parameter_name, ts, mon1, mon2, unit FROM series "
+               "WHERE session_id <= ? AND (session_id, parameter_name) > (?, ?) ORDER BY session_id, parameter_name LIMIT ?")
+        total, key = 0, (0, "")
+        while True:
+            chunk = conn.execute(sql, (upto,) + key + (BACKFILL_CHUNK,)).fetchall()
+            if not chunk: return total
+            with self.transaction() as cur: self.update_rollups(cur, chunk)
+            total += len(chunk)
+            key = (chunk[-1][0], chunk[-1][2])
+
+    def store_raw(self, cur, text):
+        """Simpan teks mentah (dedup + kompresi). Return (hash header, hash isi)."""
+        if text is None: return None, None
+        header, body = split_raw(text)
+        hashes = []
+        for part in (header, body):
+            if part is None:
+                hashes.append(None)
+                continue
+            h = raw_hash(part)
+            if not cur.execute("SELECT 1 FROM raw_blobs WHERE hash = ?", (h,)).fetchone():
+                codec, data = pack_raw(part, self.raw_codec)
+                cur.execute(SQL_INSERT_BLOB, (h, codec, len(part), data))
+                if self.fts_live: cur.execute("INSERT INTO raw_fts (rowid, body) VALUES (?, ?)", (cur.lastrowid, part))
+            hashes.append(h)
+        return hashes[0], hashes[1]
+
+    def load_blob(self, h, schema="main"):
+        if h is None: return ""
+        with self.lock:
+            row = self.conn.execute(f"SELECT codec, data FROM {schema}.raw_blobs WHERE hash = ?", (h,)).fetchone()
+        return unpack_raw(row[0], row[1]) if row else ""
+
+    def get_raw(self, session_id):
+        """Teks mentah lengkap satu session (dari raw_blobs, atau kolom raw_clipboard lama); ikut cari di arsip."""
+        with self.lock:
+            for schema in chain(["main"], self.iter_archives()):
+                row = self.conn.execute(f"SELECT raw_clipboard, raw_header_hash, raw_hash FROM {schema}.sessions WHERE id = ?", (session_id,)).fetchone()
+                if not row: continue
+                if row[0] is not None or row[2] is None: return row[0]
+                return self.load_blob(row[1], schema) + self.load_blob(row[2], schema)
+        return None
+
+    def migrate_raw(self):
+        """Pindahkan sessions.raw_clipboard ke raw_blobs, satu transaksi per BACKFILL_CHUNK session. Return jumlah session."""
+        total, last_id = 0, 0
+        while True:
+            with self.transaction() as cur:
+                chunk = cur.execute("SELECT id, raw_clipboard FROM sessions WHERE id > ? AND raw_clipboard IS NOT NULL ORDER BY id LIMIT ?",
+                                    (last_id, BACKFILL_CHUNK)).fetchall()
+                if not chunk: return total
+                updates = [self.store_raw(cur, raw) + (sid,) for sid, raw in chunk]
+                cur.executemany("UPDATE sessions SET raw_header_hash = ?, raw_hash = ?, raw_clipboard = NULL WHERE id = ?", updates)
+            last_id = chunk[-1][0]
+            total += len(chunk)
+
+    def prune_blobs(self):
+        """Hapus blob yang tidak dirujuk session mana pun (beserta entri FTS-nya). Return jumlah blob."""
+        orphan = ("FROM raw_blobs WHERE hash NOT IN (SELECT raw_hash FROM sessions WHERE raw_hash IS NOT NULL "
+                  "UNION SELECT raw_header_hash FROM sessions WHERE raw_header_hash IS NOT NULL)")
+        with self.transaction() as cur:
+            if self.fts_live:
+                # FTS contentless: hapus entri wajib menyertakan teks aslinya
+                for rowid, codec, data in cur.execute(f"SELECT rowid, codec, data {orphan}").fetchall():
+                    cur.execute("INSERT INTO raw_fts (raw_fts, rowid, body) VALUES ('delete', ?, ?)", (rowid, unpack_raw(codec, data)))
+            cur.execute(f"DELETE {orphan}")
+            return cur.rowcount
+
+    # --- PENCARIAN TEKS PENUH (FTS5) ---
+    def index_fts(self, cur, schema="main", after_rowid=0):
+        """Masukkan blob dengan rowid > after_rowid ke raw_fts schema tersebut. Return jumlah blob."""
+        total = 0
+        reader = self.conn.cursor()
+        reader.execute(f"SELECT rowid, codec, data FROM {schema}.raw_blobs WHERE rowid > ? ORDER BY rowid", (after_rowid,))
+        while True:
+            chunk = reader.fetchmany(BACKFILL_CHUNK // 10)
+            if not chunk: return total
+            cur.executemany(f"INSERT INTO {schema}.raw_fts (rowid, body) VALUES (?, ?)",
+                            [(rowid, unpack_raw(codec, data)) for rowid, codec, data in chunk])
+            total += len(chunk)
+
+    def reindex_fts(self, schema="main", after_rowid=0, upto=None, on_chunk=None):
+        """
+        Isi ulang raw_fts satu schema, satu transaksi per chunk blob. after_rowid=0: kosongkan dulu
+        dan catat rowid blob terakhir (blob sesudahnya sudah diindeks saat insert).
+        on_chunk(cur, rowid terakhir, upto) dipanggil di dalam transaksi tiap chunk. Return jumlah blob.
+        """
+        if not after_rowid:
+            with self.transaction() as cur:
+                cur.execute(f"INSERT INTO {schema}.raw_fts (raw_fts) VALUES ('delete-all')")
+                upto = cur.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {schema}.raw_blobs").fetchone()[0]
+                if on_chunk: on_chunk(cur, 0, upto)
+        total, last = 0, after_rowid
+        while True:
+            with self.transaction() as cur:
+                chunk = cur.execute(f"SELECT rowid, codec, data FROM {schema}.raw_blobs WHERE rowid > ? AND rowid <= ? ORDER BY rowid LIMIT ?",
+                                    (last, upto, max(1, BACKFILL_CHUNK // 10))).fetchall()
+                if not chunk: return total
+                cur.executemany(f"INSERT INTO {schema}.raw_fts (rowid, body) VALUES (?, ?)",
+                                [(rowid, unpack_raw(codec, data)) for rowid, codec, data in chunk])
+                last = chunk[-1][0]
+                if on_chunk: on_chunk(cur, last, upto)
+            total += len(chunk)
+
+    def rebuild_fts(self):
+        """Bangun ulang raw_fts di DB utama dan semua arsip. Return jumlah blob terindeks."""
+        if not self.has_fts: raise RuntimeError("SQLite tanpa FTS5")
+        total = 0
+        with self.lock:
+            with self.transaction() as cur:
+                for stmt in FTS_SCHEMA: cur.execute(stmt) # DB yang dimigrasi tanpa FTS5
+            self.fts_live = True
+            for schema in chain(["main"], self.iter_archives()): # ATTACH di luar transaksi
+                total += self.reindex_fts(schema)
+        return total
+
+    def search_raw(self, query, limit=20, station=None, start=None, end=None):
+        """
+        Cari session yang teks mentahnya cocok dengan query FTS5 (mis. '"Antenna Fault"', 'alarm NOT normal').
+        Header RMS & isi capture diindeks terpisah. Return list dict terbaru dulu:
+        {session_id, station, timestamp, snippet}.
+        """
+        if not self.fts_live: raise RuntimeError("SQLite tanpa FTS5")
+        where, args = "", []
+        if station:
+            where += " AND s.station_name = ?"
+            args.append(station)
+        if start is not None:
+            where += " AND s.timestamp >= ?"
+            args.append(_ts_str(start))
+        if end is not None:
+            where += " AND s.timestamp <= ?"
+            args.append(_ts_str(end))
+        hits = []
+        with self.lock:
+            for schema in chain(["main"], self.iter_archives(start, end)):
+                sql = (f"WITH hit AS (SELECT hash FROM {schema}.raw_blobs WHERE rowid IN (SELECT rowid FROM {schema}.raw_fts WHERE raw_fts MATCH ?)) "
+                       f"SELECT s.id, s.station_name, s.timestamp FROM {schema}.sessions s "
+                       f"WHERE (s.raw_hash IN hit OR s.raw_header_hash IN hit){where} ORDER BY s.timestamp DESC, s.id DESC LIMIT ?")
+                hits.extend(self.conn.execute(sql, [query] + args + [limit]).fetchall())
+        hits.sort(key=lambda r: (r[2] or "", r[0]), reverse=True)
+        return [{"session_id": sid, "station": st, "timestamp": ts, "snippet": make_snippet(self.get_raw(sid) or "", query)}
+                for sid, st, ts in hits[:limit]]
+
+    def compact(self):
+        """Migrasi sisa raw lama, buang blob yatim, lalu VACUUM."""
+        moved = self.migrate_raw()
+        pruned = self.prune_blobs()
+        with self.lock: self.conn.execute("VACUUM")
+        return moved, pruned
+
+    @contextmanager
+    def transaction(self):
+        """BEGIN IMMEDIATE ... COMMIT; rollback otomatis jika ada error. Boleh bersarang."""
+        with self.lock:
+            cur = self.conn.cursor()
+            if self.conn.in_transaction:
+                yield cur
+                return
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                yield cur
+                cur.execute("COMMIT")
+                self.write_seq += 1 # data_version tidak berubah untuk tulisan koneksi sendiri
+            except BaseException:
+                if self.conn.in_transaction: cur.execute("ROLLBACK")
+                raise
+
+    def insert_session(self, cur, station, evidence, raw, parsed, tx_info=None, timestamp=None, series=None):
+        """
+        Tulis satu session + measurements-nya memakai cursor transaksi yang sedang berjalan.
+        series: ParamRow batik_parser untuk tabel series (default: parsed jika berupa list ParamRow).
+        """
+        ts = (timestamp or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+        fwd, ref, stat = None, None, None
+        if tx_info:
+            fwd = tx_info.get("fwd", "-")
+            ref = tx_info.get("ref", "-")
+            stat = tx_info.get("status", "UNKNOWN")
+        header_hash, body_hash = self.store_raw(cur, raw)
+        cur.execute(SQL_INSERT_SESSION, (station, ts, evidence, header_hash, body_hash, fwd, ref, stat))
+        session_id = cur.lastrowid
+        rows = measurement_rows(parsed)
+        if rows: cur.executemany(SQL_INSERT_MEASUREMENT, [(session_id, p, m1, m2) for p, m1, m2 in rows])
+        if series is None and isinstance(parsed, list): series = parsed
+        values = series_rows(session_id, station, ts, measurement_rows(series))
+        if values:
+            cur.executemany(SQL_INSERT_SERIES, values)
+            self.update_rollups(cur, values)
+        return session_id
+
+    def insert_many(self, cur, captures):
+        """
+        Bulk insert untuk importer: captures = list (station, timestamp, evidence, raw, parsed, tx_info).
+        series hanya diisi jika parsed berupa list ParamRow batik_parser.
+        id session dialokasikan di muka agar setiap tabel cukup satu executemany. Return list session_id.
+        """
+        last_id = cur.execute("SELECT COALESCE(MAX(id), 0) FROM sessions").fetchone()[0]
+        seq = cur.execute("SELECT seq FROM sqlite_sequence WHERE name = 'sessions'").fetchone()
+        if seq: last_id = max(last_id, seq[0]) # id session yang sudah diarsipkan tidak dipakai ulang
+        sessions, measurements, series, ids = [], [], [], []
+        for station, timestamp, evidence, raw, parsed, tx_info in captures:
+            last_id += 1
+            ts = _ts_str(timestamp)
+            tx_info = tx_info or {}
+            header_hash, body_hash = self.store_raw(cur, raw)
+            sessions.append((last_id, station, ts, evidence, header_hash, body_hash,
+                             tx_info.get("fwd"), tx_info.get("ref"), tx_info.get("status")))
+            rows = measurement_rows(parsed)
+            measurements.extend((last_id, p, m1, m2) for p, m1, m2 in rows)
+            if isinstance(parsed, list): series.extend(series_rows(last_id, station, ts, rows))
+            ids.append(last_id)
+        cur.executemany("INSERT INTO sessions (id, station_name, timestamp, evidence_path, raw_header_hash, raw_hash, tx_fwd_power, tx_ref_power, tx_status) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", sessions)
+        cur.executemany(SQL_INSERT_MEASUREMENT, measurements)
+        cur.executemany(SQL_INSERT_SERIES, series)
+        self.update_rollups(cur, series)
+        return ids
+
+    def save_session(self, station, evidence, raw, parsed, tx_info=None, timestamp=None, series=None):
+        with self.transaction() as cur:
+            return self.insert_session(cur, station, evidence, raw, parsed, tx_info, timestamp, series)
+
+    def save_capture(self, station, sessions, timestamp=None):
+        """
+        Simpan beberapa session satu capture stasiun dalam SATU transaksi.
+        sessions: list dict {evidence, raw, parsed, tx_info, series}. Return list session_id.
+        """
+        timestamp = timestamp or datetime.now()
+        with self.transaction() as cur:
+            return [self.insert_session(cur, station, s.get("evidence"), s.get("raw"), s.get("parsed"),
+                                        s.get("tx_info"), timestamp, s.get("series")) for s in sessions]
+
+    def data_version(self):
+        """Berubah setiap ada commit (koneksi lain maupun koneksi ini) - kunci invalidasi cache baca."""
+        with self.lock:
+            return self.conn.execute("PRAGMA data_version").fetchone()[0], self.write_seq
+
+    def last_session_time(self, station):
+        """Waktu session terakhir tersimpan untuk stasiun (string) atau None."""
+        with self.lock:
+            row = self.conn.execute("SELECT MAX(timestamp) FROM sessions WHERE station_name = ?", (station,)).fetchone()
+        return row[0] if row else None
+
+    # --- ARSIP PER TAHUN ---
+    def archive_path(self, year):
+        return os.path.join(self.archive_dir, f"batik_{year}.db")
+
+    def archive_years(self):
+        if not os.path.isdir(self.archive_dir): return []
+        return sorted(int(m.group(1)) for m in (re.match(r"batik_(\d{4})\.db$", f) for f in os.listdir(self.archive_dir)) if m)
+
+    def attach_year(self, year, create=False):
+        """ATTACH arsip satu tahun (LRU, maks MAX_ATTACHED). Return nama schema atau None."""
+        with self.lock:
+            if year in self.attached:
+                self.attached.move_to_end(year)
+                return self.attached[year]
+            path = self.archive_path(year)
+            if not create and not os.path.exists(path): return None
+            while len(self.attached) >= MAX_ATTACHED:
+                _, old_schema = self.attached.popitem(last=False)
+                self.conn.execute(f"DETACH DATABASE {old_schema}")
+            os.makedirs(self.archive_dir, exist_ok=True)
+            schema = f"arc{year}"
+            self.conn.execute(f"ATTACH DATABASE ? AS {schema}", (path,))
+            self.attached[year] = schema
+            if self.conn.execute(f"PRAGMA {schema}.user_version").fetchone()[0] < SCHEMA_VERSION:
+                self._upgrade_archive(schema)
+            return schema
+
+    def _upgrade_archive(self, schema):
+        """Schema arsip baru / lama -> versi terbaru (tabel sama dengan DB utama, tanpa rollup)."""
+        with self.transaction() as cur:
+            for stmt in SCHEMA + SERIES_SCHEMA + RAW_SCHEMA: cur.execute(_schema_ddl(stmt, schema))
+            if self.has_fts:
+                has_fts = cur.execute(f"SELECT 1 FROM {schema}.sqlite_master WHERE name = 'raw_fts'").fetchone()
+                for stmt in FTS_SCHEMA: cur.execute(_schema_ddl(stmt, schema))
+                if not has_fts: self.index_fts(cur, schema)
+            cur.execute(f"PRAGMA {schema}.user_version = {SCHEMA_VERSION}")
+
+    def iter_archives(self, start=None, end=None, newest_first=False):
+        """
+        ATTACH arsip yang tahunnya beririsan dengan [start, end] satu per satu, hasilkan nama schema-nya.
+        ATTACH dibatasi MAX_ATTACHED (LRU): schema hanya pasti ter-ATTACH sampai schema berikutnya
+        diminta, jadi query per schema lalu gabungkan hasilnya. Panggil di luar transaksi.
+        """
+        first = int(_ts_str(start)[:4]) if start is not None else None
+        last = int(_ts_str(end)[:4]) if end is not None else None
+        years = self.archive_years()
+        for year in (reversed(years) if newest_first else years):
+            if (first is not None and year < first) or (last is not None and year > last): continue
+            schema = self.attach_year(year)
+            if schema: yield schema
+
+    def detach_all(self):
+        with self.lock:
+            for schema in self.attached.values(): self.conn.execute(f"DETACH DATABASE {schema}")
+            self.attached.clear()
+
+    def archive_old(self, keep_days=ARCHIVE_KEEP_DAYS, now=None):
+        """
+        Pindahkan session lebih tua dari keep_days ke arsip per tahun.
+        Rollup tetap di DB utama (kecil, dipakai query jangka panjang). Return {tahun: jumlah session}.
+        """
+        cutoff = _ts_str((now or datetime.now()) - timedelta(days=keep_days))
+        with self.lock:
+            years = [int(r[0]) for r in self.conn.execute(
+                "SELECT DISTINCT substr(timestamp, 1, 4) FROM sessions WHERE timestamp < ?", (cutoff,))]
+            moved = {}
+            for year in years:
+                schema = self.attach_year(year, create=True)
+                upper = min(cutoff, f"{year + 1}-01-01")
+                cond = "SELECT id FROM main.sessions WHERE timestamp >= ? AND timestamp < ?"
+                span = (f"{year}-01-01", upper)
+                with self.transaction() as cur:
+                    last_blob = cur.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {schema}.raw_blobs").fetchone()[0]
+                    for table in ["sessions", "measurements", "series"]:
+                        cols = ", ".join(r[1] for r in cur.execute(f"PRAGMA main.table_info({table})"))
+                        key = "id" if table == "sessions" else "session_id"
+                        cur.execute(f"INSERT OR REPLACE INTO {schema}.{table} ({cols}) SELECT {cols} FROM main.{table} WHERE {key} IN ({cond})", span)
+                    cur.execute(f"INSERT OR IGNORE INTO {schema}.raw_blobs SELECT * FROM main.raw_blobs WHERE hash IN "
+                                f"(SELECT raw_hash FROM {schema}.sessions UNION SELECT raw_header_hash FROM {schema}.sessions)")
+                    if self.has_fts: self.index_fts(cur, schema, last_blob)
+                    for table in ["measurements", "series"]:
+                        cur.execute(f"DELETE FROM main.{table} WHERE session_id IN ({cond})", span)
+                    cur.execute("DELETE FROM main.sessions WHERE timestamp >= ? AND timestamp < ?", span)
+                    moved[year] = cur.rowcount
+            if moved: self.prune_blobs()
+            return moved
+
+    def query_series(self, station, parameter, start=None, end=None):
+        """
+        Riwayat numerik satu parameter: [(ts, mon1, mon2)] urut waktu. start/end: datetime atau string.
+        Arsip tahun yang beririsan dengan rentang ikut dibaca (satu per satu) dan digabung.
+        """
+        where = " WHERE station_name = ? AND parameter_name = ?"
+        args = [station, parameter]
+        if start is not None:
+            where += " AND ts >= ?"
+            args.append(_ts_str(start))
+        if end is not None:
+            where += " AND ts <= ?"
+            args.append(_ts_str(end))
+        rows = []
+        with self.lock:
+            for schema in chain(["main"], self.iter_archives(start, end)):
+                rows.extend(self.conn.execute(f"SELECT ts, mon1, mon2 FROM {schema}.series{where}", args).fetchall())
+        rows.sort(key=lambda r: r[0])
+        return rows
+
+    def query_rollup(self, station, parameter, period="daily", start=None, end=None, monitor=None):
+        """
+        Agregat per jam/hari: [(bucket, monitor, n, min, max, avg, last)] urut waktu.
+        start/end dibandingkan dengan bucket ("YYYY-mm-dd" / "YYYY-mm-dd HH").
+        """
+        width = ROLLUP_PERIODS[period]
+        sql = f"SELECT bucket, monitor, n, vmin, vmax, vsum / n, vlast FROM rollup_{period} WHERE station_name = ? AND parameter_name = ?"
+        args = [station, parameter]
+        if monitor is not None:
+            sql += " AND monitor = ?"
+            args.append(monitor)
+        if start is not None:
+            sql += " AND bucket >= ?"
+            args.append(_ts_str(start)[:width])
+        if end is not None:
+            sql += " AND bucket <= ?"
+            args.append(_ts_str(end)[:width])
+        with self.lock:
+            return self.conn.execute(sql + " ORDER BY bucket, monitor", args).fetchall()
+
+    def close(self):
+        with self.lock:
+            if self.conn:
+                self.detach_all()
+                try: self.conn.execute("PRAGMA optimize")
+                except sqlite3.Error: pass
+                self.conn.close()
+                self.conn = None
+
+# --- MIGRASI SCHEMA (PRAGMA user_version) ---
+# Tambah migrasi baru di akhir daftar; jangan ubah yang sudah ada.
+# Migrasi hanya DDL (cepat, jalan saat DB dibuka); pengisian data lama dijadwalkan
+# lewat _queue_backfill dan dijalankan bertahap oleh "batik_db.py backfill".
+# Setiap migrasi aman dijalankan ulang pada DB lama yang belum berversi (user_version 0).
+def _queue_backfill(cur, task):
+    # DB baru (tanpa session) tidak perlu backfill
+    if cur.execute("SELECT 1 FROM sessions LIMIT 1").fetchone():
+        cur.execute("INSERT OR REPLACE INTO pending_backfill (task) VALUES (?)", (task,))
+
+def _m1_base(db, cur):
+    for stmt in SCHEMA + BACKFILL_SCHEMA: cur.execute(stmt)
+    cols = {row[1] for row in cur.execute("PRAGMA table_info(sessions)")}
+    for col in SESSION_EXTRA_COLS:
+        if col not in cols: cur.execute(f"ALTER TABLE sessions ADD COLUMN {col} TEXT")
+
+def _m2_series(db, cur):
+    for stmt in SERIES_SCHEMA: cur.execute(stmt)
+    _queue_backfill(cur, "series")
+
+def _m3_raw_blobs(db, cur):
+    for stmt in RAW_SCHEMA: cur.execute(stmt)
+    _queue_backfill(cur, "raw")
+
+def _m4_rollups(db, cur):
+    for stmt in ROLLUP_SCHEMA: cur.execute(stmt)
+    _queue_backfill(cur, "rollups")
+
+def _m5_fts(db, cur):
+    if not db.has_fts: return # SQLite tanpa modul FTS5: pencarian dinonaktifkan
+    for stmt in FTS_SCHEMA: cur.execute(stmt)
+    _queue_backfill(cur, "fts")
+
+MIGRATIONS = [
+    (1, "sessions/measurements + kolom tx & raw hash + indeks", _m1_base),
+    (2, "tabel series numerik + backfill", _m2_series),
+    (3, "raw_blobs + pindah raw_clipboard lama", _m3_raw_blobs),
+    (4, "rollup per jam/hari + hitung awal", _m4_rollups),
+    (5, "indeks teks penuh raw_fts (FTS5) + indeks hash session", _m5_fts),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# --- KONEKSI BERSAMA PER PROSES ---
+_shared = {}
+_shared_lock = threading.Lock()
+
+def get_db(db_path=None):
+    """Satu BatikDB per file DB per proses; ditutup otomatis saat proses selesai."""
+    path = os.path.abspath(db_path or config.DB_PATH)
+    with _shared_lock:
+        db = _shared.get(path)
+        if db is None or db.conn is None:
+            db = _shared[path] = BatikDB(path)
+        return db
+
+def close_all():
+    with _shared_lock:
+        for db in _shared.values(): db.close()
+        _shared.clear()
+
+atexit.register(close_all)
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Utilitas database BATIK")
+    parser.add_argument("command", choices=["migrate", "backfill", "backfill-series", "rebuild-rollups", "archive", "compact", "search", "rebuild-fts"])
+    parser.add_argument("--db", default=config.DB_PATH, help="File SQLite")
+    parser.add_argument("query", nargs="?", help="search: query FTS5, mis. '\"Antenna Fault\"'")
+    parser.add_argument("--station", default=None, help="search: filter stasiun")
+    parser.add_argument("--limit", type=int, default=20, help="search: jumlah hasil")
+    parser.add_argument("--keep-days", type=int, default=ARCHIVE_KEEP_DAYS, help="archive: umur data yang tetap di DB utama")
+    args = parser.parse_intermixed_args()
+
+    db = BatikDB(args.db) # migrasi otomatis saat dibuka
+    if args.command == "migrate":
+        print(f">>> Schema versi {db.conn.execute('PRAGMA user_version').fetchone()[0]} (terbaru {SCHEMA_VERSION}).")
+        pending = [t[0] for t in db.pending_backfills()]
+        if pending: print(f">>> Backfill tertunda: {', '.join(pending)} -> jalankan: python bin/batik_db.py backfill")
+    elif args.command == "backfill":
+        done = db.run_backfills()
+        for task, count in done.items(): print(f">>> {task}: {count} selesai.")
+        if not done: print(">>> Tidak ada backfill tertunda.")
+    elif args.command == "backfill-series":
+        print(f">>> {db.backfill_series()} baris series ditulis.")
+    elif args.command == "rebuild-rollups":
+        print(f">>> Rollup dihitung ulang dari {db.rebuild_rollups()} baris series.")
+    elif args.command == "archive":
+        moved = db.archive_old(args.keep_days)
+        for year, count in sorted(moved.items()): print(f">>> {year}: {count} session -> {db.archive_path(year)}")
+        if not moved: print(">>> Tidak ada session yang perlu diarsipkan.")
+    elif args.command == "search":
+        if not args.query: parser.error("search butuh query")
+        results = db.search_raw(args.query, args.limit, args.station)
+        for r in results: print(f"[{r['timestamp']}] {r['station']:<14} #{r['session_id']}  {r['snippet']}")
+        print(f">>> {len(results)} session cocok.")
+    elif args.command == "rebuild-fts":
+        print(f">>> {db.rebuild_fts()} blob diindeks ulang.")
+    elif args.command == "compact":
+        before = os.path.getsize(args.db)
+        moved, pruned = db.compact()
+        print(f">>> {moved} raw dipindah ke raw_blobs, {pruned} blob yatim dihapus.")
+        print(f">>> Ukuran DB: {before / 1048576:.1f} MiB -> {os.path.getsize(args.db) / 1048576:.1f} MiB")
+    db.close()
@@ -0,0 +1,116 @@
+# FILE: bin/batik_delta.py
+# ================================================================
+# DETEKSI PERUBAHAN ANTAR CAPTURE (INCREMENTAL)
+# Bandingkan capture baru dengan capture sebelumnya per stasiun:
+# hanya parameter yang nilainya berubah yang dikembalikan, plus
+# fingerprint stabil seluruh capture agar penyimpanan/upload bisa
+# dilewati jika tidak ada yang berubah.
+# ================================================================
+
+import os
+import sys
+import json
+import hashlib
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import config
+import batik_parser
+
+MARU_TYPES = ["DVOR", "DME"]
+
+def station_tool_type(station):
+    """Nama stasiun robot (LOCALIZER, GLIDE PATH, ...) -> kode parser (LOC, GP, ...)."""
+    t = station.upper()
+    if "DVOR" in t: return "DVOR"
+    if "DME" in t: return "DME"
+    if "LOC" in t: return "LOC"
+    if "GLIDE" in t or t == "GP": return "GP"
+    if "MIDDLE" in t or t == "MM": return "MM"
+    if "OUTER" in t or t == "OM": return "OM"
+    return t
+
+def parse_station_text(station, text):
+    """Pilih parser sesuai stasiun. Return (rows, active_tx)."""
+    tool = station_tool_type(station)
+    if tool in MARU_TYPES: return batik_parser.cached_parse(batik_parser.parse_maru_data, tool, text)
+    return batik_parser.cached_parse(batik_parser.parse_pmdt_strict, tool, text)
+
+def _row_key(r):
+    """ParamRow atau dict lama -> (parameter, mon1, mon2)."""
+    if isinstance(r, tuple): return r[0], r[1], r[2]
+    return r["Parameter"], r["Monitor 1"], r["Monitor 2"]
+
+def capture_fingerprint(rows, active_tx):
+    """
+    Hash stabil (hex) seluruh capture: urutan parameter, kedua monitor dan
+    Active TX. Tidak memakai hash() Python sehingga sama antar proses/restart.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"TX={active_tx}".encode("utf-8"))
+    for r in rows:
+        h.update(b"\x1e")
+        h.update("\x1f".join(_row_key(r)).encode("utf-8"))
+    return h.hexdigest()
+
+class CaptureDelta:
+    """Hasil diff_capture: capture lengkap + daftar parameter yang berubah."""
+    __slots__ = ("station", "rows", "active_tx", "fingerprint", "changed", "active_tx_changed")
+
+    def __init__(self, station, rows, active_tx, fingerprint, changed, active_tx_changed):
+        self.station = station
+        self.rows = rows
+        self.active_tx = active_tx
+        self.fingerprint = fingerprint
+        self.changed = changed
+        self.active_tx_changed = active_tx_changed
+
+    @property
+    def has_changes(self):
+        return bool(self.changed) or self.active_tx_changed
+
+def diff_rows(station, previous, rows, active_tx):
+    """
+    Bandingkan hasil parse baru dengan capture sebelumnya (CaptureDelta atau None).
+    Parameter baru / yang nilainya beda di salah satu monitor masuk `changed`.
+    """
+    fingerprint = capture_fingerprint(rows, active_tx)
+    if previous is None:
+        return CaptureDelta(station, rows, active_tx, fingerprint, list(rows), True)
+    if previous.fingerprint == fingerprint:
+        return CaptureDelta(station, rows, active_tx, fingerprint, [], False)
+
+    old = {}
+    for r in previous.rows:
+        key = _row_key(r)
+        old[key[0]] = key
+    changed = [r for r in rows if old.get(_row_key(r)[0]) != _row_key(r)]
+    return CaptureDelta(station, rows, active_tx, fingerprint, changed, previous.active_tx != active_tx)
+
+def diff_capture(station, previous, new_text):
+    """Parse teks capture baru lalu bandingkan dengan capture sebelumnya."""
+    rows, active_tx = parse_station_text(station, new_text)
+    return diff_rows(station, previous, rows, active_tx)
+
+# --- SIMPAN CAPTURE TERAKHIR (antar proses robot) ---
+def _state_path(station, state_dir=None):
+    folder = state_dir or config.TEMP_DIR
+    return os.path.join(folder, f"last_capture_{station_tool_type(station)}.json")
+
+def load_last_capture(station, state_dir=None):
+    """Baca capture terakhir stasiun dari disk. Return CaptureDelta atau None."""
+    path = _state_path(station, state_dir)
+    if not os.path.exists(path): return None
+    try:
+        with open(path, "r", encoding="utf-8") as f: data = json.load(f)
+        rows = [batik_parser.ParamRow(r["Parameter"], r["Monitor 1"], r["Monitor 2"]) for r in data["rows"]]
+        return CaptureDelta(station, rows, data["active_tx"], data["fingerprint"], [], False)
+    except Exception:
+        return None
+
+def save_last_capture(delta, state_dir=None):
+    path = _state_path(delta.station, state_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = {"fingerprint": delta.fingerprint, "active_tx": delta.active_tx, "rows": [dict(r) for r in delta.rows]}
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f: json.dump(data, f)
+    os.replace(tmp_path, path)
@@ -3,17 +3,44 @@
 # BATIK PARSER V20.1 (ROBUST SECTION DETECTION)
 # =============================================================================
 import re
+import hashlib
+import threading
+from collections import OrderedDict
 
-def normalize_with_unit(val):
-    """Menstandarisasi nilai agar memiliki satuan dengan spasi."""
-    if not val or val.strip() in ["-", "", "_"]: return "-"
-    val = val.strip()
-    
-    # Jika hanya huruf (seperti NORMAL, Enabled), biarkan
-    if re.match(r"^[A-Za-z\s/]+$", val) and not any(c.isdigit() for c in val):
-        return val
+import numpy as np
+
+# Satu regex gabungan menggantikan rangkaian re.sub per satuan.
+# Tidak ada token satuan yang menjadi awalan token satuan LAIN (deg / DDM / dB
+# sama-sama berawalan "d" di IGNORECASE, tapi tidak saling awalan), jadi di satu
+# posisi paling banyak satu satuan yang cocok; di dalam satu satuan alternatif
+# tetap urut terpanjang dulu seperti pola lama -> hasil identik dengan urutan
+# re.sub lama (diuji di tests/test_batik_parser.py & bench_parser.py).
+# "M Hz" ikut ditangkap karena langkah Hz lama menghapus spasi sebelum Hz
+# sehingga langkah MHz berikutnya tetap cocok.
+_UNIT_MAP = {
+    "watts": " W", "watt": " W", "w": " W",
+    "volts": " V", "volt": " V", "v": " V",
+    "amps": " A", "amp": " A", "a": " A",
+    "degs": " deg", "deg": " deg",
+    "%": " %",
+    "hz": "Hz", "mhz": " MHz",
+    "ddm": " DDM", "db": " dB", "usec": " usec", "pp/s": " pp/s",
+}
+_UNIT_TOKENS = r"Watts|Watt|W|Volts|Volt|V|Amps|Amp|A|degs|deg|%|M\s*Hz|Hz|DDM|dB|usec|pp/s"
+_UNIT_RE = re.compile(r"\s*(" + _UNIT_TOKENS + r")\b", re.IGNORECASE)
+# Dua satuan yang berdempetan (mis. "5VW") saling mempengaruhi di urutan lama
+# -> jatuhkan ke jalur lama agar hasil tetap persis sama.
+_UNIT_CHAIN_RE = re.compile(r"(?:" + _UNIT_TOKENS + r")\s*(?:" + _UNIT_TOKENS + r")\b", re.IGNORECASE)
+_ALPHA_ONLY_RE = re.compile(r"^[A-Za-z\s/]+$")
+_SPACES_RE = re.compile(r"\s+")
+
+def _unit_repl(m):
+    unit = m.group(1).lower()
+    if unit[0] == "m": return " MHz"
+    return _UNIT_MAP[unit]
 
-    # Tambahkan spasi sebelum satuan
+def _normalize_with_unit_legacy(val):
+    """Versi lama (re.sub berurutan). Dipakai untuk kasus satuan berdempetan."""
     val = re.sub(r"\s*(Watts|Watt|W)\b", " W", val, flags=re.IGNORECASE)
     val = re.sub(r"\s*(Volts|Volt|V)\b", " V", val, flags=re.IGNORECASE)
     val = re.sub(r"\s*(Amps|Amp|A)\b", " A", val, flags=re.IGNORECASE)
@@ -25,8 +52,22 @@ def normalize_with_unit(val):
     val = re.sub(r"\s*(dB)\b", " dB", val, flags=re.IGNORECASE)
     val = re.sub(r"\s*(usec)\b", " usec", val, flags=re.IGNORECASE)
     val = re.sub(r"\s*(pp/s)\b", " pp/s", val, flags=re.IGNORECASE)
+    return val
+
+def normalize_with_unit(val):
+    """Menstandarisasi nilai agar memiliki satuan dengan spasi."""
+    if not val or val.strip() in ["-", "", "_"]: return "-"
+    val = val.strip()
+    
+    # Jika hanya huruf (seperti NORMAL, Enabled), biarkan
+    if _ALPHA_ONLY_RE.match(val):
+        return val
 
-    return re.sub(r"\s+", " ", val).strip()
+    # Tambahkan spasi sebelum satuan (satu kali jalan)
+    if _UNIT_CHAIN_RE.search(val): val = _normalize_with_unit_legacy(val)
+    else: val = _UNIT_RE.sub(_unit_repl, val)
+
+    return _SPACES_RE.sub(" ", val).strip()
 
 # =============================================================================
 # DEFINISI URUTAN PARAMETER
@@ -89,219 +130,402 @@ ORDERED_PARAMS = {
     ]
 }
 
+# =============================================================================
+# TIPE BARIS HASIL PARSER
+# =============================================================================
+_ROW_FIELDS = {"Parameter": 0, "Monitor 1": 1, "Monitor 2": 2}
+
+class ParamRow(tuple):
+    """
+    Satu baris hasil parser: (Parameter, Monitor 1, Monitor 2).
+    Berbasis tuple tanpa __dict__ sehingga jauh lebih hemat dari dict, tapi
+    tetap bisa dibaca seperti dict lama: row["Monitor 1"], row.get("Parameter"),
+    "Monitor 1" in row, dict(row). Diterima langsung oleh sheet_handler dan DatabaseManager robot.
+    Beda dengan dict: iterasi & json.dumps(row) menghasilkan nilai (list) -> pakai dict(row).
+    """
+    __slots__ = ()
+
+    def __new__(cls, parameter, mon1="-", mon2="-"):
+        return tuple.__new__(cls, (parameter, mon1, mon2))
+
+    @property
+    def parameter(self): return tuple.__getitem__(self, 0)
+    @property
+    def mon1(self): return tuple.__getitem__(self, 1)
+    @property
+    def mon2(self): return tuple.__getitem__(self, 2)
+
+    def __getitem__(self, key):
+        if key.__class__ is str: key = _ROW_FIELDS[key]
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        idx = _ROW_FIELDS.get(key)
+        return default if idx is None else tuple.__getitem__(self, idx)
+
+    def keys(self): return _ROW_FIELDS.keys()
+
+    def __contains__(self, key): return key in _ROW_FIELDS # seperti dict: cek nama kolom, bukan nilai
+
+    def __getnewargs__(self): return tuple(self) # agar aman di-pickle (multiprocessing)
+
+    def __repr__(self):
+        return f"ParamRow({self[0]!r}, {self[1]!r}, {self[2]!r})"
+
+def _norm_key(key):
+    return key.replace(" ", "").lower()
+
+# Index kunci ternormalisasi per tipe alat (dibuat sekali saat import)
+_ORDERED_NORM_KEYS = {t: [(k, _norm_key(k)) for k in keys] for t, keys in ORDERED_PARAMS.items()}
+
 # =============================================================================
 # 1. PARSER MARU (DVOR & DME) - REVISED & ROBUST
 # =============================================================================
-def parse_maru_data(station_type, raw_text):
+_MARU_DOUBLE_RE = re.compile(r"^(.+?)\s{2,}(.+?)\s{2,}(.+)$")
+_LPA_SPLIT_RE = re.compile(r"(\d)\s*(LPA Temperature)")
+_ACTIVE_TX2_RE = re.compile(r"Active\s*TX.*?TX2", re.IGNORECASE)
+_ACTIVE_TXP2_RE = re.compile(r"Active\s*TXP.*?TXP2", re.IGNORECASE)
+_ACTIVE_TAIL_RE = re.compile(r"Active\s*$", re.IGNORECASE)
+_TX2_HEAD_RE = re.compile(r"\s*TX.*?TX2", re.IGNORECASE)
+_TXP2_HEAD_RE = re.compile(r"\s*TXP.*?TXP2", re.IGNORECASE)
+_STATUS_LINE_RE = re.compile(r"([A-Za-z0-9/]+\s+Status)")
+_DVOR_PSU_RE = re.compile(r"-\s+([A-Za-z0-9\+\-\s]+?)\s+([-\d\.]+\s*V)\s+([-\d\.]+\s*A)")
+_DVOR_AC_RE = re.compile(r"-\s+(AC \+28V)\s+([-\d\.]+\s*V)\s+([-\d\.]+\s*A)")
+
+# [DAFTAR WAJIB] Parameter ini HANYA boleh diambil jika section mengandung kata "MON Major Measurement"
+# Ini mencegah data 'Output Power' tertimpa oleh nilai dari section lain (misal Configuration)
+_DME_STRICT_MON_PARAMS = {
+    "IDENT Code", "Output Power", "Frequency", "System Delay",
+    "Reply Pulse Spacing", "Reply Efficiency", "Reply Pulse Rate",
+    "Reply Pulse Rise Time", "Reply Pulse Decay Time", "Reply Pulse Duration"
+}
+
+def _iter_clean_lines(lines):
+    """
+    Pecah item dari file/generator dengan aturan str.splitlines() (\x0c, \x0b, \u2028, dst. juga
+    pemisah baris, bukan hanya \n), jadi hasil parse_*_lines(file) == parse_*_data(teks).
+    Baris tetap dibaca satu per satu.
+    """
+    for line in lines:
+        yield from line.splitlines() or ("",)
+
+def parse_maru_lines(station_type, lines):
+    """
+    Versi streaming parse_maru_data: menerima iterable baris (file terbuka,
+    generator, list) dan memprosesnya dalam satu kali jalan.
+    """
     data_pool = {}
-    
-    # Pre-processing untuk memperbaiki format LPA Temperature yang sering menempel
-    if "DME" in station_type:
-        raw_text = re.sub(r"(\d)\s*(LPA Temperature)", r"\1\n\2", raw_text)
-    
-    # Deteksi Active TX (Sederhana)
+    is_dme = "DME" in station_type
+    is_dvor = "DVOR" in station_type
+
+    # Deteksi Active TX (Sederhana) - dicek per baris sambil jalan
     active_tx = 1
-    if re.search(r"Active\s*TX.*?TX2", raw_text, re.IGNORECASE): active_tx = 2
-    if re.search(r"Active\s*TXP.*?TXP2", raw_text, re.IGNORECASE): active_tx = 2
-    
-    data_pool["Active TX"] = {"m1": str(active_tx), "m2": "-"}
+    active_pending = False # "Active" di ujung baris, "TX..." di baris berikutnya
 
-    lines = raw_text.splitlines()
     current_section = "General"
-    pattern_double = re.compile(r"^(.+?)\s{2,}(.+?)\s{2,}(.+)$")
-    
-    # [DAFTAR WAJIB] Parameter ini HANYA boleh diambil jika section mengandung kata "MON Major Measurement"
-    # Ini mencegah data 'Output Power' tertimpa oleh nilai dari section lain (misal Configuration)
-    strict_mon_params = [
-        "IDENT Code", "Output Power", "Frequency", "System Delay",
-        "Reply Pulse Spacing", "Reply Efficiency", "Reply Pulse Rate",
-        "Reply Pulse Rise Time", "Reply Pulse Decay Time", "Reply Pulse Duration"
-    ]
-    
-    for line in lines:
-        line = line.strip()
-        if not line or line.startswith("#"): continue
-        
-        # [FIX 1] Deteksi Section Header yang lebih ROBUST
-        # Kita anggap semua baris yang diawali ";" adalah section header.
-        # Kita buang tanda ";" dan karakter panah (jika ada, atau jika error encoding)
-        if line.startswith(";"):
-            # Ambil teks setelah tanda ;
-            raw_sec = line.lstrip(";").strip()
-            # Bersihkan karakter non-huruf di awal (misal sisa panah yang jadi kotak/tanda tanya)
-            # Kita cukup ambil raw_sec, tapi untuk pastikan section match, kita pakai string matching
-            current_section = raw_sec
-            continue
-
-        # Deteksi Section Utama [Nama Section]
-        if line.startswith("[") and line.endswith("]"):
-            current_section = line[1:-1]
-            continue
-            
-        # Fallback untuk format lama (Status lines)
-        if "Status" in line and ";" in line and not line.startswith(";"): 
-            match = re.search(r"([A-Za-z0-9/]+\s+Status)", line)
-            if match: current_section = match.group(1).strip(); continue
-        
-        # Parsing Data Nilai (DVOR Power Supply)
-        if "DVOR" in station_type and ("Status" in current_section) and ("DC" in current_section or "Battery" in current_section):
-            matches = re.findall(r"-\s+([A-Za-z0-9\+\-\s]+?)\s+([-\d\.]+\s*V)\s+([-\d\.]+\s*A)", line)
-            if matches:
-                for label, volt, ampere in matches:
-                    clean_lbl = label.strip()
-                    data_pool[clean_lbl] = {"m1": normalize_with_unit(volt), "m2": "-"}
-                    data_pool[f"Current {clean_lbl}"] = {"m1": normalize_with_unit(ampere), "m2": "-"}
-                continue 
-        if "DVOR" in station_type and "AC" in current_section and "Status" in current_section:
-             matches = re.findall(r"-\s+(AC \+28V)\s+([-\d\.]+\s*V)\s+([-\d\.]+\s*A)", line)
-             for label, volt, ampere in matches:
-                 data_pool[label] = {"m1": normalize_with_unit(volt), "m2": "-"}
-                 data_pool[f"Current {label}"] = {"m1": normalize_with_unit(ampere), "m2": "-"}
-             continue
-        
-        # Parsing Data Nilai (Umum: Parameter Value1 Value2)
-        clean_line = line.replace("- ", "")
-        match = pattern_double.match(clean_line)
-        if match:
-            p, v1, v2 = match.group(1).strip(), match.group(2).strip(), match.group(3).strip()
-            
-            # [LOGIKA STRICT FILTER]
-            if "DME" in station_type and p in strict_mon_params:
+
+    for raw_line in _iter_clean_lines(lines):
+        # Pre-processing untuk memperbaiki format LPA Temperature yang sering menempel
+        if is_dme and "LPA Temperature" in raw_line:
+            pieces = _LPA_SPLIT_RE.sub(r"\1\n\2", raw_line).split("\n")
+        else:
+            pieces = (raw_line,)
+
+        for line in pieces:
+            if active_tx == 1:
+                if _ACTIVE_TX2_RE.search(line) or _ACTIVE_TXP2_RE.search(line): active_tx = 2
+                elif active_pending and (_TX2_HEAD_RE.match(line) or _TXP2_HEAD_RE.match(line)): active_tx = 2
+                if line.strip(): active_pending = bool(_ACTIVE_TAIL_RE.search(line))
+
+            line = line.strip()
+            if not line or line.startswith("#"): continue
+
+            # [FIX 1] Deteksi Section Header yang lebih ROBUST
+            # Kita anggap semua baris yang diawali ";" adalah section header.
+            # Kita buang tanda ";" dan karakter panah (jika ada, atau jika error encoding)
+            if line.startswith(";"):
+                # Ambil teks setelah tanda ;
+                current_section = line.lstrip(";").strip()
+                continue
+
+            # Deteksi Section Utama [Nama Section]
+            if line.startswith("[") and line.endswith("]"):
+                current_section = line[1:-1]
+                continue
+
+            # Fallback untuk format lama (Status lines)
+            if "Status" in line and ";" in line:
+                match = _STATUS_LINE_RE.search(line)
+                if match: current_section = match.group(1).strip(); continue
+
+            # Parsing Data Nilai (DVOR Power Supply)
+            if is_dvor and ("Status" in current_section) and ("DC" in current_section or "Battery" in current_section):
+                matches = _DVOR_PSU_RE.findall(line)
+                if matches:
+                    for label, volt, ampere in matches:
+                        clean_lbl = label.strip()
+                        data_pool[clean_lbl] = {"m1": normalize_with_unit(volt), "m2": "-"}
+                        data_pool[f"Current {clean_lbl}"] = {"m1": normalize_with_unit(ampere), "m2": "-"}
+                    continue
+            if is_dvor and "AC" in current_section and "Status" in current_section:
+                for label, volt, ampere in _DVOR_AC_RE.findall(line):
+                    data_pool[label] = {"m1": normalize_with_unit(volt), "m2": "-"}
+                    data_pool[f"Current {label}"] = {"m1": normalize_with_unit(ampere), "m2": "-"}
+                continue
+
+            # Parsing Data Nilai (Umum: Parameter Value1 Value2)
+            match = _MARU_DOUBLE_RE.match(line.replace("- ", ""))
+            if match:
+                p, v1, v2 = match.group(1).strip(), match.group(2).strip(), match.group(3).strip()
+
+                # [LOGIKA STRICT FILTER]
                 # Cek apakah kita BENAR-BENAR ada di section MON Major Measurement
                 # Kita gunakan 'in' agar tidak peduli karakter aneh di kiri/kanan nama section
-                if "MON Major Measurement" not in current_section:
+                if is_dme and p in _DME_STRICT_MON_PARAMS and "MON Major Measurement" not in current_section:
                     continue # Skip data ini karena bukan dari section yang diminta
 
-            # Filter DVOR
-            if "DVOR" in station_type and p == "CARRIER Output Power" and current_section == "Main Status": continue
-            
-            data_pool[p] = {"m1": normalize_with_unit(v1), "m2": normalize_with_unit(v2)}
+                # Filter DVOR
+                if is_dvor and p == "CARRIER Output Power" and current_section == "Main Status": continue
+
+                data_pool[p] = {"m1": normalize_with_unit(v1), "m2": normalize_with_unit(v2)}
+
+    # Nilai "Active TX" dari baris data (jika ada) tetap menang seperti versi lama
+    data_pool.setdefault("Active TX", {"m1": str(active_tx), "m2": "-"})
 
     # Susun Hasil Akhir Sesuai Urutan
     final_rows = []
-    key_list = ORDERED_PARAMS["DME"] if "DME" in station_type else ORDERED_PARAMS["DVOR"]
+    key_list = ORDERED_PARAMS["DME"] if is_dme else ORDERED_PARAMS["DVOR"]
     for k in key_list:
         if k in data_pool:
-            final_rows.append({"Parameter": k, "Monitor 1": data_pool[k]["m1"], "Monitor 2": data_pool[k]["m2"]})
+            final_rows.append(ParamRow(k, data_pool[k]["m1"], data_pool[k]["m2"]))
         else:
-            final_rows.append({"Parameter": k, "Monitor 1": "-", "Monitor 2": "-"})
+            final_rows.append(ParamRow(k))
             
     return final_rows, active_tx
 
+def parse_maru_data(station_type, raw_text):
+    return parse_maru_lines(station_type, raw_text.splitlines())
+
 # =============================================================================
-# 2. PARSER PMDT (LOC/GP/MM/OM) - TETAP SAMA
+# 2. PARSER PMDT (LOC/GP/MM/OM) - SATU KALI JALAN (STREAMING)
 # =============================================================================
-def parse_pmdt_strict(tool_type, full_text):
-    data_pool = {}
-    
-    # 1. PARSE RMS STATUS
-    rms_params = ["Antenna Select", "Main Select", "Transmitter On"]
-    header_block = full_text.split("RAW DATA DETAILS")[0] if "RAW DATA DETAILS" in full_text else full_text
-    header_lines = header_block.splitlines()
-    for p in rms_params:
-        idx_found = -1
-        for i, line in enumerate(header_lines):
-            if p in line: idx_found = i; break
-        if idx_found != -1:
-            val1, val2 = "-", "-"
-            for j in range(1, 5):
-                if idx_found + j >= len(header_lines): break
-                subline = header_lines[idx_found + j]
-                if "Tx 1" in subline and "G" in subline.split("Tx 1")[0][-5:]: val1 = "Tx 1"
-                if "Tx 2" in subline and "G" in subline.split("Tx 2")[0][-5:]: val2 = "Tx 2"
-            data_pool[p] = {"m1": val1, "m2": val2}
-
-    # 2. PARSE MONITOR DATA
+_RMS_PARAMS = ["Antenna Select", "Main Select", "Transmitter On"]
+_RMS_LOOKAHEAD = 4
+_RAW_MARKER = "RAW DATA DETAILS"
+_TX_MARKER = "Transmitter Data"
+_COLUMN_SPLIT_RE = re.compile(r"\s{2,}")
+_MARKER_MON_RE = re.compile(r"(RF Level|Ident Modulation)\s+([-\d\.]+)\s+([-\d\.]+)\s+([-\d\.]+)")
+_WATT_PAIR_RE = re.compile(r"([A-Za-z\s]+?)\s+([-\d\.]+\s*(?:Watts|Watt|W))")
+_MARKER_TX_RE = re.compile(r"([A-Za-z\s]+)\s+([-\d\.]+.*)")
+
+# --- TOKENIZER: satu kali jalan, hasilkan event per section ---
+# Setiap event berbentuk tuple (jenis, tag, isi):
+#   EV_RMS      (param, (val1, val2))      status RMS dari header snapshot
+#   EV_SECTION  (nama, baris)              "Course" / "Clearance" di blok monitor
+#   EV_MONITOR  (section, baris)           baris blok monitor (sebelum "Transmitter Data")
+#   EV_TX_BLOCK (nama, bagian)             baris "Standby" di blok transmitter
+#   EV_TX       (blok, bagian)             isi blok transmitter (antara marker 1 dan 2)
+#   EV_LINE     (None, baris)              baris fisik di luar blok monitor
+EV_RMS = "RMS"
+EV_SECTION = "SECTION"
+EV_MONITOR = "MONITOR"
+EV_TX_BLOCK = "TX_BLOCK"
+EV_TX = "TX"
+EV_LINE = "LINE"
+
+def _rms_check(subline, slot):
+    if "Tx 1" in subline and "G" in subline.split("Tx 1")[0][-5:]: slot[1] = "Tx 1"
+    if "Tx 2" in subline and "G" in subline.split("Tx 2")[0][-5:]: slot[2] = "Tx 2"
+
+def iter_pmdt_events(lines):
+    """
+    Tokenizer capture PMDT. Membaca baris satu kali dan menghasilkan event
+    bertipe (lihat EV_*). Header RMS berakhir di "RAW DATA DETAILS" (atau di
+    akhir teks); blok transmitter = teks di antara "Transmitter Data" pertama
+    dan kedua, sama seperti split() pada versi lama.
+    """
+    in_header = True
+    rms_waiting = list(_RMS_PARAMS)
+    rms_open = [] # [param, val1, val2, sisa_baris]
+
+    region = EV_MONITOR # EV_MONITOR -> EV_TX -> EV_LINE
     section = "General"
-    lines = full_text.splitlines()
-    
-    if tool_type in ["MM", "OM"]:
-        current_mon = None
-        for line in lines:
-            line = line.strip()
-            if not line: continue
-            if "Monitor 1" in line and "Enabled" not in line and "Status" not in line: current_mon = "m1"; continue
-            elif "Monitor 2" in line and "Enabled" not in line and "Status" not in line: current_mon = "m2"; continue
-            if current_mon:
-                match = re.search(r"(RF Level|Ident Modulation)\s+([-\d\.]+)\s+([-\d\.]+)\s+([-\d\.]+)", line)
-                if match:
-                    param, val = match.group(1), match.group(4)
-                    unit = line.split()[-1]
-                    if unit in ["dB", "%"]: val = f"{val} {unit}"
-                    if param not in data_pool: data_pool[param] = {"m1": "-", "m2": "-"}
-                    data_pool[param][current_mon] = normalize_with_unit(val)
-    else:
-        reading_monitor = True
-        for line in lines:
-            line = line.strip()
-            if "Transmitter Data" in line: reading_monitor = False
-            if not reading_monitor: break
-            if line in ["Course", "Clearance"]: section = line; continue
-            if "RMS" in line or "SNAPSHOT" in line: continue
-            parts = re.split(r"\s{2,}", line)
-            if len(parts) >= 3 and "/" not in parts[0] and "Monitor" not in line and "Select" not in line:
-                raw_p = parts[0]
-                val1, val2 = "-", "-"
-                if len(parts) == 3: val1, val2 = parts[1], parts[2]
-                elif len(parts) == 4: val1, val2 = parts[1] + " " + parts[3], parts[2] + " " + parts[3]
-                elif len(parts) == 5: val1, val2 = parts[1] + " " + parts[2], parts[3] + " " + parts[4]
-                key = raw_p
-                if section != "General": key = f"{section} - {raw_p}"
-                data_pool[key] = {"m1": normalize_with_unit(val1), "m2": normalize_with_unit(val2)}
-
-    # 3. PARSE TRANSMITTER DATA
-    if "Transmitter Data" in full_text:
-        try:
-            tx_text = full_text.split("Transmitter Data")[1]
-            tx_lines = tx_text.splitlines()
-            
-            if tool_type in ["LOC", "GP"]:
-                context_left, context_right = "Course", "Clearance"
-                for line in tx_lines:
-                    line = line.strip()
-                    if "Standby" in line: context_left, context_right = "Standby Course", "Standby Clearance"; continue
-                    if "Watts" in line or "Watt" in line:
-                        matches = re.findall(r"([A-Za-z\s]+?)\s+([-\d\.]+\s*(?:Watts|Watt|W))", line)
-                        if len(matches) >= 1:
-                            p, v = matches[0]
-                            k = p.strip() if "Antenna" in p else f"{context_left} {p.strip()}"
-                            data_pool[k] = {"m1": normalize_with_unit(v), "m2": "-"}
-                        if len(matches) >= 2:
-                            p, v = matches[1]
-                            p = p.strip()
-                            if tool_type == "GP" and "Forward Power" in p and "CSB" not in p and "SBO" not in p:
-                                k_right = f"{context_right} Forward Power"
-                            else:
-                                k_right = f"{context_right} {p}"
-                            data_pool[k_right] = {"m1": normalize_with_unit(v), "m2": "-"}
-
-            elif tool_type in ["MM", "OM"]:
-                current_tx = ""
-                for line in tx_lines:
-                    line = line.strip()
-                    if "Transmitter 1" in line: current_tx = "Transmitter 1"
-                    elif "Transmitter 2" in line: current_tx = "Transmitter 2"
-                    elif "Watts" in line or " : 1" in line:
-                        match = re.search(r"([A-Za-z\s]+)\s+([-\d\.]+.*)", line)
-                        if match:
-                            p_name = match.group(1).strip()
-                            val = match.group(2).replace(": 1", "").strip()
-                            key = f"{current_tx} {p_name}"
-                            data_pool[key] = {"m1": normalize_with_unit(val), "m2": "-"}
-        except: pass
+    tx_block = "Main"
 
-    final_rows = []
-    target_keys = ORDERED_PARAMS.get(tool_type, [])
-    for k in target_keys:
-        if k in data_pool:
-            final_rows.append({"Parameter": k, "Monitor 1": data_pool[k]["m1"], "Monitor 2": data_pool[k]["m2"]})
+    def header_line(hline):
+        closed = []
+        for slot in rms_open:
+            _rms_check(hline, slot)
+            slot[3] -= 1
+        while rms_open and rms_open[0][3] == 0:
+            slot = rms_open.pop(0)
+            closed.append((EV_RMS, slot[0], (slot[1], slot[2])))
+        for p in list(rms_waiting):
+            if p in hline:
+                rms_waiting.remove(p)
+                rms_open.append([p, "-", "-", _RMS_LOOKAHEAD])
+        return closed
+
+    def tx_event(part):
+        nonlocal tx_block
+        part = part.strip()
+        if "Standby" in part:
+            tx_block = "Standby"
+            return (EV_TX_BLOCK, tx_block, part)
+        return (EV_TX, tx_block, part)
+
+    for raw_line in _iter_clean_lines(lines):
+        if in_header:
+            if _RAW_MARKER in raw_line:
+                in_header = False
+                head = raw_line[:raw_line.index(_RAW_MARKER)]
+                if head: yield from header_line(head)
+                # Header selesai: slot RMS yang belum genap 4 baris ditutup
+                for slot in rms_open: yield (EV_RMS, slot[0], (slot[1], slot[2]))
+                rms_open.clear()
+            else:
+                yield from header_line(raw_line)
+
+        line = raw_line.strip()
+        if region == EV_MONITOR:
+            if _TX_MARKER not in raw_line:
+                if line in ["Course", "Clearance"]:
+                    section = line
+                    yield (EV_SECTION, section, line)
+                else:
+                    yield (EV_MONITOR, section, line)
+                continue
+            yield (EV_LINE, None, line)
+            region = EV_TX
+            tail = raw_line[raw_line.index(_TX_MARKER) + len(_TX_MARKER):]
+            if _TX_MARKER in tail:
+                region = EV_LINE
+                tail = tail[:tail.index(_TX_MARKER)]
+            yield tx_event(tail)
+        elif region == EV_TX:
+            yield (EV_LINE, None, line)
+            if _TX_MARKER in raw_line:
+                region = EV_LINE
+                yield tx_event(raw_line[:raw_line.index(_TX_MARKER)])
+            else:
+                yield tx_event(raw_line)
+        else:
+            yield (EV_LINE, None, line)
+
+    for slot in rms_open: yield (EV_RMS, slot[0], (slot[1], slot[2]))
+
+# --- EXTRACTOR PER JENIS ALAT (konsumen event tokenizer) ---
+class _PmdtExtractor:
+    """Kumpulkan hasil per sumber; prioritas akhir sama seperti versi lama: TX > Monitor > RMS."""
+    def __init__(self, tool_type):
+        self.tool_type = tool_type
+        self.rms_pool, self.mon_pool, self.tx_pool = {}, {}, {}
+        self.tx_failed = False
+
+    def feed(self, event):
+        kind, tag, body = event
+        if kind == EV_RMS:
+            self.rms_pool[tag] = {"m1": body[0], "m2": body[1]}
+        elif kind == EV_TX or kind == EV_TX_BLOCK:
+            if self.tx_failed: return
+            try: self.on_tx(kind, tag, body)
+            except: self.tx_failed = True
         else:
-            found = False
-            for dp_k, dp_v in data_pool.items():
-                if k.replace(" ", "").lower() == dp_k.replace(" ", "").lower():
-                    final_rows.append({"Parameter": k, "Monitor 1": dp_v["m1"], "Monitor 2": dp_v["m2"]})
-                    found = True; break
-            if not found: final_rows.append({"Parameter": k, "Monitor 1": "-", "Monitor 2": "-"})
+            self.on_line(kind, tag, body)
+
+    def on_line(self, kind, tag, line): pass
+    def on_tx(self, kind, tag, line): pass
+
+    def data_pool(self):
+        data_pool = {p: self.rms_pool[p] for p in _RMS_PARAMS if p in self.rms_pool}
+        data_pool.update(self.mon_pool)
+        data_pool.update(self.tx_pool)
+        return data_pool
+
+class _LocGpExtractor(_PmdtExtractor):
+    def __init__(self, tool_type):
+        super().__init__(tool_type)
+        self.context_left, self.context_right = "Course", "Clearance"
+
+    def on_line(self, kind, section, line):
+        # 2. PARSE MONITOR DATA (hanya blok monitor)
+        if kind != EV_MONITOR: return
+        if "RMS" in line or "SNAPSHOT" in line: return
+        parts = _COLUMN_SPLIT_RE.split(line)
+        if len(parts) >= 3 and "/" not in parts[0] and "Monitor" not in line and "Select" not in line:
+            raw_p = parts[0]
+            val1, val2 = "-", "-"
+            if len(parts) == 3: val1, val2 = parts[1], parts[2]
+            elif len(parts) == 4: val1, val2 = parts[1] + " " + parts[3], parts[2] + " " + parts[3]
+            elif len(parts) == 5: val1, val2 = parts[1] + " " + parts[2], parts[3] + " " + parts[4]
+            key = raw_p
+            if section != "General": key = f"{section} - {raw_p}"
+            self.mon_pool[key] = {"m1": normalize_with_unit(val1), "m2": normalize_with_unit(val2)}
+
+    def on_tx(self, kind, block, line):
+        # 3. PARSE TRANSMITTER DATA
+        if kind == EV_TX_BLOCK: self.context_left, self.context_right = "Standby Course", "Standby Clearance"; return
+        if "Watts" in line or "Watt" in line:
+            matches = _WATT_PAIR_RE.findall(line)
+            if len(matches) >= 1:
+                p, v = matches[0]
+                k = p.strip() if "Antenna" in p else f"{self.context_left} {p.strip()}"
+                self.tx_pool[k] = {"m1": normalize_with_unit(v), "m2": "-"}
+            if len(matches) >= 2:
+                p, v = matches[1]
+                p = p.strip()
+                if self.tool_type == "GP" and "Forward Power" in p and "CSB" not in p and "SBO" not in p:
+                    k_right = f"{self.context_right} Forward Power"
+                else:
+                    k_right = f"{self.context_right} {p}"
+                self.tx_pool[k_right] = {"m1": normalize_with_unit(v), "m2": "-"}
+
+class _MarkerExtractor(_PmdtExtractor):
+    def __init__(self, tool_type):
+        super().__init__(tool_type)
+        self.current_mon = None
+        self.current_tx = ""
+
+    def on_line(self, kind, tag, line):
+        # 2. PARSE MONITOR DATA (MM/OM membaca seluruh baris capture)
+        if not line: return
+        if "Monitor 1" in line and "Enabled" not in line and "Status" not in line: self.current_mon = "m1"; return
+        if "Monitor 2" in line and "Enabled" not in line and "Status" not in line: self.current_mon = "m2"; return
+        if self.current_mon:
+            match = _MARKER_MON_RE.search(line)
+            if match:
+                param, val = match.group(1), match.group(4)
+                unit = line.split()[-1]
+                if unit in ["dB", "%"]: val = f"{val} {unit}"
+                if param not in self.mon_pool: self.mon_pool[param] = {"m1": "-", "m2": "-"}
+                self.mon_pool[param][self.current_mon] = normalize_with_unit(val)
+
+    def on_tx(self, kind, block, line):
+        # 3. PARSE TRANSMITTER DATA
+        if "Transmitter 1" in line: self.current_tx = "Transmitter 1"
+        elif "Transmitter 2" in line: self.current_tx = "Transmitter 2"
+        elif "Watts" in line or " : 1" in line:
+            match = _MARKER_TX_RE.search(line)
+            if match:
+                p_name = match.group(1).strip()
+                val = match.group(2).replace(": 1", "").strip()
+                self.tx_pool[f"{self.current_tx} {p_name}"] = {"m1": normalize_with_unit(val), "m2": "-"}
+
+def parse_pmdt_lines(tool_type, lines):
+    """
+    Versi streaming parse_pmdt_strict: menerima iterable baris. Tokenizer
+    (iter_pmdt_events) membaca capture sekali; extractor per jenis alat
+    mengonsumsi event-nya.
+    """
+    if tool_type in ["MM", "OM"]: extractor = _MarkerExtractor(tool_type)
+    elif tool_type in ["LOC", "GP"]: extractor = _LocGpExtractor(tool_type)
+    else: extractor = _PmdtExtractor(tool_type)
+
+    for event in iter_pmdt_events(lines):
+        extractor.feed(event)
+
+    data_pool = extractor.data_pool()
+    final_rows = _assemble_pmdt_rows(tool_type, data_pool)
 
     active_tx = 1
     if "Transmitter On" in data_pool:
@@ -309,6 +533,31 @@ def parse_pmdt_strict(tool_type, full_text):
         
     return final_rows, active_tx
 
+def _assemble_pmdt_rows(tool_type, data_pool):
+    """
+    Susun hasil sesuai ORDERED_PARAMS. Nama persis langsung diambil; jika
+    tidak ada, cari lewat index kunci ternormalisasi (tanpa spasi, huruf kecil)
+    yang dibuat sekali per pool. Entri pool pertama yang cocok menang.
+    """
+    final_rows = []
+    pool_index = None
+    for k, k_norm in _ORDERED_NORM_KEYS.get(tool_type, ()):
+        dp_v = data_pool.get(k)
+        if dp_v is None:
+            if pool_index is None:
+                pool_index = {}
+                for dp_k in data_pool: pool_index.setdefault(_norm_key(dp_k), dp_k)
+            dp_k = pool_index.get(k_norm)
+            if dp_k is not None: dp_v = data_pool[dp_k]
+        if dp_v is not None:
+            final_rows.append(ParamRow(k, dp_v["m1"], dp_v["m2"]))
+        else:
+            final_rows.append(ParamRow(k))
+    return final_rows
+
+def parse_pmdt_strict(tool_type, full_text):
+    return parse_pmdt_lines(tool_type, full_text.splitlines())
+
 # --- WRAPPER ---
 def parse_pmdt_common(tool_type, text): return parse_pmdt_strict(tool_type, text)
 def parse_pmdt_loc_gp(tool_type, text):
@@ -319,4 +568,149 @@ def parse_pmdt_loc_gp(tool_type, text):
 def parse_pmdt_mm_om(text):
     t_type = "MM"
     if "Outer" in text or "OUTER" in text: t_type = "OM"
-    return parse_pmdt_strict(t_type, text)
\ No newline at end of file
+    return parse_pmdt_strict(t_type, text)
+
+# --- CACHE HASIL PARSE (CONTENT-ADDRESSED, LRU) ---
+class ParseCache:
+    """
+    Memo hasil parse per proses. Kunci = (fungsi, station_type, hash isi teks),
+    jadi capture yang identik hanya diparse sekali. Entri tertua dibuang (LRU)
+    jika melebihi maxsize. Counter hits/misses untuk melihat penghematan.
+    """
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(func, station_type, *texts):
+        h = hashlib.blake2b(digest_size=16)
+        for t in texts:
+            h.update(t.encode("utf-8", "surrogatepass"))
+            h.update(b"\x00")
+        # objek fungsi (bukan __qualname__): parser senama dari modul lain tidak saling tertukar
+        return (func, station_type, h.digest())
+
+    def get_or_parse(self, func, station_type, *texts):
+        key = self.make_key(func, station_type, *texts)
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        result = func(station_type, *texts)
+        with self._lock:
+            self._data[key] = result
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize: self._data.popitem(last=False)
+        return result
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data),
+                "maxsize": self.maxsize, "hit_rate": self.hits / total if total else 0.0}
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+PARSE_CACHE = ParseCache()
+
+def cached_parse(func, station_type, text):
+    """
+    Jalankan parser lewat PARSE_CACHE. ParamRow tidak bisa diubah, jadi cukup
+    list-nya yang disalin agar pemanggil tidak merusak isi cache.
+    Contoh: cached_parse(parse_pmdt_loc_gp, "LOCALIZER", combined_text)
+    """
+    rows, active_tx = PARSE_CACHE.get_or_parse(func, station_type, text)
+    return list(rows), active_tx
+
+# =============================================================================
+# 3. OUTPUT NUMERIK (TYPED) - KOLOM ANGKA + SATUAN PER CAPTURE
+# =============================================================================
+STATUS_NUMERIC = 0 # angka terbaca (value berisi float)
+STATUS_TEXT = 1    # teks seperti NORMAL, Tx 1, SLO (value = NaN)
+STATUS_MISSING = 2 # "-" / kosong (value = NaN)
+
+_NUMERIC_VALUE_RE = re.compile(r"^([-+]?(?:\d+\.?\d*|\.\d+))\s*(.*)$")
+# Sisa setelah angka harus satuan yang dikenal; selain itu (":30:45", ".3", "W ALARM") = teks
+_KNOWN_UNITS = {u.strip().lower(): u.strip() for u in _UNIT_MAP.values()}
+_KNOWN_UNITS.update({u.lower(): u for u in ("kHz", "dBm", "mV", "mA")})
+
+def parse_numeric(val):
+    """
+    Pecah nilai hasil normalize_with_unit menjadi (angka, satuan, status).
+    Contoh: "12.3 W" -> (12.3, "W", STATUS_NUMERIC), "NORMAL" / "12:30:45" -> (nan, "", STATUS_TEXT)
+    """
+    if not val or val == "-": return float("nan"), "", STATUS_MISSING
+    match = _NUMERIC_VALUE_RE.match(val)
+    if not match: return float("nan"), "", STATUS_TEXT
+    unit = match.group(2).strip()
+    if unit:
+        unit = _KNOWN_UNITS.get(_UNIT_MAP.get(unit.lower(), unit).strip().lower())
+        if unit is None: return float("nan"), "", STATUS_TEXT
+    return float(match.group(1)), unit, STATUS_NUMERIC
+
+class TypedCapture:
+    """
+    Satu capture stasiun dalam bentuk kolom (array NumPy), urut sesuai ORDERED_PARAMS.
+    value1/value2: float64 (NaN jika bukan angka), unit1/unit2: string,
+    status1/status2: int8 (STATUS_NUMERIC / STATUS_TEXT / STATUS_MISSING).
+    """
+    __slots__ = ("station", "active_tx", "params", "value1", "value2", "unit1", "unit2", "status1", "status2")
+
+    def __init__(self, station, active_tx, params, value1, value2, unit1, unit2, status1, status2):
+        self.station = station
+        self.active_tx = active_tx
+        self.params = params
+        self.value1, self.value2 = value1, value2
+        self.unit1, self.unit2 = unit1, unit2
+        self.status1, self.status2 = status1, status2
+
+    def __len__(self): return len(self.params)
+
+    def index(self, param):
+        return self.params.index(param)
+
+def to_typed(station, rows, active_tx):
+    """Ubah hasil parser (list ParamRow atau dict Parameter/Monitor 1/Monitor 2) menjadi TypedCapture."""
+    n = len(rows)
+    params = tuple(r["Parameter"] for r in rows)
+    value1, value2 = np.empty(n, dtype=np.float64), np.empty(n, dtype=np.float64)
+    status1, status2 = np.empty(n, dtype=np.int8), np.empty(n, dtype=np.int8)
+    unit1, unit2 = [""] * n, [""] * n
+    for i, r in enumerate(rows):
+        value1[i], unit1[i], status1[i] = parse_numeric(r["Monitor 1"])
+        value2[i], unit2[i], status2[i] = parse_numeric(r["Monitor 2"])
+    return TypedCapture(station, active_tx, params, value1, value2,
+                        np.array(unit1, dtype=str), np.array(unit2, dtype=str), status1, status2)
+
+def parse_maru_typed(station_type, raw_text):
+    rows, active_tx = parse_maru_data(station_type, raw_text)
+    return to_typed(station_type, rows, active_tx)
+
+def parse_pmdt_typed(tool_type, full_text):
+    rows, active_tx = parse_pmdt_strict(tool_type, full_text)
+    return to_typed(tool_type, rows, active_tx)
+
+def stack_typed(captures):
+    """
+    Gabungkan banyak TypedCapture satu stasiun menjadi matriks (capture x parameter)
+    agar tren dan cek limit bisa dihitung vektor, mis. np.nanmax(out["value1"], axis=0).
+    """
+    if not captures: return None
+    params = captures[0].params
+    for c in captures:
+        if c.params != params: raise ValueError(f"Urutan parameter berbeda ({c.station})")
+    return {
+        "params": params,
+        "active_tx": np.array([c.active_tx for c in captures], dtype=np.int8),
+        "value1": np.vstack([c.value1 for c in captures]),
+        "value2": np.vstack([c.value2 for c in captures]),
+        "status1": np.vstack([c.status1 for c in captures]),
+        "status2": np.vstack([c.status2 for c in captures]),
+    }
@@ -0,0 +1,124 @@
+# FILE: bin/batik_read.py
+# ================================================================
+# BATIK READ API (SQLite -> dashboard / laporan)
+# latest(station), history(station, param, start, end), snapshot(ts)
+# Hasil di-cache (LRU) dan otomatis basi saat PRAGMA data_version
+# berubah, jadi rerun dashboard tanpa data baru hampir gratis.
+# ================================================================
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from itertools import chain
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import batik_db
+import batik_parser
+
+SQL_CAPTURE_AT = (
+    "SELECT id, timestamp, tx_fwd_power, tx_ref_power, tx_status FROM {schema}.sessions s "
+    "WHERE station_name = ? AND timestamp <= ? AND EXISTS (SELECT 1 FROM {schema}.measurements m WHERE m.session_id = s.id) "
+    "ORDER BY timestamp DESC, id DESC LIMIT 1"
+)
+SQL_ROWS = "SELECT parameter_name, value_mon1, value_mon2 FROM {schema}.measurements WHERE session_id = ? ORDER BY id"
+MAX_TS = "9999-12-31 23:59:59"
+
+class BatikReader:
+    """
+    Baca data tersimpan lewat BatikDB. Semua hasil di-cache per versi data:
+    setiap panggilan hanya membaca PRAGMA data_version, query SQL baru jalan
+    jika robot sudah menulis data baru (atau entri terbuang dari LRU).
+    Hasil yang dikembalikan dipakai bersama - jangan diubah.
+    """
+    def __init__(self, db=None, maxsize=512):
+        self.db = db or batik_db.get_db()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _cached(self, key, loader):
+        version = self.db.data_version()
+        with self._lock:
+            if version != self._version:
+                self._data.clear()
+                self._version = version
+            elif key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        result = loader()
+        with self._lock:
+            if version == self._version:
+                self._data[key] = result
+                while len(self._data) > self.maxsize: self._data.popitem(last=False)
+        return result
+
+    def _capture_at(self, station, ts):
+        """Capture terakhir stasiun pada/sebelum ts: DB utama dulu, lalu arsip (tahun terbaru dulu)."""
+        db = self.db
+        with db.lock:
+            schemas = ["main"]
+            if ts != MAX_TS or not db.conn.execute("SELECT 1 FROM sessions WHERE station_name = ? LIMIT 1", (station,)).fetchone():
+                schemas = chain(schemas, db.iter_archives(None, ts, newest_first=True))
+            for schema in schemas:
+                row = db.conn.execute(SQL_CAPTURE_AT.format(schema=schema), (station, ts)).fetchone()
+                if not row: continue
+                rows = tuple(batik_parser.ParamRow(p, m1 or "-", m2 or "-")
+                             for p, m1, m2 in db.conn.execute(SQL_ROWS.format(schema=schema), (row[0],)))
+                return {"station": station, "session_id": row[0], "timestamp": row[1],
+                        "tx_fwd_power": row[2], "tx_ref_power": row[3], "tx_status": row[4], "rows": rows}
+        return None
+
+    def latest(self, station):
+        """Capture terbaru satu stasiun: dict {station, session_id, timestamp, tx_*, rows} atau None."""
+        return self._cached(("latest", station), lambda: self._capture_at(station, MAX_TS))
+
+    def history(self, station, parameter, start=None, end=None):
+        """Riwayat numerik satu parameter: tuple (ts, mon1, mon2) urut waktu (ikut arsip per tahun)."""
+        start = batik_db._ts_str(start) if start is not None else None
+        end = batik_db._ts_str(end) if end is not None else None
+        return self._cached(("history", station, parameter, start, end),
+                            lambda: tuple(self.db.query_series(station, parameter, start, end)))
+
+    def snapshot(self, timestamp):
+        """Kondisi semua stasiun pada waktu tertentu: {station: capture terakhir <= timestamp}."""
+        ts = batik_db._ts_str(timestamp)
+        def load():
+            with self.db.lock:
+                stations = [r[0] for r in self.db.conn.execute("SELECT DISTINCT station_name FROM sessions WHERE timestamp <= ?", (ts,))]
+                for schema in self.db.iter_archives(None, ts):
+                    stations += [r[0] for r in self.db.conn.execute(f"SELECT DISTINCT station_name FROM {schema}.sessions")]
+            out = {}
+            for station in sorted(set(stations)):
+                cap = self._capture_at(station, ts)
+                if cap: out[station] = cap
+            return out
+        return self._cached(("snapshot", ts), load)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data),
+                "maxsize": self.maxsize, "hit_rate": self.hits / total if total else 0.0}
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._version = None
+            self.hits = self.misses = 0
+
+_readers = {}
+_readers_lock = threading.Lock()
+
+def get_reader(db_path=None):
+    """Satu BatikReader per file DB per proses (memakai koneksi bersama batik_db.get_db)."""
+    db = batik_db.get_db(db_path)
+    with _readers_lock:
+        reader = _readers.get(db.db_path)
+        if reader is None or reader.db is not db:
+            reader = _readers[db.db_path] = BatikReader(db)
+        return reader
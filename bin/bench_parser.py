@@ -0,0 +1,184 @@
+# FILE: bin/bench_parser.py
+# ================================================================
+# BENCHMARK & CEK KESETARAAN BATIK PARSER
+# Jalankan: python bin/bench_parser.py [--scales 1,100,10000] [--save-baseline]
+# Korpus capture sintetis dari synthetic_captures.py; hasil dibandingkan
+# dengan baseline JSON agar regresi kecepatan/alokasi langsung terlihat.
+# ================================================================
+
+import os
+import sys
+import re
+import json
+import time
+import random
+import argparse
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import config
+import batik_parser
+import synthetic_captures
+
+DEFAULT_BASELINE = os.path.join(config.BASE_DIR, "config", "bench_parser_baseline.json")
+CORPUS_SIZE = 50 # capture unik per alat; skala besar memakai korpus ini berulang
+ALLOC_SAMPLE = 100 # jumlah capture untuk ukur alokasi (tracemalloc lambat)
+MIN_BENCH_TIME = 0.2 # skala kecil diulang sampai minimal selama ini agar angka stabil
+
+# Contoh nilai mentah seperti yang keluar dari kolom PMDT / MARU
+SAMPLE_VALUES = [
+    "12.3 Watts", "12.3Watts", "0.45 Watt", "3.10W", "-", "", "_", "  ",
+    "NORMAL", "Enabled", "Tx 1", "ON / OFF", "28.1V", "27.9 Volts", "1.2A", "0.80 Amps",
+    "359.8 degs", "0.2deg", "30.1 %", "95%", "9960Hz", "9960 Hz", "1020 hz",
+    "113.100MHz", "113.100 MHz", "108.5 M Hz", "0.0012 DDM", "-0.050DDM", "-12.5dB",
+    "3.45usec", "2700 pp/s", "50.0 usec", "24.8 V", "1.02 : 1", "45.0 C", "2.3 dBm",
+    "5VW", "5 dB Hz", "0.1DDM Hz", "50%W", "12.0 VA",
+]
+
+FUZZ_TOKENS = [
+    "Watts", "Watt", "W", "w", "Volts", "Volt", "V", "Amps", "Amp", "A", "a", "degs", "deg",
+    "%", "Hz", "hz", "MHz", "M", "DDM", "dB", "usec", "pp/s", "m", "s", "x", "dBm",
+    "12.3", "-0.05", "5", " ", "  ", "\t", "/", "-", "NORMAL",
+]
+
+def reference_normalize(val):
+    """Salinan perilaku normalize_with_unit sebelum mesin satu-regex."""
+    if not val or val.strip() in ["-", "", "_"]: return "-"
+    val = val.strip()
+    if re.match(r"^[A-Za-z\s/]+$", val) and not any(c.isdigit() for c in val):
+        return val
+    val = batik_parser._normalize_with_unit_legacy(val)
+    return re.sub(r"\s+", " ", val).strip()
+
+def fuzz_values(count, seed=20):
+    rnd = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rnd.choice(FUZZ_TOKENS) for _ in range(rnd.randint(1, 6)))
+
+def check_normalize_equivalence(fuzz_count):
+    """Bandingkan hasil mesin baru dengan perilaku lama. Return daftar selisih."""
+    mismatches = []
+    for val in list(SAMPLE_VALUES) + list(fuzz_values(fuzz_count)):
+        expected, got = reference_normalize(val), batik_parser.normalize_with_unit(val)
+        if expected != got: mismatches.append((val, expected, got))
+    return mismatches
+
+def time_call(func, values, loops):
+    start = time.perf_counter()
+    for _ in range(loops):
+        for v in values: func(v)
+    elapsed = time.perf_counter() - start
+    return elapsed, (loops * len(values)) / elapsed if elapsed else 0.0
+
+def bench_normalize(loops):
+    values = SAMPLE_VALUES
+    t_old, rate_old = time_call(reference_normalize, values, loops)
+    t_new, rate_new = time_call(batik_parser.normalize_with_unit, values, loops)
+    print(f"{'normalize (lama)':<24} {t_old:8.3f} s  {rate_old:12,.0f} nilai/s")
+    print(f"{'normalize (baru)':<24} {t_new:8.3f} s  {rate_new:12,.0f} nilai/s")
+    print(f"{'Speedup':<24} {t_old / t_new if t_new else 0:8.2f} x")
+
+# --- SUITE PARSER ---
+def build_corpus(seed=0):
+    return {kind: synthetic_captures.generate(kind, CORPUS_SIZE, seed) for kind in synthetic_captures.ALL_KINDS}
+
+def _workloads(corpus):
+    """(nama, fungsi, daftar input) - satu input = satu capture / satu nilai."""
+    pmdt = [(batik_parser.parse_pmdt_strict, (kind, text)) for kind in synthetic_captures.PMDT_KINDS for text in corpus[kind]]
+    maru = [(batik_parser.parse_maru_data, (kind, text)) for kind in synthetic_captures.MARU_KINDS for text in corpus[kind]]
+    values = [(batik_parser.normalize_with_unit, (v,)) for v in SAMPLE_VALUES]
+    return [("parse_pmdt_strict", pmdt), ("parse_maru_data", maru), ("normalize_with_unit", values)]
+
+def _run(calls, count):
+    n = len(calls)
+    for i in range(count):
+        func, args = calls[i % n]
+        func(*args)
+
+def measure(calls, count):
+    """Return (item/detik, puncak alokasi KiB per item)."""
+    done, elapsed = 0, 0.0
+    while not done or elapsed < MIN_BENCH_TIME:
+        start = time.perf_counter()
+        _run(calls, count)
+        elapsed += time.perf_counter() - start
+        done += count
+    rate = done / elapsed if elapsed else 0.0
+
+    sample = min(count, ALLOC_SAMPLE)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    peak = 0
+    for i in range(sample):
+        func, args = calls[i % len(calls)]
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        func(*args)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return rate, peak / 1024.0
+
+def run_suite(scales, seed=0):
+    corpus = build_corpus(seed)
+    results = {}
+    for name, calls in _workloads(corpus):
+        for scale in scales:
+            count = len(calls) * scale if name == "normalize_with_unit" else scale * (len(calls) // CORPUS_SIZE)
+            rate, peak_kib = measure(calls, count)
+            results[f"{name}@{scale}x"] = {"items": count, "rate": rate, "peak_kib": peak_kib}
+            print(f"   {name:<22} {scale:>6}x  {count:>8} item  {rate:12,.1f} item/s  puncak {peak_kib:8.1f} KiB")
+    return results
+
+def compare_baseline(results, baseline, tolerance):
+    """Return daftar regresi: kecepatan turun / alokasi naik melebihi toleransi."""
+    regressions = []
+    for key, cur in results.items():
+        old = baseline.get(key)
+        if not old: continue
+        if old["rate"] and cur["rate"] < old["rate"] * (1 - tolerance):
+            regressions.append(f"{key}: kecepatan {cur['rate']:,.1f} < baseline {old['rate']:,.1f} item/s")
+        if old["peak_kib"] and cur["peak_kib"] > old["peak_kib"] * (1 + tolerance):
+            regressions.append(f"{key}: alokasi {cur['peak_kib']:.1f} > baseline {old['peak_kib']:.1f} KiB")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--loops", type=int, default=2000, help="Jumlah ulangan micro-benchmark")
+    parser.add_argument("--fuzz", type=int, default=50000, help="Jumlah nilai acak untuk cek kesetaraan")
+    parser.add_argument("--scales", default="1,100,10000", help="Skala korpus, dipisah koma")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="File baseline JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="Simpan hasil sebagai baseline baru")
+    parser.add_argument("--tolerance", type=float, default=0.20, help="Batas regresi (0.20 = 20%%)")
+    args = parser.parse_args()
+
+    print(">>> CEK KESETARAAN normalize_with_unit")
+    diff = check_normalize_equivalence(args.fuzz)
+    if diff:
+        for val, expected, got in diff[:20]:
+            print(f"   [BEDA] {val!r}: lama={expected!r} baru={got!r}")
+        print(f">>> [FAIL] {len(diff)} nilai berbeda.")
+        sys.exit(1)
+    print(f">>> [OK] {len(SAMPLE_VALUES) + args.fuzz} nilai identik.")
+
+    print("\n>>> MICRO-BENCHMARK normalize_with_unit")
+    bench_normalize(args.loops)
+
+    print("\n>>> SUITE PARSER (korpus sintetis)")
+    scales = [int(x) for x in args.scales.split(",") if x.strip()]
+    results = run_suite(scales)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n>>> Baseline disimpan: {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print("\n>>> [REGRESI]")
+            for msg in regressions: print(f"   {msg}")
+            sys.exit(2)
+        print("\n>>> [OK] Tidak ada regresi terhadap baseline.")
+    else:
+        print("\n>>> Baseline belum ada (jalankan dengan --save-baseline).")
@@ -0,0 +1,244 @@
+# FILE: bin/bench_sheets.py
+# ================================================================
+# BENCHMARK UPLOAD & BACA GOOGLE SHEET (OFFLINE, FAKE GSPREAD)
+# Jalankan: python bin/bench_sheets.py [--latency-ms 50] [--cycles 10] [--save-baseline]
+# Semua panggilan API ke fake_gspread (latensi & error 429 disimulasikan):
+# upload langsung vs outbox per sheet vs outbox batch (run_all), outbox
+# end-to-end dengan error kuota, dan baca logbook_reader / get_all_values.
+# ================================================================
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import config
+import batik_delta
+import fake_gspread
+import logbook_reader
+import sheet_handler
+import sheet_outbox
+import synthetic_captures
+
+DEFAULT_BASELINE = os.path.join(config.BASE_DIR, "config", "bench_sheets_baseline.json")
+TOOLS = synthetic_captures.ALL_KINDS
+START_TS = datetime(2026, 1, 1, 0, 0)
+
+def build_cycles(cycles, seed=0):
+    """[[(tool, rows, ts, active_tx), ...per alat], ...per siklus] dari capture sintetis yang diparse."""
+    corpus = {kind: synthetic_captures.generate(kind, cycles, seed) for kind in TOOLS}
+    out = []
+    for c in range(cycles):
+        ts = START_TS + timedelta(hours=c)
+        cycle = []
+        for kind in TOOLS:
+            rows, active_tx = batik_delta.parse_station_text(kind, corpus[kind][c])
+            cycle.append((kind, rows, ts, active_tx))
+        out.append(cycle)
+    return out
+
+def new_backend(args, error_rate=0.0):
+    backend = fake_gspread.FakeBackend(latency=args.latency_ms / 1000.0, error_rate=error_rate, seed=args.seed)
+    backend.create(sheet_handler.SHEET_NAME)
+    sheet_handler.set_client_factory(backend.client)
+    return backend
+
+def expected_sheets(cycles):
+    """{judul sheet: baris payload} yang seharusnya ada di sheet setelah semua terkirim (tanpa header)."""
+    expected = {}
+    for cycle in cycles:
+        for tool, rows, ts, active_tx in cycle:
+            title = sheet_handler.raw_sheet_title(tool, ts)
+            expected.setdefault(title, []).extend(sheet_handler.build_payload(rows, ts, active_tx))
+    return expected
+
+def check_sheets(backend, expected):
+    """Bandingkan isi fake (teks get_all_values) dengan payload. Return daftar selisih."""
+    sh = backend.spreadsheets[sheet_handler.SHEET_NAME]
+    problems = []
+    for title, rows in expected.items():
+        ws = sh._by_title(title)
+        if ws is None:
+            problems.append(f"{title}: sheet tidak ada")
+            continue
+        got = [[fake_gspread._cell_text(v) for v in r] for r in ws.values]
+        want = [sheet_handler.RAW_HEADER] + [[fake_gspread._cell_text(v) for v in r] for r in rows]
+        if got != want:
+            problems.append(f"{title}: {len(got) - 1} baris di sheet, seharusnya {len(want) - 1} (atau urutan/isi beda)")
+        if not ws.hidden or ws.frozen_rows != 1: problems.append(f"{title}: tidak hidden / freeze baris 1")
+    return problems
+
+def _result(name, backend, cycles, elapsed, rows, extra=None):
+    captures = sum(len(c) for c in cycles)
+    res = {"captures": captures, "rows": rows, "seconds": elapsed,
+           "rate": captures / elapsed if elapsed else 0.0,
+           "calls_per_capture": backend.total_calls() / captures, "logins": backend.logins}
+    res.update(extra or {})
+    calls = ", ".join(f"{k}={v}" for k, v in sorted(backend.calls.items()))
+    print(f"   {name:<20} {elapsed:7.2f} s  {res['rate']:8.1f} capture/s  {res['calls_per_capture']:5.2f} API/capture  ({calls})")
+    return res
+
+# --- SKENARIO UPLOAD ---
+def bench_direct(args, cycles):
+    """Perilaku lama: robot memanggil upload_raw_data langsung (memblok GUI selama HTTP)."""
+    backend = new_backend(args)
+    start = time.perf_counter()
+    rows = 0
+    for cycle in cycles:
+        for tool, data, ts, active_tx in cycle:
+            status, err = sheet_handler.upload_raw_data(tool, data, ts, active_tx)
+            if err: raise RuntimeError(err)
+            rows += len(data)
+    res = _result("upload_direct", backend, cycles, time.perf_counter() - start, rows)
+    return res, check_sheets(backend, expected_sheets(cycles))
+
+def bench_outbox(args, cycles, name, batched, error_rate=0.0):
+    """
+    Robot enqueue (diukur sebagai waktu blok per capture), lalu flush per siklus.
+    error_rate > 0: error 429 disuntikkan, waktu backoff dilompati dengan jam simulasi
+    (flush(now=...)) sehingga retry + urutan + tanpa duplikasi ikut teruji.
+    """
+    backend = new_backend(args, error_rate)
+    with tempfile.TemporaryDirectory() as tmp:
+        outbox = sheet_outbox.SheetOutbox(os.path.join(tmp, "outbox.db"))
+        enqueue_time, rows, failures = 0.0, 0, 0
+        clock = time.time()
+        start = time.perf_counter()
+        try:
+            for cycle in cycles:
+                t0 = time.perf_counter()
+                for tool, data, ts, active_tx in cycle:
+                    outbox.enqueue(tool, data, ts, active_tx)
+                    rows += len(data)
+                enqueue_time += time.perf_counter() - t0
+                for _ in range(1000):
+                    sent, failed = outbox.flush(now=clock, batched=batched)
+                    failures += failed
+                    if not sent and not failed: break
+                    if failed: clock += sheet_outbox.BACKOFF_MAX * 1.2 # lompat melewati backoff terpanjang
+            elapsed = time.perf_counter() - start
+            left = outbox.stats()["items"]
+        finally:
+            outbox.close()
+    captures = sum(len(c) for c in cycles)
+    res = _result(name, backend, cycles, elapsed, rows,
+                  {"enqueue_ms": enqueue_time / captures * 1000.0, "retries": failures, "injected_429": backend.errors})
+    print(f"   {'':<20} enqueue {res['enqueue_ms']:.3f} ms/capture | {failures} kiriman sheet gagal -> retry | sisa antrian {left}")
+    problems = check_sheets(backend, expected_sheets(cycles))
+    if left: problems.append(f"{left} item masih di antrian")
+    return res, problems
+
+# --- SKENARIO BACA ---
+def last_sheet_values(rows):
+    """Layout sheet helper LAST_{tool} seperti yang dibaca logbook_reader."""
+    values = [["Data Terakhir: 2026-01-01 00:00"], ["Active TX : 1"], [""],
+              ["NO", "PARAMETER", "TANGGAL", "", "", ""], ["", "", "Tx 1", "", "Tx 2", ""],
+              ["", "", "Mon 1", "Mon 2", "Mon 1", "Mon 2"]]
+    values += [[str(i + 1), f"PARAM {i}", "1.0", "1.1", "2.0", "2.1"] for i in range(rows)]
+    return values
+
+def bench_read(args, raw_rows):
+    backend = new_backend(args)
+    sh = backend.spreadsheets[sheet_handler.SHEET_NAME]
+    for tool in TOOLS: sh.seed_worksheet(f"LAST_{tool}", last_sheet_values(40))
+    payload = sheet_handler.build_payload([("PARAM", "1.0", "2.0")] * raw_rows, START_TS, 1)
+    ws = sh.seed_worksheet("RAW_BENCH_2026", [sheet_handler.RAW_HEADER] + payload, hidden=True)
+
+    original = logbook_reader.get_gspread_client
+    logbook_reader.get_gspread_client = backend.client
+    try:
+        start = time.perf_counter()
+        reads = 0
+        for _ in range(args.read_loops):
+            for tool in TOOLS:
+                df, _, err = logbook_reader.fetch_data_from_last_sheet(tool)
+                if err or df is None or len(df) != 40: raise RuntimeError(err or "baris LAST_ tidak lengkap")
+                reads += 1
+        elapsed = time.perf_counter() - start
+    finally:
+        logbook_reader.get_gspread_client = original
+    res_logbook = {"reads": reads, "seconds": elapsed, "rate": reads / elapsed if elapsed else 0.0,
+                   "calls_per_read": backend.total_calls() / reads}
+    print(f"   {'logbook_reader':<20} {elapsed:7.2f} s  {res_logbook['rate']:8.1f} baca/s     {res_logbook['calls_per_read']:5.2f} API/baca")
+
+    backend.reset_stats()
+    start = time.perf_counter()
+    values = ws.get_all_values()
+    elapsed = time.perf_counter() - start
+    res_raw = {"rows": len(values) - 1, "seconds": elapsed, "rate": (len(values) - 1) / elapsed if elapsed else 0.0}
+    print(f"   {'get_all_values RAW':<20} {elapsed:7.2f} s  {res_raw['rate']:10,.0f} baris/s ({res_raw['rows']} baris)")
+    return {"read_logbook": res_logbook, "read_raw": res_raw}
+
+def compare_baseline(results, baseline, tolerance):
+    """Regresi: kecepatan turun melebihi toleransi, atau jumlah panggilan API per capture/baca naik."""
+    regressions = []
+    if baseline.get("settings") != results.get("settings"):
+        return ["pengaturan beda dengan baseline (latency/cycles/seed) - simpan ulang baseline"]
+    for key, cur in results.items():
+        old = baseline.get(key)
+        if key == "settings" or not old: continue
+        if old.get("rate") and cur["rate"] < old["rate"] * (1 - tolerance):
+            regressions.append(f"{key}: kecepatan {cur['rate']:,.1f} < baseline {old['rate']:,.1f}")
+        for metric in ("calls_per_capture", "calls_per_read"):
+            if metric in old and cur[metric] > old[metric] + 1e-9:
+                regressions.append(f"{key}: {metric} {cur[metric]:.2f} > baseline {old[metric]:.2f}")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Latensi simulasi per panggilan API")
+    parser.add_argument("--cycles", type=int, default=10, help="Jumlah siklus run_all (6 alat per siklus)")
+    parser.add_argument("--error-rate", type=float, default=0.3, help="Peluang error 429 untuk skenario kuota")
+    parser.add_argument("--read-loops", type=int, default=5, help="Ulangan baca 6 sheet LAST_")
+    parser.add_argument("--raw-rows", type=int, default=50000, help="Jumlah baris sheet RAW untuk uji get_all_values")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="File baseline JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="Simpan hasil sebagai baseline baru")
+    parser.add_argument("--tolerance", type=float, default=0.20, help="Batas regresi kecepatan (0.20 = 20%%)")
+    args = parser.parse_args()
+
+    cycles = build_cycles(args.cycles, args.seed)
+    print(f">>> {args.cycles} siklus x {len(TOOLS)} alat, latensi {args.latency_ms:.0f} ms/panggilan")
+    results = {"settings": {"latency_ms": args.latency_ms, "cycles": args.cycles, "error_rate": args.error_rate, "seed": args.seed}}
+    failures = []
+
+    print("\n>>> UPLOAD")
+    for name, run in [
+        ("upload_direct", lambda: bench_direct(args, cycles)),
+        ("outbox_per_sheet", lambda: bench_outbox(args, cycles, "outbox_per_sheet", batched=False)),
+        ("outbox_batched", lambda: bench_outbox(args, cycles, "outbox_batched", batched=True)),
+        ("outbox_quota_429", lambda: bench_outbox(args, cycles, "outbox_quota_429", batched=True, error_rate=args.error_rate)),
+    ]:
+        res, problems = run()
+        results[name] = res
+        failures += [f"{name}: {p}" for p in problems]
+
+    print("\n>>> BACA")
+    results.update(bench_read(args, args.raw_rows))
+    sheet_handler.set_client_factory(None)
+
+    if failures:
+        print("\n>>> [FAIL] Isi sheet tidak sesuai payload:")
+        for msg in failures[:20]: print(f"   {msg}")
+        sys.exit(1)
+    print("\n>>> [OK] Semua skenario: isi sheet identik dengan payload (urut, tanpa duplikat).")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n>>> Baseline disimpan: {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print("\n>>> [REGRESI]")
+            for msg in regressions: print(f"   {msg}")
+            sys.exit(2)
+        print("\n>>> [OK] Tidak ada regresi terhadap baseline.")
+    else:
+        print("\n>>> Baseline belum ada (jalankan dengan --save-baseline).")
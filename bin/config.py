@@ -10,6 +10,8 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # --- DATABASE ---
 # Menggunakan setting asli Anda
 DB_PATH = os.path.join(BASE_DIR, "data", "batik_master.db")
+# Antrian upload Google Sheet (terpisah dari DB utama, dikuras oleh sheet_outbox.py)
+OUTBOX_PATH = os.path.join(BASE_DIR, "data", "sheet_outbox.db")
 
 # --- OUTPUT PATHS ---
 OUTPUT_DIR = os.path.join(BASE_DIR, "output") # Ditambahkan untuk referensi umum
@@ -0,0 +1,143 @@
+# FILE: bin/export_columnar.py
+# ================================================================
+# EKSPOR RIWAYAT PENGUKURAN KE FORMAT KOLOM (ANALISA ENGINEERING)
+# Satu file per stasiun per tahun: Parquet (jika pyarrow ada) atau
+# NumPy .npz. Data dibaca bertahap dari tabel series (DB utama + arsip),
+# tidak pernah dimuat sekaligus ke pandas.
+# Jalankan: python bin/export_columnar.py [--format npz] [--station DVOR]
+# ================================================================
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import config
+import batik_db
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+DEFAULT_OUT = os.path.join(config.OUTPUT_DIR, "export")
+FETCH_SIZE = 50000 # baris per potongan baca SQLite / row group Parquet
+
+def iter_partitions(db, stations=None, years=None):
+    """
+    Hasilkan (station, year, [sumber, ...]) untuk setiap partisi yang punya data.
+    Sumber = tahun arsip, atau None untuk DB utama (arsip di-ATTACH saat dibaca, maks MAX_ATTACHED).
+    """
+    found = {}
+    with db.lock:
+        for source in db.archive_years() + [None]: # arsip dulu: urut waktu naik
+            schema = source_schema(db, source)
+            if not schema: continue
+            for station, year in db.conn.execute(f"SELECT DISTINCT station_name, substr(ts, 1, 4) FROM {schema}.series"):
+                if stations and station not in stations: continue
+                if years and int(year) not in years: continue
+                found.setdefault((station, int(year)), []).append(source)
+    for (station, year), sources in sorted(found.items()):
+        yield station, year, sources
+
+def source_schema(db, source):
+    return "main" if source is None else db.attach_year(source)
+
+def iter_chunks(db, station, year, sources):
+    """
+    Potongan kolom satu partisi: dict ts (datetime64[s]), param/unit (kode int16),
+    mon1/mon2 (float64, NaN jika kosong). Kamus kode ada di chunk["params"] / chunk["units"]
+    dan terus bertambah antar potongan (kode lama tidak berubah).
+    """
+    params, units = {}, {}
+    span = (station, f"{year}-01-01", f"{year + 1}-01-01")
+    for source in sources:
+        cur = db.conn.execute(f"SELECT ts, parameter_name, mon1, mon2, unit FROM {source_schema(db, source)}.series "
+                              "WHERE station_name = ? AND ts >= ? AND ts < ? ORDER BY ts", span)
+        while True:
+            rows = cur.fetchmany(FETCH_SIZE)
+            if not rows: break
+            ts, p, m1, m2, u = zip(*rows)
+            yield {
+                "ts": np.array(ts, dtype="datetime64[s]"),
+                "param": np.fromiter((params.setdefault(x, len(params)) for x in p), dtype=np.int16, count=len(p)),
+                "mon1": np.array(m1, dtype=np.float64),
+                "mon2": np.array(m2, dtype=np.float64),
+                "unit": np.fromiter((units.setdefault(x or "", len(units)) for x in u), dtype=np.int16, count=len(u)),
+                "params": list(params), "units": list(units),
+            }
+
+def partition_path(out_dir, station, year, fmt):
+    return os.path.join(out_dir, station, f"{station}_{year}.{fmt}")
+
+def write_npz(path, chunks, compress=False):
+    cols = {"ts": [], "param": [], "mon1": [], "mon2": [], "unit": []}
+    params, units = [], []
+    for chunk in chunks:
+        for k in cols: cols[k].append(chunk[k])
+        params, units = chunk["params"], chunk["units"]
+    if not cols["ts"]: return 0
+    data = {k: np.concatenate(v) for k, v in cols.items()}
+    data["params"] = np.array(params, dtype=str)
+    data["units"] = np.array(units, dtype=str)
+    (np.savez_compressed if compress else np.savez)(path, **data)
+    return len(data["ts"])
+
+def write_parquet(path, chunks, compress=False):
+    """Streaming: satu row group per potongan; parameter & satuan jadi kolom dictionary."""
+    schema = pa.schema([("ts", pa.timestamp("s")), ("parameter", pa.dictionary(pa.int16(), pa.string())),
+                        ("mon1", pa.float64()), ("mon2", pa.float64()), ("unit", pa.dictionary(pa.int16(), pa.string()))])
+    total = 0
+    with pq.ParquetWriter(path, schema, compression="zstd" if compress else "snappy") as writer:
+        for chunk in chunks:
+            params = pa.array(chunk["params"], pa.string())
+            units = pa.array(chunk["units"], pa.string())
+            table = pa.Table.from_arrays([
+                pa.array(chunk["ts"]),
+                pa.DictionaryArray.from_arrays(pa.array(chunk["param"]), params),
+                pa.array(chunk["mon1"]), pa.array(chunk["mon2"]),
+                pa.DictionaryArray.from_arrays(pa.array(chunk["unit"]), units),
+            ], schema=schema)
+            writer.write_table(table)
+            total += len(chunk["ts"])
+    return total
+
+def load_npz(path):
+    """Baca satu partisi .npz -> dict kolom (ts, param, mon1, mon2, unit, params, units)."""
+    with np.load(path) as f: return {k: f[k] for k in f.files}
+
+def export_columnar(db, out_dir=DEFAULT_OUT, fmt=None, stations=None, years=None, compress=False):
+    fmt = fmt or ("parquet" if HAS_PYARROW else "npz")
+    if fmt == "parquet" and not HAS_PYARROW: raise RuntimeError("pyarrow tidak terpasang (pakai --format npz)")
+    writer = write_parquet if fmt == "parquet" else write_npz
+    written = []
+    for station, year, sources in iter_partitions(db, stations, years):
+        path = partition_path(out_dir, station, year, fmt)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        start = time.perf_counter()
+        with db.lock: count = writer(path, iter_chunks(db, station, year, sources), compress)
+        print(f"   {station:<14} {year}  {count:>9} baris  {time.perf_counter() - start:6.2f}s  -> {path}")
+        written.append((path, count))
+    return written
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=config.DB_PATH, help="File SQLite sumber")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="Folder tujuan")
+    parser.add_argument("--format", choices=["parquet", "npz"], default=None, help="Default: parquet jika pyarrow ada, selain itu npz")
+    parser.add_argument("--station", action="append", help="Filter stasiun (LOCALIZER, DVOR, ...), boleh berulang")
+    parser.add_argument("--year", type=int, action="append", help="Filter tahun, boleh berulang")
+    parser.add_argument("--compress", action="store_true", help="Kompresi lebih kecil (baca sedikit lebih lambat)")
+    args = parser.parse_args()
+
+    db = batik_db.BatikDB(args.db)
+    try:
+        stations = [s.upper() for s in args.station] if args.station else None
+        files = export_columnar(db, args.out, args.format, stations, args.year, args.compress)
+        print(f">>> {len(files)} file, {sum(c for _, c in files)} baris diekspor.")
+    finally:
+        db.close()
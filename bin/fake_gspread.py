@@ -0,0 +1,355 @@
+# FILE: bin/fake_gspread.py
+# ================================================================
+# FAKE GOOGLE SHEETS (IN-MEMORY) UNTUK BENCHMARK & UJI OFFLINE
+# Meniru subset gspread yang dipakai BATIK (sheet_handler, logbook_reader,
+# dashboard): open/open_by_key, worksheet(s), add_worksheet, batch_update,
+# values_append, fetch_sheet_metadata, append_rows, get_all_values,
+# lastUpdateTime. Latensi per panggilan API & error kuota (429) bisa diatur.
+# Pakai: backend = FakeBackend(latency=0.05); sheet_handler.set_client_factory(backend.client)
+# ================================================================
+
+import re
+import json
+import time
+import random
+import threading
+from datetime import datetime, timezone
+
+import gspread
+import requests
+
+def quota_error(message="Quota exceeded for quota metric 'Write requests' (simulasi)."):
+    """APIError 429 persis seperti yang dilempar gspread saat kuota per menit habis."""
+    response = requests.Response()
+    response.status_code = 429
+    response._content = json.dumps({"error": {"code": 429, "message": message, "status": "RESOURCE_EXHAUSTED"}}).encode("utf-8")
+    return gspread.exceptions.APIError(response)
+
+def api_error(code, message, status="INVALID_ARGUMENT"):
+    response = requests.Response()
+    response.status_code = code
+    response._content = json.dumps({"error": {"code": code, "message": message, "status": status}}).encode("utf-8")
+    return gspread.exceptions.APIError(response)
+
+def _cell_text(value):
+    """Nilai tersimpan -> teks seperti get_all_values (angka bulat tanpa .0)."""
+    if value is None: return ""
+    if isinstance(value, float) and value.is_integer(): return str(int(value))
+    return str(value)
+
+def _range_title(range_name):
+    """"'RAW_GP_2026'!A1" / "RAW_GP_2026" -> "RAW_GP_2026"."""
+    title = range_name.rsplit("!", 1)[0] if "!" in range_name else range_name
+    if len(title) >= 2 and title[0] == title[-1] == "'": title = title[1:-1].replace("''", "'")
+    return title
+
+class FakeBackend:
+    """
+    Penyimpanan bersama semua client palsu (satu 'akun Google').
+    latency     : detik per panggilan API (ditambah jitter acak 0..jitter)
+    error_rate  : peluang (0..1) sebuah panggilan gagal dengan 429
+    quota_per_minute : batas panggilan per 60 detik bergulir (None = tanpa batas), lewat -> 429
+    calls       : hitungan panggilan per nama metode (untuk benchmark)
+    """
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, quota_per_minute=None, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.quota_per_minute = quota_per_minute
+        self.spreadsheets = {}
+        self.calls = {}
+        self.logins = 0
+        self.errors = 0
+        self.lock = threading.RLock()
+        self._rnd = random.Random(seed)
+        self._window = []
+
+    def client(self):
+        """Pengganti gspread.service_account(...) - cocok untuk sheet_handler.set_client_factory."""
+        with self.lock: self.logins += 1
+        return FakeClient(self)
+
+    def create(self, title):
+        with self.lock:
+            sh = FakeSpreadsheet(self, title, f"fake-{len(self.spreadsheets) + 1:04d}")
+            self.spreadsheets[title] = sh
+            return sh
+
+    def api_call(self, name):
+        """Dipanggil setiap 'request HTTP': hitung, tunda, lalu mungkin lempar 429."""
+        with self.lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            delay = self.latency + (self._rnd.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate and self._rnd.random() < self.error_rate
+            if self.quota_per_minute is not None:
+                now = time.monotonic()
+                self._window = [t for t in self._window if now - t < 60.0]
+                if len(self._window) >= self.quota_per_minute: fail = True
+                else: self._window.append(now)
+        if delay: time.sleep(delay)
+        if fail:
+            with self.lock: self.errors += 1
+            raise quota_error()
+
+    def total_calls(self):
+        with self.lock: return sum(self.calls.values())
+
+    def reset_stats(self):
+        with self.lock:
+            self.calls.clear()
+            self.logins = 0
+            self.errors = 0
+            self._window.clear()
+
+class FakeClient:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def open(self, title):
+        self.backend.api_call("open")
+        sh = self.backend.spreadsheets.get(title)
+        if sh is None: raise gspread.SpreadsheetNotFound(title)
+        return sh
+
+    def open_by_key(self, key):
+        self.backend.api_call("open_by_key")
+        for sh in self.backend.spreadsheets.values():
+            if sh.id == key: return sh
+        raise gspread.SpreadsheetNotFound(key)
+
+class FakeSpreadsheet:
+    def __init__(self, backend, title, key):
+        self.backend = backend
+        self.title = title
+        self.id = key
+        self._sheets = [] # urut index seperti di UI
+        self._updated = datetime.now(timezone.utc)
+        self._next_id = 1
+        self._undo = [] # (worksheet, state) selama batch_update berjalan
+
+    # --- helper internal (tanpa hitungan API) ---
+    def _touch(self):
+        self._updated = datetime.now(timezone.utc)
+
+    def _by_title(self, title):
+        for ws in self._sheets:
+            if ws.title == title: return ws
+        return None
+
+    def _by_id(self, sheet_id):
+        for ws in self._sheets:
+            if ws.id == sheet_id: return ws
+        raise api_error(400, f"No grid with id: {sheet_id}")
+
+    def _add(self, props):
+        title = props.get("title") or f"Sheet{len(self._sheets) + 1}"
+        if self._by_title(title): raise api_error(400, f"A sheet with the name \"{title}\" already exists.")
+        sheet_id = props.get("sheetId")
+        if sheet_id is None:
+            while any(ws.id == self._next_id for ws in self._sheets): self._next_id += 1
+            sheet_id = self._next_id
+        elif any(ws.id == sheet_id for ws in self._sheets):
+            raise api_error(400, f"sheetId {sheet_id} already exists.")
+        grid = props.get("gridProperties", {})
+        ws = FakeWorksheet(self, title, sheet_id, grid.get("rowCount", 1000), grid.get("columnCount", 26))
+        ws.hidden = bool(props.get("hidden", False))
+        ws.frozen_rows = grid.get("frozenRowCount", 0)
+        self._sheets.append(ws)
+        return ws
+
+    def seed_worksheet(self, title, values, hidden=False):
+        """Isi sheet langsung (tanpa latensi/hitungan) untuk menyiapkan data benchmark."""
+        with self.backend.lock:
+            ws = self._by_title(title) or self._add({"title": title, "hidden": hidden})
+            ws.values = [list(r) for r in values]
+            self._touch()
+            return ws
+
+    # --- API gspread ---
+    @property
+    def lastUpdateTime(self):
+        self.backend.api_call("lastUpdateTime") # gspread asli: satu panggilan Drive API
+        return self._updated.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+    def fetch_sheet_metadata(self, params=None):
+        self.backend.api_call("fetch_sheet_metadata")
+        with self.backend.lock:
+            return {"spreadsheetId": self.id, "properties": {"title": self.title},
+                    "sheets": [{"properties": ws.properties()} for ws in self._sheets]}
+
+    def worksheets(self, exclude_hidden=False):
+        self.backend.api_call("worksheets")
+        with self.backend.lock:
+            return [ws for ws in self._sheets if not (exclude_hidden and ws.hidden)]
+
+    def worksheet(self, title):
+        self.backend.api_call("worksheet")
+        with self.backend.lock:
+            ws = self._by_title(title)
+        if ws is None: raise gspread.WorksheetNotFound(title)
+        return ws
+
+    def get_worksheet_by_id(self, sheet_id):
+        self.backend.api_call("get_worksheet_by_id")
+        with self.backend.lock:
+            for ws in self._sheets:
+                if ws.id == sheet_id: return ws
+        raise gspread.WorksheetNotFound(f"id {sheet_id} not found")
+
+    def add_worksheet(self, title, rows, cols, index=None):
+        self.backend.api_call("add_worksheet")
+        with self.backend.lock:
+            ws = self._add({"title": title, "gridProperties": {"rowCount": rows, "columnCount": cols}})
+            if index is not None:
+                self._sheets.remove(ws)
+                self._sheets.insert(index, ws)
+            self._touch()
+            return ws
+
+    def batch_update(self, body):
+        """spreadsheets.batchUpdate: atomik - request dicek/diterapkan pada salinan, baru dipasang jika semua sukses."""
+        self.backend.api_call("batch_update")
+        with self.backend.lock:
+            sheets_before = list(self._sheets)
+            self._undo = []
+            replies = []
+            try:
+                for req in body.get("requests", []):
+                    replies.append(self._apply(req))
+            except Exception:
+                self._sheets = sheets_before
+                for ws, state in reversed(self._undo): ws.restore(state)
+                raise
+            finally:
+                self._undo = []
+            self._touch()
+            return {"spreadsheetId": self.id, "replies": replies}
+
+    def _apply(self, req):
+        if "addSheet" in req:
+            ws = self._add(req["addSheet"].get("properties", {}))
+            return {"addSheet": {"properties": ws.properties()}}
+        if "updateSheetProperties" in req:
+            props = req["updateSheetProperties"]["properties"]
+            ws = self._by_id(props["sheetId"])
+            self._undo.append((ws, ws.snapshot(copy_values=False)))
+            fields = req["updateSheetProperties"].get("fields", "")
+            if "hidden" in fields: ws.hidden = bool(props.get("hidden", False))
+            if "title" in fields: ws.title = props["title"]
+            if "frozenRowCount" in fields: ws.frozen_rows = props.get("gridProperties", {}).get("frozenRowCount", 0)
+            return {}
+        if "updateCells" in req:
+            spec = req["updateCells"]
+            start = spec.get("start", {})
+            ws = self._by_id(start.get("sheetId"))
+            self._undo.append((ws, ws.snapshot(copy_values=True)))
+            r0, c0 = start.get("rowIndex", 0), start.get("columnIndex", 0)
+            for i, row in enumerate(spec.get("rows", [])):
+                for j, cell in enumerate(row.get("values", [])):
+                    ws.set_cell(r0 + i, c0 + j, _cell_value(cell))
+            return {}
+        if "appendCells" in req:
+            spec = req["appendCells"]
+            ws = self._by_id(spec["sheetId"])
+            self._undo.append((ws, ws.snapshot(copy_values=False)))
+            ws.append([[_cell_value(c) for c in row.get("values", [])] for row in spec.get("rows", [])])
+            return {}
+        if "deleteSheet" in req:
+            ws = self._by_id(req["deleteSheet"]["sheetId"])
+            self._sheets.remove(ws)
+            return {}
+        raise api_error(400, f"Request tidak didukung fake_gspread: {list(req)}")
+
+    def values_append(self, range_name, params, body):
+        self.backend.api_call("values_append")
+        title = _range_title(range_name)
+        with self.backend.lock:
+            ws = self._by_title(title)
+            if ws is None: raise api_error(400, f"Unable to parse range: {range_name}")
+            rows = body.get("values", [])
+            start = ws.append(rows)
+            self._touch()
+        return {"spreadsheetId": self.id, "tableRange": title,
+                "updates": {"updatedRange": f"'{title}'!A{start + 1}", "updatedRows": len(rows)}}
+
+    def values_batch_update(self, body):
+        """Tulis ke range eksplisit 'Judul'!A<baris> (kolom mulai A)."""
+        self.backend.api_call("values_batch_update")
+        with self.backend.lock:
+            total = 0
+            for item in body.get("data", []):
+                title = _range_title(item["range"])
+                ws = self._by_title(title)
+                if ws is None: raise api_error(400, f"Unable to parse range: {item['range']}")
+                m = re.search(r"!\$?[A-Z]+\$?(\d+)", item["range"])
+                r0 = int(m.group(1)) - 1 if m else 0
+                for i, row in enumerate(item.get("values", [])):
+                    for j, v in enumerate(row): ws.set_cell(r0 + i, j, v)
+                total += len(item.get("values", []))
+            self._touch()
+        return {"spreadsheetId": self.id, "totalUpdatedRows": total}
+
+def _cell_value(cell):
+    v = cell.get("userEnteredValue", {})
+    for key in ("stringValue", "numberValue", "boolValue", "formulaValue"):
+        if key in v: return v[key]
+    return None
+
+class FakeWorksheet:
+    def __init__(self, spreadsheet, title, sheet_id, rows=1000, cols=26):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.id = sheet_id
+        self.row_count = rows
+        self.col_count = cols
+        self.hidden = False
+        self.frozen_rows = 0
+        self.values = []
+
+    def properties(self):
+        return {"sheetId": self.id, "title": self.title, "index": self.spreadsheet._sheets.index(self),
+                "sheetType": "GRID", "hidden": self.hidden,
+                "gridProperties": {"rowCount": self.row_count, "columnCount": self.col_count, "frozenRowCount": self.frozen_rows}}
+
+    def snapshot(self, copy_values=True):
+        """State untuk rollback batch_update. copy_values=False: cukup panjang data (append saja)."""
+        values = [list(r) for r in self.values] if copy_values else len(self.values)
+        return (self.title, self.hidden, self.frozen_rows, self.row_count, values)
+
+    def restore(self, state):
+        self.title, self.hidden, self.frozen_rows, self.row_count, values = state
+        if isinstance(values, list): self.values = values
+        else: del self.values[values:]
+
+    def set_cell(self, r, c, value):
+        while len(self.values) <= r: self.values.append([])
+        row = self.values[r]
+        while len(row) <= c: row.append(None)
+        row[c] = value
+        self.row_count = max(self.row_count, len(self.values))
+
+    def append(self, rows):
+        """Tambah setelah baris terakhir yang berisi data (seperti appendCells / values.append). Return index awal."""
+        while self.values and not any(v not in (None, "") for v in self.values[-1]): self.values.pop()
+        start = len(self.values)
+        self.values.extend(list(r) for r in rows)
+        self.row_count = max(self.row_count, len(self.values))
+        return start
+
+    # --- API gspread ---
+    def append_rows(self, values, value_input_option="RAW", insert_data_option=None, table_range=None, include_values_in_response=None):
+        return self.spreadsheet.values_append(f"'{self.title}'!A1", {"valueInputOption": value_input_option}, {"values": values})
+
+    def append_row(self, values, value_input_option="RAW", insert_data_option=None, table_range=None, include_values_in_response=False):
+        return self.append_rows([values], value_input_option)
+
+    def get_all_values(self):
+        self.spreadsheet.backend.api_call("get_all_values")
+        with self.spreadsheet.backend.lock:
+            width = max((len(r) for r in self.values), default=0)
+            return [[_cell_text(v) for v in r] + [""] * (width - len(r)) for r in self.values]
+
+    def freeze(self, rows=None, cols=None):
+        self.spreadsheet.backend.api_call("freeze")
+        with self.spreadsheet.backend.lock:
+            if rows is not None: self.frozen_rows = rows
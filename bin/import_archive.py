@@ -0,0 +1,151 @@
+# FILE: bin/import_archive.py
+# ================================================================
+# BATIK ARCHIVE IMPORTER (TXT -> SQLite)
+# Masukkan TXT evidence di output/ yang belum ada di batik_master.db
+# (mis. saat DB hilang/rusak). Waktu capture diambil dari nama file.
+# Bentuk session sama dengan robot (PMDT: Monitor + Transmitter).
+# Jalankan: python bin/import_archive.py [--tool LOC] [--workers N]
+# ================================================================
+
+import os
+import sys
+import io
+import time
+import bisect
+import argparse
+from multiprocessing import Pool, cpu_count
+from itertools import chain
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import config
+import batik_db
+import batik_parser
+import reparse_archive
+
+# Kode alat -> station_name seperti yang ditulis robot
+STATION_NAMES = {tool: folder for folder, tool in reparse_archive.PMDT_TOOLS.items()}
+STATION_NAMES.update({tool: folder for folder, tool in reparse_archive.MARU_TOOLS.items()})
+
+# Session DB dianggap capture yang sama jika waktunya sedekat ini dengan nama file TXT
+# (robot menulis DB beberapa detik setelah TXT disimpan)
+MATCH_WINDOW = reparse_archive.PAIR_WINDOW
+BATCH_SIZE = 2000 # session per transaksi
+
+def read_job_texts(paths):
+    texts = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8", errors="replace") as f: texts.append(f.read())
+    return texts
+
+def join_job_text(texts):
+    """Gabung file capture persis seperti reparse_archive._iter_job_lines (baris kosong di antara file)."""
+    parts = []
+    for i, text in enumerate(texts):
+        if i and not parts[-1].endswith("\n"): parts.append("\n")
+        if i: parts.append("\n")
+        parts.append(text)
+    return "".join(parts)
+
+def import_job(job):
+    """Worker: baca + parse satu capture. Return (job, rows, active_tx, [teks per file], error)."""
+    tool, ts, paths = job
+    try:
+        texts = read_job_texts(paths)
+        raw = join_job_text(texts)
+        if tool in reparse_archive.MARU_TOOLS.values():
+            rows, active_tx = batik_parser.parse_maru_lines(tool, io.StringIO(raw))
+        else:
+            rows, active_tx = batik_parser.parse_pmdt_lines(tool, io.StringIO(raw))
+        return job, rows, active_tx, texts, None
+    except Exception as e:
+        return job, [], None, None, str(e)
+
+def job_sessions(job, rows, texts):
+    """
+    Capture -> baris insert_many dengan bentuk session yang sama seperti robot:
+    PMDT = session Monitor (rows + series) lalu session Transmitter, MARU = satu session.
+    tx_info dibiarkan kosong: status TX robot berasal dari cek daya layar PMDT yang tidak ada di TXT.
+    """
+    tool, ts, paths = job
+    station = STATION_NAMES[tool]
+    sessions = [(station, ts, paths[0], texts[0], rows, None)]
+    sessions += [(station, ts, path, text, None, None) for path, text in zip(paths[1:], texts[1:])]
+    return sessions
+
+def load_existing(db):
+    """{station: [timestamp, ...] terurut} dari DB utama + arsip per tahun."""
+    existing = {}
+    with db.lock:
+        for schema in chain(["main"], db.iter_archives()):
+            for station, ts in db.conn.execute(f"SELECT station_name, timestamp FROM {schema}.sessions"):
+                if ts: existing.setdefault(station, []).append(ts)
+    for values in existing.values(): values.sort()
+    return existing
+
+def already_imported(existing, station, ts):
+    values = existing.get(station)
+    if not values: return False
+    lo = batik_db._ts_str(ts - MATCH_WINDOW)
+    i = bisect.bisect_left(values, lo)
+    return i < len(values) and values[i] <= batik_db._ts_str(ts + MATCH_WINDOW)
+
+def pending_jobs(db, root=None, tools=None):
+    existing = load_existing(db)
+    jobs, skipped = [], 0
+    for job in reparse_archive.iter_archive_jobs(root, tools):
+        tool, ts, _ = job
+        if already_imported(existing, STATION_NAMES[tool], ts): skipped += 1
+        else: jobs.append(job)
+    return jobs, skipped
+
+def import_archive(db, root=None, tools=None, workers=None, batch_size=BATCH_SIZE, chunksize=None):
+    jobs, skipped = pending_jobs(db, root, tools)
+    total = len(jobs)
+    print(f">>> {total} capture baru | {skipped} sudah ada di DB (dilewati)")
+    if not total: return 0, 0
+
+    workers = workers or max(1, cpu_count() - 1)
+    chunksize = chunksize or max(1, min(64, total // (workers * 8)))
+    start = time.perf_counter()
+    done, errors, imported = 0, 0, 0
+    last_print = 0.0
+    batch = []
+
+    def flush():
+        with db.transaction() as cur: db.insert_many(cur, batch)
+        batch.clear()
+
+    with Pool(workers) as pool:
+        for job, rows, active_tx, texts, err in pool.imap(import_job, jobs, chunksize):
+            done += 1
+            if err:
+                errors += 1
+                print(f"\n   [ERROR] {job[2][0]}: {err}")
+            else:
+                batch.extend(job_sessions(job, rows, texts))
+                imported += 1
+                if len(batch) >= batch_size: flush()
+            now = time.perf_counter()
+            if now - last_print >= 0.5 or done == total:
+                reparse_archive.print_progress(done, total, start, errors)
+                last_print = now
+    if batch: flush()
+
+    elapsed = time.perf_counter() - start
+    print(f"\n>>> Selesai: {imported} capture diimpor dalam {elapsed:.1f}s ({done / elapsed if elapsed else 0:.1f} capture/s)")
+    return imported, errors
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--root", default=config.OUTPUT_DIR, help="Folder arsip output/")
+    parser.add_argument("--db", default=config.DB_PATH, help="File SQLite tujuan")
+    parser.add_argument("--tool", action="append", help="Filter alat: LOC, GP, MM, OM, DVOR, DME (boleh berulang)")
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah proses parse (default: CPU - 1)")
+    parser.add_argument("--batch", type=int, default=BATCH_SIZE, help="Jumlah session per transaksi")
+    args = parser.parse_args()
+
+    tools = [t.upper() for t in args.tool] if args.tool else None
+    db = batik_db.BatikDB(args.db)
+    try: _, err_count = import_archive(db, args.root, tools, args.workers, args.batch)
+    finally: db.close()
+    sys.exit(1 if err_count else 0)
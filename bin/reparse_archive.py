@@ -0,0 +1,169 @@
+# FILE: bin/reparse_archive.py
+# ================================================================
+# BATIK ARCHIVE RE-PARSER
+# Parse ulang semua TXT evidence di output/ secara paralel
+# Jalankan: python bin/reparse_archive.py [--out hasil.csv] [--workers N]
+# ================================================================
+
+import os
+import sys
+import re
+import csv
+import time
+import argparse
+from datetime import datetime, timedelta
+from multiprocessing import Pool, cpu_count
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import config
+import batik_parser
+
+# Nama folder robot -> kode alat parser
+PMDT_TOOLS = {"LOCALIZER": "LOC", "GLIDE PATH": "GP", "MIDDLE MARKER": "MM", "OUTER MARKER": "OM"}
+MARU_TOOLS = {"DVOR": "DVOR", "DME": "DME"}
+
+# Nama file robot: {station}_{type}_{YYYYmmdd_HHMMSS}.txt
+FILE_TS_RE = re.compile(r"_(\d{8}_\d{6})\.txt$", re.IGNORECASE)
+
+# Monitor & Transmitter disimpan berurutan oleh robot_pmdt, selisihnya hanya beberapa detik
+PAIR_WINDOW = timedelta(seconds=60)
+
+CSV_HEADER = ["TIMESTAMP", "TANGGAL", "JAM", "TOOL", "PARAMETER", "MONITOR 1", "MONITOR 2", "ACTIVE TX", "SOURCE"]
+
+def parse_file_timestamp(path):
+    """Ambil waktu capture dari nama file. Return datetime atau None."""
+    match = FILE_TS_RE.search(os.path.basename(path))
+    if not match: return None
+    try: return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S")
+    except ValueError: return None
+
+def _list_txt(folder):
+    """Daftar (timestamp, path) file TXT capture di satu folder, urut waktu."""
+    if not os.path.isdir(folder): return []
+    found = []
+    for name in os.listdir(folder):
+        if not name.lower().endswith(".txt") or name.lower().endswith("_decoded.txt"): continue
+        path = os.path.join(folder, name)
+        ts = parse_file_timestamp(path)
+        if ts: found.append((ts, path))
+    found.sort()
+    return found
+
+def _pair_pmdt(mon_files, tx_files):
+    """Pasangkan Monitor_Data dengan Transmitter_Data terdekat (seperti combined text robot)."""
+    jobs = []
+    j = 0
+    for ts, mon_path in mon_files:
+        while j < len(tx_files) and tx_files[j][0] < ts:
+            jobs.append((tx_files[j][0], (tx_files[j][1],)))
+            j += 1
+        if j < len(tx_files) and tx_files[j][0] - ts <= PAIR_WINDOW:
+            jobs.append((ts, (mon_path, tx_files[j][1])))
+            j += 1
+        else:
+            jobs.append((ts, (mon_path,)))
+    for ts, tx_path in tx_files[j:]:
+        jobs.append((ts, (tx_path,)))
+    return jobs
+
+def iter_archive_jobs(root=None, tools=None):
+    """
+    Telusuri arsip output/ dan hasilkan job (tool, timestamp, paths).
+    PMDT: Monitor_Data + Transmitter_Data dipasangkan jadi satu capture.
+    MARU: satu file TXT = satu capture.
+    """
+    root = root or config.OUTPUT_DIR
+    for folder, tool in PMDT_TOOLS.items():
+        if tools and tool not in tools: continue
+        base = os.path.join(root, "PMDT", folder)
+        mon_files = _list_txt(os.path.join(base, "Monitor_Data"))
+        tx_files = _list_txt(os.path.join(base, "Transmitter_Data"))
+        for ts, paths in _pair_pmdt(mon_files, tx_files):
+            yield tool, ts, paths
+    for folder, tool in MARU_TOOLS.items():
+        if tools and tool not in tools: continue
+        for ts, path in _list_txt(os.path.join(root, "MARU", folder)):
+            yield tool, ts, (path,)
+
+def _iter_job_lines(paths):
+    """Baca file capture baris per baris; beberapa file digabung seperti combined text robot."""
+    for i, path in enumerate(paths):
+        if i: yield ""
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            yield from f
+
+def parse_job(job):
+    """Worker: parse satu capture. Return (job, rows, active_tx, error)."""
+    tool, ts, paths = job
+    try:
+        if tool in MARU_TOOLS.values():
+            rows, active_tx = batik_parser.parse_maru_lines(tool, _iter_job_lines(paths))
+        else:
+            rows, active_tx = batik_parser.parse_pmdt_lines(tool, _iter_job_lines(paths))
+        return job, rows, active_tx, None
+    except Exception as e:
+        return job, [], None, str(e)
+
+def job_to_csv_rows(job, rows, active_tx):
+    tool, ts, paths = job
+    ts_str, date_str, time_str = str(ts), ts.strftime("%Y-%m-%d"), ts.strftime("%H:%M:%S")
+    source = os.path.basename(paths[0])
+    return [[ts_str, date_str, time_str, tool, r["Parameter"], r["Monitor 1"], r["Monitor 2"], active_tx, source] for r in rows]
+
+def print_progress(done, total, start, errors):
+    elapsed = time.perf_counter() - start
+    rate = done / elapsed if elapsed else 0.0
+    eta = (total - done) / rate if rate else 0.0
+    sys.stdout.write(f"\r   {done}/{total} capture | {rate:8.1f} capture/s | ETA {eta:6.1f}s | error {errors}")
+    sys.stdout.flush()
+
+def reparse_archive(out_path, root=None, tools=None, workers=None, chunksize=None):
+    jobs = list(iter_archive_jobs(root, tools))
+    total = len(jobs)
+    if not total:
+        print(">>> Tidak ada file TXT di arsip.")
+        return 0, 0
+
+    workers = workers or max(1, cpu_count() - 1)
+    # Potongan kerja cukup besar agar overhead IPC kecil, tapi tetap merata antar worker
+    chunksize = chunksize or max(1, min(64, total // (workers * 8)))
+    print(f">>> {total} capture | {workers} worker | chunk {chunksize}")
+
+    start = time.perf_counter()
+    done, errors, row_count = 0, 0, 0
+    last_print = 0.0
+    with open(out_path, "w", newline="", encoding="utf-8") as f, Pool(workers) as pool:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        for job, rows, active_tx, err in pool.imap(parse_job, jobs, chunksize):
+            done += 1
+            if err:
+                errors += 1
+                print(f"\n   [ERROR] {job[2][0]}: {err}")
+            else:
+                csv_rows = job_to_csv_rows(job, rows, active_tx)
+                writer.writerows(csv_rows)
+                row_count += len(csv_rows)
+            now = time.perf_counter()
+            if now - last_print >= 0.5 or done == total:
+                print_progress(done, total, start, errors)
+                last_print = now
+
+    elapsed = time.perf_counter() - start
+    print(f"\n>>> Selesai: {done} capture, {row_count} baris dalam {elapsed:.1f}s ({done / elapsed if elapsed else 0:.1f} capture/s)")
+    print(f">>> Output: {out_path}")
+    return done, errors
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--root", default=config.OUTPUT_DIR, help="Folder arsip output/")
+    parser.add_argument("--out", default=None, help="File CSV hasil (default: output/reparse_<waktu>.csv)")
+    parser.add_argument("--tool", action="append", help="Filter alat: LOC, GP, MM, OM, DVOR, DME (boleh berulang)")
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah proses (default: CPU - 1)")
+    parser.add_argument("--chunksize", type=int, default=None, help="Jumlah capture per potongan kerja")
+    args = parser.parse_args()
+
+    out_path = args.out or os.path.join(args.root, f"reparse_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+    tools = [t.upper() for t in args.tool] if args.tool else None
+    _, err_count = reparse_archive(out_path, args.root, tools, args.workers, args.chunksize)
+    sys.exit(1 if err_count else 0)
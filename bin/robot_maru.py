@@ -7,7 +7,6 @@ import sys
 import os
 import time
 import logging
-import sqlite3
 import traceback
 import argparse
 import ctypes
@@ -23,6 +22,7 @@ import pyautogui
 import pyperclip
 
 import config
+import batik_db
 
 # Cek library pypdf
 try:
@@ -34,8 +34,10 @@ except ImportError:
 try:
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
     import batik_parser
-    import sheet_handler
+    import sheet_outbox
+    HAS_OUTBOX = True
 except ImportError:
+    HAS_OUTBOX = False
     print("Warning: Modul Upload tidak ditemukan.")
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -71,33 +73,6 @@ logging.basicConfig(
     format="%(asctime)s - %(message)s"
 )
 
-class DatabaseManager:
-    def __init__(self):
-        self.conn = sqlite3.connect(config.DB_PATH)
-        self.conn.execute("PRAGMA journal_mode=WAL;")
-        self.cursor = self.conn.cursor()
-        self.create_tables()
-
-    def create_tables(self):
-        self.cursor.execute("CREATE TABLE IF NOT EXISTS sessions(id INTEGER PRIMARY KEY AUTOINCREMENT, station_name TEXT, timestamp DATETIME, evidence_path TEXT, raw_clipboard TEXT)")
-        self.cursor.execute("CREATE TABLE IF NOT EXISTS measurements(id INTEGER PRIMARY KEY AUTOINCREMENT, session_id INTEGER, parameter_name TEXT, value_mon1 TEXT, value_mon2 TEXT, FOREIGN KEY(session_id) REFERENCES sessions(id))")
-        self.conn.commit()
-
-    def save_session(self, station, pdf_path, raw, parsed):
-        try:
-            ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.cursor.execute("INSERT INTO sessions(station_name,timestamp,evidence_path,raw_clipboard) VALUES(?,?,?,?)", (station, ts, pdf_path, raw))
-            sid = self.cursor.lastrowid
-            rows = [(sid, k, v, "-") for k,v in parsed.items()]
-            self.cursor.executemany("INSERT INTO measurements(session_id,parameter_name,value_mon1,value_mon2) VALUES(?,?,?,?)", rows)
-            self.conn.commit()
-            broadcast_log(station, "Database Saved (WAL)", "DONE")
-        except Exception as e:
-            broadcast_log(station, f"DB Error: {e}", "FAIL")
-
-    def close(self):
-        if self.conn: self.conn.close()
-
 # --- FUNGSI EKSTRAKSI PDF (TIDAK BERUBAH) ---
 
 def extract_tx_with_pypdf(pdf_path):
@@ -154,7 +129,7 @@ def extract_tx_from_pdf_binary(pdf_path):
 class MaruRobot:
     def __init__(self, mode):
         self.mode = mode.upper()
-        self.db = DatabaseManager()
+        self.db = batik_db.get_db()
         self.hwnd = 0
         
         # TARGET WINDOW TITLE YANG LEBIH SPESIFIK
@@ -336,7 +311,6 @@ class MaruRobot:
             try: shutil.copy(temp_txt_path, perm_txt)
             except: pass
             
-            self.db.save_session(self.station_name, pdf_path, raw, self.parse(raw))
             content_for_parser = raw
             
             if "DVOR" in self.station_name:
@@ -347,26 +321,34 @@ class MaruRobot:
                 else:
                     broadcast_log(self.station_name, "Header Detect: Failed", "WARN")
 
-            rows_parsed, active_tx = batik_parser.parse_maru_data(self.station_name, content_for_parser)
+            rows_parsed, active_tx = batik_parser.cached_parse(batik_parser.parse_maru_data, self.station_name, content_for_parser)
+
+            try:
+                # series DB dari baris batik_parser yang sama dengan upload sheet
+                self.db.save_session(self.station_name, pdf_path, raw, self.parse(raw), series=rows_parsed)
+                broadcast_log(self.station_name, "Database Saved (WAL)", "DONE")
+            except Exception as e:
+                broadcast_log(self.station_name, f"DB Error: {e}", "FAIL")
             
             print(f"   >>> PREVIEW: TX Active = {active_tx}")
             print(f"   >>> PREVIEW: Data Rows = {len(rows_parsed)} items")
             
-            if rows_parsed:
+            if rows_parsed and not HAS_OUTBOX:
+                broadcast_log(self.station_name, "Upload Module Missing - Skipping Queue", "SKIP")
+            elif rows_parsed:
                 # ====== METODE BARU: RAW DATA UPLOAD ONLY ======
-                broadcast_log(self.station_name, "Uploading to Database...", "UPLOAD")
-                
-                status_raw, err_raw = sheet_handler.upload_raw_data(
-                    self.station_name,
-                    rows_parsed,
-                    datetime.now(),
-                    active_tx
-                )
-                
-                if status_raw == "Success":
-                    broadcast_log(self.station_name, "Raw Database Updated", "SUCCESS")
-                else:
-                    broadcast_log(self.station_name, f"Upload Error: {err_raw}", "ERROR")
+                broadcast_log(self.station_name, "Queueing for Database...", "UPLOAD")
+                try:
+                    sheet_outbox.get_outbox().enqueue(
+                        self.station_name,
+                        rows_parsed,
+                        datetime.now(),
+                        active_tx
+                    )
+                    broadcast_log(self.station_name, f"Raw Database Queued ({len(rows_parsed)} items)", "QUEUED")
+                except Exception as e:
+                    broadcast_log(self.station_name, f"Queue Error: {e}", "FAIL")
+                    logging.error(traceback.format_exc())
             else:
                 broadcast_log(self.station_name, "Parsed Data EMPTY", "SKIP")
         else:
@@ -407,4 +389,7 @@ if __name__ == "__main__":
         broadcast_log("SYSTEM", "User Stopped", "STOP")
     except Exception as e:
         broadcast_log("SYSTEM", f"Critical Error: {e}", "CRASH")
-        logging.error(traceback.format_exc())
\ No newline at end of file
+        logging.error(traceback.format_exc())
+    finally:
+        batik_db.close_all()
+        if HAS_OUTBOX: sheet_outbox.upload_pending(broadcast_log)
\ No newline at end of file
@@ -8,7 +8,6 @@ import os
 import time
 import json
 import re
-import sqlite3
 import logging
 import traceback
 import ctypes
@@ -27,12 +26,15 @@ from pywinauto import Application, Desktop
 
 # Local Import
 import config
+import batik_db
 
 # [AUTO-UPLOAD IMPORTS]
 try:
     import batik_parser
-    import sheet_handler
+    import sheet_outbox
+    HAS_OUTBOX = True
 except ImportError:
+    HAS_OUTBOX = False
     print("Warning: Modul Upload tidak ditemukan.")
 
 # --- CONFIGURATION & PATHS ---
@@ -87,61 +89,6 @@ logging.basicConfig(
     format='%(asctime)s - %(message)s'
 )
 
-# --- DATABASE MANAGER ---
-class DatabaseManager:
-    def __init__(self):
-        self.conn = sqlite3.connect(config.DB_PATH)
-        self.conn.execute("PRAGMA journal_mode=WAL;") 
-        self.cursor = self.conn.cursor()
-        self.check_and_update_schema()
-
-    def check_and_update_schema(self):
-        self.cursor.execute("CREATE TABLE IF NOT EXISTS sessions (id INTEGER PRIMARY KEY AUTOINCREMENT, station_name TEXT, timestamp DATETIME, evidence_path TEXT, raw_clipboard TEXT)")
-        self.cursor.execute("CREATE TABLE IF NOT EXISTS measurements (id INTEGER PRIMARY KEY AUTOINCREMENT, session_id INTEGER, parameter_name TEXT, value_mon1 TEXT, value_mon2 TEXT, FOREIGN KEY(session_id) REFERENCES sessions(id))")
-        
-        try: self.cursor.execute("ALTER TABLE sessions ADD COLUMN tx_fwd_power TEXT"); broadcast_log("DB", "Added col: tx_fwd_power", "UPDATE")
-        except: pass
-        try: self.cursor.execute("ALTER TABLE sessions ADD COLUMN tx_ref_power TEXT")
-        except: pass
-        try: self.cursor.execute("ALTER TABLE sessions ADD COLUMN tx_status TEXT")
-        except: pass
-        self.conn.commit()
-
-    def save_session(self, station, evidence, raw, parsed, tx_info=None):
-        try:
-            ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            fwd, ref, stat = "-", "-", "MONITORING"
-            
-            if tx_info:
-                fwd = tx_info.get("fwd", "-")
-                ref = tx_info.get("ref", "-")
-                stat = tx_info.get("status", "UNKNOWN")
-
-            self.cursor.execute(
-                "INSERT INTO sessions (station_name, timestamp, evidence_path, raw_clipboard, tx_fwd_power, tx_ref_power, tx_status) VALUES (?, ?, ?, ?, ?, ?, ?)", 
-                (station, ts, evidence, raw, fwd, ref, stat)
-            )
-            session_id = self.cursor.lastrowid
-            
-            if parsed:
-                temp_measurements = {} 
-                for full_key, val in parsed.items():
-                    base_name = full_key.replace(" (Mon1)", "").replace(" (Mon2)", "")
-                    if base_name not in temp_measurements: temp_measurements[base_name] = {"m1": "-", "m2": "-"}
-                    if "(Mon1)" in full_key: temp_measurements[base_name]["m1"] = val
-                    elif "(Mon2)" in full_key: temp_measurements[base_name]["m2"] = val
-
-                rows = [(session_id, k, v["m1"], v["m2"]) for k, v in temp_measurements.items()]
-                self.cursor.executemany("INSERT INTO measurements (session_id, parameter_name, value_mon1, value_mon2) VALUES (?, ?, ?, ?)", rows)
-            
-            self.conn.commit()
-            broadcast_log(station, "Database Saved (WAL)", "DONE")
-        except Exception as e:
-            broadcast_log(station, f"DB Error: {e}", "FAIL")
-
-    def close(self):
-        if self.conn: self.conn.close()
-
 # --- COMPUTER VISION ---
 def locate_in_window(hwnd, template_path, threshold=0.55):
     if not os.path.exists(template_path): return None
@@ -167,7 +114,7 @@ def locate_in_window(hwnd, template_path, threshold=0.55):
 # --- MAIN ROBOT LOGIC ---
 class HybridBatikRobot:
     def __init__(self):
-        self.db = DatabaseManager()
+        self.db = batik_db.get_db()
         self.coords = self.load_coords()
         self.hwnd = 0
         self.app = None
@@ -330,58 +277,66 @@ class HybridBatikRobot:
         self.save_text_file(station, final_monitor_text, "Monitor_Data")
         self.save_text_file(station, final_transmitter_text, "Transmitter_Data")
         
+        # --- SUPER MERGE (KEY REVISION) ---
+        # Menggabungkan data Monitor dan Transmitter agar Parser bisa membaca semuanya.
+        # Baris yang sama dipakai untuk series DB dan upload sheet.
+        combined_text_for_parsing = final_monitor_text + "\n\n" + final_transmitter_text
+
+        # 1. PARSING DATA (Menggunakan Combined Text)
+        rows_parsed = []
+        active_tx = 1
+        try:
+            if "LOCALIZER" in station or "GLIDE PATH" in station:
+                tool_type = "LOCALIZER" if "LOCALIZER" in station else "GLIDEPATH"
+                rows_parsed, active_tx = batik_parser.cached_parse(batik_parser.parse_pmdt_loc_gp, tool_type, combined_text_for_parsing)
+
+            elif "MIDDLE MARKER" in station or "OUTER MARKER" in station:
+                tool_type = "MM" if "MIDDLE" in station else "OM"
+                # Menggunakan parse_pmdt_common agar tipe alat terdeteksi
+                rows_parsed, active_tx = batik_parser.cached_parse(batik_parser.parse_pmdt_common, tool_type, combined_text_for_parsing)
+        except Exception as e:
+            broadcast_log(station, f"Parse Error: {e}", "FAIL")
+
         # Save to SQLite (Standard DB Logic - Keeping it safe)
         parsed_mon = self.parse_monitor_text(raw_monitor) 
+        # Input sama untuk kedua session -> cukup diparse sekali
         tx_info_mon = self.parse_transmitter_with_status(raw_transmitter, raw_rms)
-        self.db.save_session(station, img_mon_path, final_monitor_text, parsed_mon, tx_info=tx_info_mon)
-        
-        tx_info_tx = self.parse_transmitter_with_status(raw_transmitter, raw_rms)
+        tx_info_tx = dict(tx_info_mon)
         broadcast_log(station, f"TX Status: {tx_info_tx['status']} ({tx_info_tx['fwd']} W)", "INFO")
-        self.db.save_session(station, img_tx_path, final_transmitter_text, None, tx_info=tx_info_tx)
+        # Monitor + Transmitter satu capture -> satu transaksi
+        try:
+            self.db.save_capture(station, [
+                {"evidence": img_mon_path, "raw": final_monitor_text, "parsed": parsed_mon, "tx_info": tx_info_mon, "series": rows_parsed},
+                {"evidence": img_tx_path, "raw": final_transmitter_text, "parsed": None, "tx_info": tx_info_tx},
+            ])
+            broadcast_log(station, "Database Saved (WAL)", "DONE")
+        except Exception as e:
+            broadcast_log(station, f"DB Error: {e}", "FAIL")
 
         # ===========================================================
         # [AUTO-UPLOAD FEATURE] - METODE: RAW DATABASE REVISION
         # ===========================================================
         try:
-            broadcast_log(station, "Backing up to Raw Database...", "UPLOAD")
-            
-            # --- SUPER MERGE (KEY REVISION) ---
-            # Menggabungkan data Monitor dan Transmitter agar Parser bisa membaca semuanya
-            combined_text_for_parsing = final_monitor_text + "\n\n" + final_transmitter_text
-            
-            # 1. PARSING DATA (Menggunakan Combined Text)
-            rows_parsed = []
-            active_tx = 1
-            
-            if "LOCALIZER" in station or "GLIDE PATH" in station:
-                tool_type = "LOCALIZER" if "LOCALIZER" in station else "GLIDEPATH"
-                rows_parsed, active_tx = batik_parser.parse_pmdt_loc_gp(tool_type, combined_text_for_parsing)
-                
-            elif "MIDDLE MARKER" in station or "OUTER MARKER" in station:
-                tool_type = "MM" if "MIDDLE" in station else "OM"
-                # Menggunakan parse_pmdt_common agar tipe alat terdeteksi
-                rows_parsed, active_tx = batik_parser.parse_pmdt_common(tool_type, combined_text_for_parsing)
-            
+            broadcast_log(station, "Queueing for Raw Database...", "UPLOAD")
+
             # 2. UPLOAD JIKA DATA ADA
-            if rows_parsed:
+            if rows_parsed and not HAS_OUTBOX:
+                broadcast_log(station, "Upload Module Missing - Skipping Queue", "SKIP")
+            elif rows_parsed:
                 # Normalisasi Nama Station agar Sheet Handler paham
                 tool_short = "LOC"
                 if "GLIDE" in station: tool_short = "GP"
                 elif "MIDDLE" in station: tool_short = "MM"
                 elif "OUTER" in station: tool_short = "OM"
                 
-                # --- PANGGIL FUNGSI UPLOAD RAW ---
-                status, err = sheet_handler.upload_raw_data(
+                # --- MASUK ANTRIAN UPLOAD (dikirim setelah GUI selesai, lihat sheet_outbox.upload_pending) ---
+                sheet_outbox.get_outbox().enqueue(
                     tool_short, 
                     rows_parsed, 
                     datetime.now(), 
                     active_tx
                 )
-                
-                if status == "Success":
-                    broadcast_log(station, f"Raw DB Updated ({len(rows_parsed)} items)", "SUCCESS")
-                else:
-                    broadcast_log(station, f"Upload Error: {err}", "ERROR")
+                broadcast_log(station, f"Raw DB Queued ({len(rows_parsed)} items)", "QUEUED")
             else:
                 broadcast_log(station, "No data parsed for upload", "SKIP")
                 
@@ -532,4 +487,6 @@ if __name__ == "__main__":
     except Exception as e: 
         broadcast_log("SYSTEM", f"Error: {e}", "CRASH")
         logging.error(traceback.format_exc())
-    finally: bot.db.close()
\ No newline at end of file
+    finally:
+        bot.db.close()
+        if HAS_OUTBOX: sheet_outbox.upload_pending(broadcast_log)
\ No newline at end of file
@@ -13,6 +13,8 @@ import time
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PMDT_SCRIPT = os.path.join(BASE_DIR, "robot_pmdt.py")
 MARU_SCRIPT = os.path.join(BASE_DIR, "robot_maru.py")
+OUTBOX_SCRIPT = os.path.join(BASE_DIR, "sheet_outbox.py")
+DB_SCRIPT = os.path.join(BASE_DIR, "batik_db.py")
 
 def run_step(script_path, args, step_name):
     print(f"\n{'='*60}")
@@ -34,6 +36,10 @@ def run_step(script_path, args, step_name):
 
 if __name__ == "__main__":
     print(">>> BATIK RUN ALL SEQUENCE STARTED")
+
+    # Robot hanya memasukkan data ke antrian upload (sheet_outbox.DEFER_ENV);
+    # semua stasiun dikirim sekaligus di langkah terakhir (satu request ke Google)
+    os.environ["BATIK_DEFER_UPLOAD"] = "1"
     
     # 1. GROUP ILS (PMDT)
     # Gunakan --keep-open untuk LOC, GP, MM agar aplikasi tidak tutup
@@ -52,4 +58,10 @@ if __name__ == "__main__":
     run_step(MARU_SCRIPT, ["--DVOR"], "NAV - DVOR")
     run_step(MARU_SCRIPT, ["--DME"],  "NAV - DME")
     
+    # 3. UPLOAD GOOGLE SHEET (SEMUA STASIUN, SATU BATCH)
+    run_step(OUTBOX_SCRIPT, ["--batched"], "UPLOAD - RAW DATABASE")
+
+    # 4. BACKFILL DATA LAMA SETELAH MIGRASI (bertahap; langsung selesai jika tidak ada yang tertunda)
+    run_step(DB_SCRIPT, ["backfill"], "DATABASE - BACKFILL")
+    
     print("\n>>> ALL TASKS COMPLETED.")
\ No newline at end of file
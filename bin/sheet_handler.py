@@ -5,19 +5,148 @@
 
 import gspread
 import os
+import zlib
+import threading
+import requests
 from datetime import datetime
 
+try:
+    import google.auth.exceptions
+    import google.auth.transport.requests
+    HAS_GOOGLE_AUTH = True
+except ImportError:
+    HAS_GOOGLE_AUTH = False
+
 SHEET_NAME = "LOGBOOK_BATIK"
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 CREDENTIALS_FILE = os.path.join(BASE_DIR, "credentials.json")
 
+# --- KONEKSI BERSAMA (SATU PER PROSES) ---
+# Client & spreadsheet handle dibuat sekali lalu dipakai ulang: tidak baca credentials.json,
+# login dan cari file di Drive (gc.open) di setiap upload. Dibuka ulang otomatis jika error.
+def _default_client_factory():
+    if not os.path.exists(CREDENTIALS_FILE): raise FileNotFoundError("Credential hilang.")
+    return gspread.service_account(filename=CREDENTIALS_FILE)
+
+_client_factory = _default_client_factory
+_pool = {"client": None, "sheet": None, "key": None, "sheets": None}
+_pool_lock = threading.RLock()
+
+def set_client_factory(factory=None):
+    """Ganti pembuat client (mis. fake gspread untuk test/benchmark). None = credentials.json."""
+    global _client_factory
+    with _pool_lock:
+        _client_factory = factory or _default_client_factory
+        _pool["key"] = None
+        reset_connection()
+
+def reset_connection():
+    """Buang client & spreadsheet cache; pemanggilan berikutnya login ulang."""
+    with _pool_lock:
+        _pool["client"] = None
+        _pool["sheet"] = None
+        _pool["sheets"] = None
+
+def _refresh_token(gc):
+    """Perbarui token OAuth yang kedaluwarsa sebelum dipakai (hindari 401 + retry)."""
+    creds = getattr(getattr(gc, "http_client", None), "auth", None)
+    if HAS_GOOGLE_AUTH and creds is not None and getattr(creds, "expired", False):
+        creds.refresh(google.auth.transport.requests.Request())
+
+def get_client():
+    with _pool_lock:
+        if _pool["client"] is None: _pool["client"] = _client_factory()
+        _refresh_token(_pool["client"])
+        return _pool["client"]
+
+def get_spreadsheet():
+    """Spreadsheet handle ber-cache. Setelah dibuka pertama kali, buka ulang lewat key (tanpa pencarian Drive)."""
+    with _pool_lock:
+        gc = get_client()
+        if _pool["sheet"] is None:
+            if _pool["key"] and hasattr(gc, "open_by_key"): _pool["sheet"] = gc.open_by_key(_pool["key"])
+            else: _pool["sheet"] = gc.open(SHEET_NAME)
+            _pool["key"] = getattr(_pool["sheet"], "id", None)
+        return _pool["sheet"]
+
 def connect_gsheet():
+    try: return get_spreadsheet(), None
+    except Exception as e:
+        reset_connection()
+        return None, str(e)
+
+# Hanya token ditolak (401) & koneksi putus yang dijawab login ulang + coba sekali lagi.
+# 429 & 4xx lain langsung diteruskan: retry segera hanya membuang kuota, backoff outbox yang menangani.
+_RECONNECT_ERRORS = (ConnectionError, requests.exceptions.ConnectionError)
+if HAS_GOOGLE_AUTH: _RECONNECT_ERRORS += (google.auth.exceptions.TransportError,)
+
+def is_reconnect_error(e):
+    if isinstance(e, gspread.exceptions.APIError): return getattr(e, "code", None) == 401
+    return isinstance(e, _RECONNECT_ERRORS)
+
+def with_reconnect(action):
+    """Jalankan action(sh); token/koneksi putus -> buka ulang koneksi lalu coba sekali lagi. Error lain di-raise."""
     try:
-        if not os.path.exists(CREDENTIALS_FILE): return None, "Credential hilang."
-        gc = gspread.service_account(filename=CREDENTIALS_FILE)
-        sh = gc.open(SHEET_NAME)
-        return sh, None
-    except Exception as e: return None, str(e)
+        return action(get_spreadsheet())
+    except Exception as e:
+        if not is_reconnect_error(e):
+            # sheet dihapus/diganti manual (400/404): metadata dimuat ulang di percobaan berikutnya
+            if getattr(e, "code", None) in (400, 404):
+                with _pool_lock: _pool["sheets"] = None
+            raise
+        reset_connection()
+        return action(get_spreadsheet())
+
+# --- CACHE METADATA WORKSHEET (judul -> sheetId) ---
+# Diisi dengan satu fetch_sheet_metadata, lalu dipakai ulang di setiap upload.
+# Dimuat ulang hanya jika judul tidak ditemukan atau koneksi di-reset (error).
+RAW_HEADER = ["TIMESTAMP", "TANGGAL", "JAM", "PARAMETER", "MONITOR 1", "MONITOR 2", "ACTIVE TX", "SOURCE"]
+
+def load_sheet_ids(sh):
+    meta = sh.fetch_sheet_metadata({"fields": "sheets.properties(sheetId,title)"})
+    ids = {p["properties"]["title"]: p["properties"]["sheetId"] for p in meta.get("sheets", [])}
+    with _pool_lock: _pool["sheets"] = ids
+    return ids
+
+def get_sheet_id(sh, title):
+    """sheetId dari cache; judul tak dikenal -> muat ulang metadata sekali. None jika memang belum ada."""
+    with _pool_lock:
+        ids = _pool["sheets"]
+        if ids is not None and title in ids: return ids[title]
+        return load_sheet_ids(sh).get(title)
+
+def _new_sheet_id(title, taken=()):
+    """sheetId dipilih sendiri (stabil dari judul) agar header bisa ikut di batch_update yang sama."""
+    taken = set((_pool["sheets"] or {}).values()) | set(taken)
+    sheet_id = zlib.crc32(title.encode("utf-8")) & 0x7FFFFFFF
+    while sheet_id in taken or sheet_id == 0: sheet_id = (sheet_id + 1) & 0x7FFFFFFF
+    return sheet_id
+
+def _new_sheet_requests(sheet_id, title, header=RAW_HEADER, rows=1000, cols=10):
+    """Request addSheet (tersembunyi, freeze baris 1) + updateCells header untuk batch_update."""
+    return [
+        {"addSheet": {"properties": {
+            "sheetId": sheet_id, "title": title, "sheetType": "GRID", "hidden": True,
+            "gridProperties": {"rowCount": rows, "columnCount": cols, "frozenRowCount": 1},
+        }}},
+        {"updateCells": {
+            "start": {"sheetId": sheet_id, "rowIndex": 0, "columnIndex": 0},
+            "rows": [{"values": [{"userEnteredValue": {"stringValue": h}} for h in header]}],
+            "fields": "userEnteredValue",
+        }},
+    ]
+
+def create_raw_sheet(sh, title, header=RAW_HEADER, rows=1000, cols=10):
+    """Buat sheet RAW tersembunyi + header + freeze baris 1 dalam SATU batch_update."""
+    with _pool_lock:
+        sheet_id = _new_sheet_id(title)
+        sh.batch_update({"requests": _new_sheet_requests(sheet_id, title, header, rows, cols)})
+        if _pool["sheets"] is not None: _pool["sheets"][title] = sheet_id
+        return sheet_id
+
+def append_values(sh, title, payload):
+    """Append langsung lewat range judul sheet (tanpa membuat objek Worksheet / fetch metadata)."""
+    return sh.values_append(f"'{title}'!A1", {"valueInputOption": "RAW"}, {"values": payload})
 
 def get_tool_type(tool_name):
     """Normalisasi nama alat."""
@@ -30,59 +159,24 @@ def get_tool_type(tool_name):
     if "OM" in t or "OUTER" in t: return "OM"
     return "UNKNOWN"
 
-def upload_raw_data(tool_name, rows_data, timestamp, active_tx):
-    """
-    FUNGSI TUNGGAL: Upload ke Sheet RAW Tahunan (Hidden).
-    Sheet Name otomatis: RAW_DVOR_2026, RAW_GP_2026, dst.
-    """
-    sh, err = connect_gsheet()
-    if err:
-        return None, f"Connection Error: {err}"
-
-    # 1. Tentukan Nama Sheet Unik per Alat & Tahun
-    tool_type = get_tool_type(tool_name)
-    current_year = timestamp.year
-    raw_sheet_title = f"RAW_{tool_type}_{current_year}"
+def raw_sheet_title(tool_name, timestamp):
+    """Nama sheet RAW per alat & tahun: RAW_DVOR_2026, RAW_GP_2026, dst."""
+    return f"RAW_{get_tool_type(tool_name)}_{timestamp.year}"
 
-    ws = None
-    try:
-        # Coba buka sheet yang sudah ada
-        ws = sh.worksheet(raw_sheet_title)
-    except gspread.WorksheetNotFound:
-        try:
-            # Jika belum ada, BUAT BARU
-            ws = sh.add_worksheet(title=raw_sheet_title, rows=1000, cols=10)
-            
-            # --- LANGSUNG SEMBUNYIKAN (HIDE) ---
-            try:
-                sh.batch_update({
-                    "requests": [{
-                        "updateSheetProperties": {
-                            "properties": {"sheetId": ws.id, "hidden": True},
-                            "fields": "hidden"
-                        }
-                    }]
-                })
-                print(f"[INFO] Sheet Database '{raw_sheet_title}' dibuat dan disembunyikan.")
-            except: pass
-            
-            # Buat Header Database
-            header = ["TIMESTAMP", "TANGGAL", "JAM", "PARAMETER", "MONITOR 1", "MONITOR 2", "ACTIVE TX", "SOURCE"]
-            ws.append_row(header)
-            ws.freeze(rows=1) 
-            
-        except Exception as e:
-            return None, f"Gagal membuat sheet RAW: {str(e)}"
-
-    # 2. Siapkan Payload Data
+def build_payload(rows_data, timestamp, active_tx, source="ROBOT_AUTO"):
+    """Baris hasil parse -> baris sheet RAW (format database: satu parameter per baris)."""
     payload = []
     date_str = timestamp.strftime("%Y-%m-%d") # Format ISO
     time_str = timestamp.strftime("%H:%M:%S")
     
     for row in rows_data:
-        param = row.get('Parameter', 'Unknown')
-        val1 = row.get('Monitor 1', '-')
-        val2 = row.get('Monitor 2', '-')
+        if isinstance(row, tuple):
+            # ParamRow dari batik_parser: (Parameter, Monitor 1, Monitor 2)
+            param, val1, val2 = row[0], row[1], row[2]
+        else:
+            param = row.get('Parameter', 'Unknown')
+            val1 = row.get('Monitor 1', '-')
+            val2 = row.get('Monitor 2', '-')
         
         # Format Database: Baris per Baris
         payload.append([
@@ -93,12 +187,92 @@ def upload_raw_data(tool_name, rows_data, timestamp, active_tx):
             val1,            # Col E
             val2,            # Col F
             active_tx,       # Col G
-            "ROBOT_AUTO"     # Col H
+            source           # Col H
         ])
+    return payload
+
+def ensure_raw_sheet(sh, title):
+    """Buat sheet RAW jika belum ada di metadata. Return sheetId."""
+    sheet_id = get_sheet_id(sh, title)
+    if sheet_id is None:
+        sheet_id = create_raw_sheet(sh, title)
+        print(f"[INFO] Sheet Database '{title}' dibuat dan disembunyikan.")
+    return sheet_id
+
+def append_raw(title, payload):
+    """
+    Append payload ke sheet RAW (dibuat jika perlu). Token/koneksi putus: login ulang lalu
+    ulangi sekali (with_reconnect). Error lain diteruskan (raise) ke backoff outbox.
+    """
+    def action(sh):
+        ensure_raw_sheet(sh, title)
+        append_values(sh, title, payload)
+    with_reconnect(action)
+
+def _cell(value):
+    """Nilai payload -> CellData (setara valueInputOption RAW: angka tetap angka, sisanya teks)."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool): return {"userEnteredValue": {"numberValue": value}}
+    return {"userEnteredValue": {"stringValue": "" if value is None else str(value)}}
+
+def append_many(groups, header=RAW_HEADER):
+    """
+    Append ke BANYAK sheet RAW ({judul: payload}) dalam SATU batch_update: appendCells per sheet,
+    sheet yang belum ada ikut dibuat di request yang sama. batchUpdate atomik (semua masuk atau
+    tidak sama sekali). Token/koneksi putus -> login ulang & ulangi sekali; error lain diteruskan (raise).
+    """
+    def action(sh):
+        with _pool_lock:
+            ids = _pool["sheets"]
+            if ids is None or any(title not in ids for title in groups): ids = load_sheet_ids(sh)
+            requests, created = [], {}
+            for title, payload in groups.items():
+                sheet_id = ids.get(title)
+                if sheet_id is None:
+                    sheet_id = created[title] = _new_sheet_id(title, created.values())
+                    requests += _new_sheet_requests(sheet_id, title, header)
+                requests.append({"appendCells": {
+                    "sheetId": sheet_id,
+                    "rows": [{"values": [_cell(v) for v in row]} for row in payload],
+                    "fields": "userEnteredValue",
+                }})
+            if not requests: return
+            sh.batch_update({"requests": requests})
+            ids.update(created)
+            for title in created: print(f"[INFO] Sheet Database '{title}' dibuat dan disembunyikan.")
+    with_reconnect(action)
+
+def upload_raw_data(tool_name, rows_data, timestamp, active_tx):
+    """
+    FUNGSI TUNGGAL: Upload ke Sheet RAW Tahunan (Hidden).
+    Sheet Name otomatis: RAW_DVOR_2026, RAW_GP_2026, dst.
+    """
+    sh, err = connect_gsheet()
+    if err:
+        return None, f"Connection Error: {err}"
+
+    # 1. Tentukan Nama Sheet Unik per Alat & Tahun
+    title = raw_sheet_title(tool_name, timestamp)
+
+    try:
+        # Cari sheetId di cache metadata (fetch hanya jika judul belum dikenal)
+        sheet_id = with_reconnect(lambda s: get_sheet_id(s, title))
+    except Exception as e:
+        return None, f"Connection Error: {e}"
+    if sheet_id is None:
+        try:
+            # Jika belum ada, BUAT BARU (tersembunyi + header + freeze, satu request)
+            create_raw_sheet(get_spreadsheet(), title)
+            print(f"[INFO] Sheet Database '{title}' dibuat dan disembunyikan.")
+        except Exception as e:
+            reset_connection()
+            return None, f"Gagal membuat sheet RAW: {str(e)}"
+
+    # 2. Siapkan Payload Data
+    payload = build_payload(rows_data, timestamp, active_tx)
 
     # 3. Eksekusi Append (Cepat & Hemat API)
     try:
-        ws.append_rows(payload)
+        append_raw(title, payload)
         return "Success", None
     except Exception as e:
-        return None, f"Error appending RAW data: {str(e)}"
\ No newline at end of file
+        return None, f"Error appending RAW data: {str(e)}"
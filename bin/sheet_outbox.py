@@ -0,0 +1,338 @@
+# FILE: bin/sheet_outbox.py
+# ================================================================
+# ANTRIAN UPLOAD GOOGLE SHEET (OUTBOX SQLITE)
+# Robot cukup enqueue() (lokal, instan, tahan internet mati). Antrian
+# dikirim di akhir robot (upload_pending) atau di akhir siklus run_all
+# (--batched): per sheet RAW secara batch dengan retry + exponential
+# backoff. Pengiriman at-least-once (urut per sheet); item diklaim
+# (lease) sebelum dikirim, jadi beberapa pengirim sekaligus tidak
+# mengirim baris yang sama. Item yang gagal MAX_ATTEMPTS kali masuk
+# dead-letter (lihat --status).
+# Jalankan: python bin/sheet_outbox.py [--loop] [--status] [--retry-dead]
+# ================================================================
+
+import os
+import sys
+import json
+import time
+import random
+import uuid
+import sqlite3
+import argparse
+import threading
+from contextlib import contextmanager
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import config
+import sheet_handler
+
+BUSY_TIMEOUT_MS = 5000
+BATCH_ITEMS = 200        # capture per putaran flush
+BACKOFF_BASE = 5.0       # detik, gagal ke-1; lalu x2 setiap gagal
+BACKOFF_MAX = 900.0      # batas jeda retry (15 menit)
+FLUSH_INTERVAL = 10.0    # jeda antar putaran flusher saat antrian kosong
+MAX_ATTEMPTS = 12        # gagal sebanyak ini -> dead-letter (tidak dikirim lagi, lihat --status)
+CLAIM_LEASE = 300.0      # detik; klaim pengirim yang mati/hang kedaluwarsa lalu item dikirim pengirim lain
+# Kolom yang ditambahkan belakangan (antrian versi lama belum punya)
+EXTRA_COLS = {"dead": "INTEGER NOT NULL DEFAULT 0", "claimed_at": "REAL", "claimed_by": "TEXT"}
+# Diset run_all.py untuk robot anaknya: robot hanya enqueue, upload dikirim
+# sekali per siklus oleh sequencer (satu request untuk semua stasiun)
+DEFER_ENV = "BATIK_DEFER_UPLOAD"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sheet TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    n_rows INTEGER NOT NULL,
+    enqueued_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_try REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    dead INTEGER NOT NULL DEFAULT 0,
+    claimed_at REAL,
+    claimed_by TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_sheet ON outbox (sheet, id);
+CREATE TABLE IF NOT EXISTS outbox_meta (key TEXT PRIMARY KEY, value REAL);
+"""
+
+def backoff_delay(attempts, base=BACKOFF_BASE, cap=BACKOFF_MAX):
+    """Jeda sebelum percobaan berikutnya: base * 2^(n-1), maks cap, jitter +-10% agar robot tidak serempak."""
+    delay = min(cap, base * (2 ** max(0, attempts - 1)))
+    return delay * random.uniform(0.9, 1.1)
+
+class SheetOutbox:
+    """
+    Antrian upload di file SQLite terpisah (config.OUTBOX_PATH), aman dipakai
+    beberapa proses sekaligus (WAL + busy_timeout). Satu item = satu capture
+    yang payload-nya sudah jadi baris sheet RAW. Setiap instance punya id
+    pengirim sendiri (claimed_by) untuk klaim item.
+    """
+    def __init__(self, path=None, busy_timeout_ms=BUSY_TIMEOUT_MS, max_attempts=MAX_ATTEMPTS):
+        self.path = path or config.OUTBOX_PATH
+        self.max_attempts = max_attempts
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=busy_timeout_ms / 1000.0, isolation_level=None, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        cols = {r[1] for r in self.conn.execute("PRAGMA table_info(outbox)")}
+        for col, ddl in EXTRA_COLS.items():
+            if col in cols: continue
+            try: self.conn.execute(f"ALTER TABLE outbox ADD COLUMN {col} {ddl}")
+            except sqlite3.OperationalError: pass # sudah ditambahkan proses lain
+
+    @contextmanager
+    def transaction(self):
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+                self.conn.execute("COMMIT")
+            except BaseException:
+                if self.conn.in_transaction: self.conn.execute("ROLLBACK")
+                raise
+
+    def enqueue_payload(self, sheet, payload, now=None):
+        with self.lock:
+            cur = self.conn.execute("INSERT INTO outbox (sheet, payload, n_rows, enqueued_at) VALUES (?, ?, ?, ?)",
+                                    (sheet, json.dumps(payload, ensure_ascii=False), len(payload), now or time.time()))
+            return cur.lastrowid
+
+    def enqueue(self, tool_name, rows_data, timestamp, active_tx):
+        """Pengganti sheet_handler.upload_raw_data untuk robot: simpan lokal, return id antrian."""
+        title = sheet_handler.raw_sheet_title(tool_name, timestamp)
+        return self.enqueue_payload(title, sheet_handler.build_payload(rows_data, timestamp, active_tx))
+
+    def due(self, now=None, limit=BATCH_ITEMS):
+        """
+        Item siap kirim, urut id. Sheet yang sedang backoff atau punya item yang sedang diklaim
+        pengirim lain dilewati seluruhnya (item barunya juga) agar urutan baris per sheet tetap
+        terjaga. Item dead-letter diabaikan.
+        """
+        now = now or time.time()
+        with self.lock:
+            return self.conn.execute(
+                "SELECT id, sheet, payload, attempts FROM outbox WHERE dead = 0 AND sheet NOT IN "
+                "(SELECT sheet FROM outbox WHERE dead = 0 AND (next_try > ? OR claimed_at > ?)) ORDER BY id LIMIT ?",
+                (now, now - CLAIM_LEASE, limit)).fetchall()
+
+    def claim(self, now=None, limit=BATCH_ITEMS):
+        """Ambil item siap kirim dan tandai milik pengirim ini dalam satu transaksi. Return baris due()."""
+        now = now or time.time()
+        with self.transaction() as conn:
+            items = self.due(now, limit)
+            conn.executemany("UPDATE outbox SET claimed_at = ?, claimed_by = ? WHERE id = ? AND (claimed_at IS NULL OR claimed_at <= ?)",
+                             [(now, self.owner, item[0], now - CLAIM_LEASE) for item in items])
+        return items
+
+    def release(self, ids):
+        """Lepas klaim tanpa mengubah jadwal retry (pengiriman terputus)."""
+        with self.transaction() as conn:
+            conn.executemany("UPDATE outbox SET claimed_at = NULL, claimed_by = NULL WHERE id = ? AND claimed_by = ?",
+                             [(i, self.owner) for i in ids])
+
+    def flush(self, sender=None, now=None, limit=BATCH_ITEMS, batched=False):
+        """
+        Satu putaran: item siap kirim dikelompokkan per sheet -> satu append per sheet.
+        sender(title, payload) harus raise jika gagal (default: sheet_handler.append_raw).
+        batched=True: semua sheet dikirim dalam SATU request (sender({sheet: rows}), default
+        sheet_handler.append_many, atomik). Jika gagal karena kuota (429) semua di-backoff; error
+        lain -> putaran ini dikirim per sheet agar sheet yang bermasalah tidak menahan stasiun lain.
+        Hanya item yang berhasil diklaim (claim) yang dikirim. Return (baris_terkirim, sheet_gagal).
+        """
+        groups = {}
+        for item_id, sheet, payload, attempts in self.claim(now, limit):
+            g = groups.setdefault(sheet, {"ids": [], "rows": [], "attempts": 0})
+            g["ids"].append(item_id)
+            g["rows"].extend(json.loads(payload))
+            g["attempts"] = max(g["attempts"], attempts)
+        if not groups: return 0, 0
+        try:
+            return self._send(groups, sender, batched)
+        except BaseException:
+            self.release([i for g in groups.values() for i in g["ids"]])
+            raise
+
+    def _send(self, groups, sender, batched):
+        if batched:
+            send_many = sender or sheet_handler.append_many
+            try:
+                send_many({sheet: g["rows"] for sheet, g in groups.items()})
+            except Exception as e:
+                if getattr(e, "code", None) != 429 and len(groups) > 1:
+                    return self._flush_each(groups, lambda sheet, rows: send_many({sheet: rows}))
+                for g in groups.values(): self._mark_failed(g["ids"], g["attempts"] + 1, str(e))
+                return 0, len(groups)
+            self._mark_sent([i for g in groups.values() for i in g["ids"]])
+            return sum(len(g["rows"]) for g in groups.values()), 0
+        return self._flush_each(groups, sender or sheet_handler.append_raw)
+
+    def _flush_each(self, groups, sender):
+        """Satu append per sheet; gagal di satu sheet hanya mem-backoff sheet itu."""
+        sent, failed = 0, 0
+        for sheet, g in groups.items():
+            try:
+                sender(sheet, g["rows"])
+            except Exception as e:
+                failed += 1
+                self._mark_failed(g["ids"], g["attempts"] + 1, str(e))
+                continue
+            self._mark_sent(g["ids"])
+            sent += len(g["rows"])
+        return sent, failed
+
+    def _mark_sent(self, ids):
+        with self.transaction() as conn:
+            conn.executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in ids])
+            conn.execute("INSERT OR REPLACE INTO outbox_meta (key, value) VALUES ('last_success', ?)", (time.time(),))
+
+    def _mark_failed(self, ids, attempts, error):
+        next_try = time.time() + backoff_delay(attempts)
+        dead = int(attempts >= self.max_attempts)
+        with self.transaction() as conn:
+            conn.executemany("UPDATE outbox SET attempts = ?, next_try = ?, last_error = ?, dead = ?, claimed_at = NULL, claimed_by = NULL WHERE id = ?",
+                             [(attempts, next_try, error[:500], dead, i) for i in ids])
+
+    def retry_dead(self):
+        """Kembalikan item dead-letter ke antrian (mis. setelah sheet diperbaiki). Return jumlah item."""
+        with self.transaction() as conn:
+            return conn.execute("UPDATE outbox SET dead = 0, attempts = 0, next_try = 0, claimed_at = NULL, claimed_by = NULL WHERE dead = 1").rowcount
+
+    def drain(self, sender=None, max_rounds=100, batched=False):
+        """Flush berulang sampai tidak ada item siap kirim (atau semua sisa sedang backoff)."""
+        total = 0
+        for _ in range(max_rounds):
+            sent, _ = self.flush(sender, batched=batched)
+            total += sent
+            if not sent: break
+        return total
+
+    def stats(self, now=None):
+        """
+        Kedalaman antrian & lag: {items, rows, sheets, lag_s, retrying, next_try_s, dead, dead_rows,
+        dead_error, last_error, last_success}. items/rows/sheets tidak termasuk item dead-letter.
+        """
+        now = now or time.time()
+        with self.lock:
+            items, rows, sheets, oldest = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(n_rows), 0), COUNT(DISTINCT sheet), MIN(enqueued_at) FROM outbox WHERE dead = 0").fetchone()
+            retrying, next_try = self.conn.execute(
+                "SELECT COUNT(*), MIN(next_try) FROM outbox WHERE dead = 0 AND attempts > 0").fetchone()
+            dead, dead_rows = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(n_rows), 0) FROM outbox WHERE dead = 1").fetchone()
+            dead_err = self.conn.execute("SELECT last_error FROM outbox WHERE dead = 1 ORDER BY id DESC LIMIT 1").fetchone()
+            err = self.conn.execute("SELECT last_error FROM outbox WHERE last_error IS NOT NULL ORDER BY id DESC LIMIT 1").fetchone()
+            ok = self.conn.execute("SELECT value FROM outbox_meta WHERE key = 'last_success'").fetchone()
+        return {"items": items, "rows": rows, "sheets": sheets,
+                "lag_s": now - oldest if oldest else 0.0,
+                "retrying": retrying, "next_try_s": max(0.0, next_try - now) if next_try else None,
+                "dead": dead, "dead_rows": dead_rows, "dead_error": dead_err[0] if dead_err else None,
+                "last_error": err[0] if err else None, "last_success": ok[0] if ok else None}
+
+    def close(self):
+        with self.lock: self.conn.close()
+
+class OutboxFlusher(threading.Thread):
+    """
+    Flush setiap `interval` detik (lebih cepat jika masih ada sisa siap kirim), dipakai mode --loop.
+    Aman berjalan bersamaan dengan robot / run_all: item yang sedang diklaim pengirim lain dilewati.
+    """
+    def __init__(self, outbox, interval=FLUSH_INTERVAL, sender=None, on_error=None, batched=False):
+        super().__init__(name="sheet-outbox", daemon=True)
+        self.outbox = outbox
+        self.interval = interval
+        self.sender = sender
+        self.batched = batched
+        self.on_error = on_error
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            sent = 0
+            try: sent, _ = self.outbox.flush(self.sender, batched=self.batched)
+            except Exception as e:
+                if self.on_error: self.on_error(e)
+            if not sent: self._stop_event.wait(self.interval)
+
+    def stop(self, timeout=None):
+        self._stop_event.set()
+        self.join(timeout)
+
+_outbox = None
+_outbox_lock = threading.Lock()
+
+def get_outbox():
+    """Satu SheetOutbox per proses (robot, dashboard)."""
+    global _outbox
+    with _outbox_lock:
+        if _outbox is None: _outbox = SheetOutbox()
+        return _outbox
+
+def upload_deferred():
+    """True jika robot dijalankan oleh run_all (upload diserahkan ke akhir siklus)."""
+    return os.environ.get(DEFER_ENV, "") not in ("", "0")
+
+def flush_pending(sender=None, batched=False):
+    """Kirim sisa antrian sekarang (mis. di akhir robot, setelah GUI dilepas). Return (baris_terkirim, stats)."""
+    outbox = get_outbox()
+    sent = outbox.drain(sender, batched=batched)
+    return sent, outbox.stats()
+
+def upload_pending(log):
+    """
+    Kirim antrian upload Sheet setelah GUI robot selesai dipakai. Gagal -> tetap di antrian
+    (retry + backoff). log(modul, pesan, status) = broadcast_log robot.
+    """
+    if upload_deferred():
+        log("UPLOAD", "Deferred to sequencer (batched upload)", "QUEUED")
+        return
+    try:
+        sent, st = flush_pending()
+        status = "RETRY" if st["items"] else "SUCCESS"
+        log("UPLOAD", f"{sent} rows sent | {format_stats(st)}", status)
+    except Exception as e:
+        log("UPLOAD", f"Outbox Error: {e}", "FAIL")
+
+def format_stats(st):
+    lag = f"{st['lag_s']:.0f}s" if st["items"] else "-"
+    line = f"antrian {st['items']} capture / {st['rows']} baris ({st['sheets']} sheet) | lag {lag}"
+    if st["retrying"]: line += f" | retry {st['retrying']} (berikutnya {st['next_try_s']:.0f}s): {st['last_error']}"
+    if st["dead"]: line += f" | DEAD-LETTER {st['dead']} capture / {st['dead_rows']} baris (--retry-dead): {st['dead_error']}"
+    return line
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=config.OUTBOX_PATH, help="File SQLite antrian")
+    parser.add_argument("--loop", action="store_true", help="Jalan terus, Ctrl+C untuk berhenti")
+    parser.add_argument("--interval", type=float, default=FLUSH_INTERVAL, help="Jeda antar flush (detik) saat --loop")
+    parser.add_argument("--status", action="store_true", help="Hanya tampilkan kedalaman antrian & lag")
+    parser.add_argument("--batched", action="store_true", help="Semua sheet dalam satu request per putaran (dipakai run_all)")
+    parser.add_argument("--retry-dead", action="store_true", help="Kembalikan item dead-letter ke antrian lalu kirim")
+    args = parser.parse_args()
+
+    outbox = SheetOutbox(args.db)
+    exit_code = 0
+    try:
+        if args.retry_dead: print(f">>> {outbox.retry_dead()} item dead-letter dikembalikan ke antrian.")
+        if args.status:
+            print(format_stats(outbox.stats()))
+        elif args.loop:
+            flusher = OutboxFlusher(outbox, args.interval, on_error=lambda e: print(f"[OUTBOX] Error: {e}"), batched=args.batched)
+            flusher.start()
+            try:
+                while True:
+                    time.sleep(args.interval)
+                    print(f"[OUTBOX] {format_stats(outbox.stats())}")
+            except KeyboardInterrupt: flusher.stop()
+        else:
+            sent = outbox.drain(batched=args.batched)
+            st = outbox.stats()
+            print(f">>> {sent} baris terkirim | {format_stats(st)}")
+            exit_code = 1 if st["items"] else 0 # sisa antrian (sedang backoff) -> dicoba lagi siklus berikutnya
+    finally:
+        outbox.close()
+    sys.exit(exit_code)
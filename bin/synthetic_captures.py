@@ -0,0 +1,195 @@
+# FILE: bin/synthetic_captures.py
+# ================================================================
+# GENERATOR CAPTURE SINTETIS (PMDT LOC/GP/MM/OM & MARU DVOR/DME)
+# Format baris mengikuti yang dibaca batik_parser:
+# header RMS, kolom dipisah 2+ spasi, section ";" dan blok "Transmitter Data".
+# Dipakai untuk benchmark dan uji arsip tanpa alat sungguhan.
+# ================================================================
+
+import os
+import random
+from datetime import datetime, timedelta
+
+PMDT_KINDS = ["LOC", "GP", "MM", "OM"]
+MARU_KINDS = ["DVOR", "DME"]
+ALL_KINDS = PMDT_KINDS + MARU_KINDS
+
+# Nama folder arsip robot (config.get_output_folder)
+PMDT_FOLDERS = {"LOC": "LOCALIZER", "GP": "GLIDE PATH", "MM": "MIDDLE MARKER", "OM": "OUTER MARKER"}
+
+SEP = "=" * 40
+
+def _v(rnd, lo, hi, digits=2):
+    return f"{rnd.uniform(lo, hi):.{digits}f}"
+
+# --- PMDT ---
+def rms_header(rnd, active_tx=None):
+    """Header RMS STATUS SNAPSHOT seperti yang ditempel robot_pmdt."""
+    tx = active_tx or rnd.choice([1, 2])
+    def block(name):
+        tx1 = "G  Tx 1" if tx == 1 else "   Tx 1"
+        tx2 = "G  Tx 2" if tx == 2 else "   Tx 2"
+        return f"{name}\n  {tx1}     {tx2}\n"
+    text = f"{SEP}\nRMS STATUS SNAPSHOT\n{SEP}\n"
+    text += "RMS Status  Normal\n" + block("Antenna Select") + block("Main Select") + block("Transmitter On")
+    text += "Alarm   Normal   Normal\n"
+    text += f"{SEP}\nRAW DATA DETAILS\n{SEP}\n\n"
+    return text
+
+def _loc_monitor(rnd):
+    s = "Monitor Data\n          Monitor 1    Monitor 2\nIntegral   Enabled   Enabled\nCourse\n"
+    s += f"Centerline RF Level    {_v(rnd, 95, 105, 1)}    {_v(rnd, 95, 105, 1)}    %\n"
+    s += f"Centerline DDM    {_v(rnd, -.01, .01, 4)}    {_v(rnd, -.01, .01, 4)}    DDM\n"
+    s += f"Centerline SDM    {_v(rnd, 39, 41, 1)} %    {_v(rnd, 39, 41, 1)} %\n"
+    s += f"Ident Mod Percent    {_v(rnd, 9, 11, 1)}    {_v(rnd, 9, 11, 1)}    %\n"
+    s += f"Width DDM    {_v(rnd, .14, .16, 3)}    {_v(rnd, .14, .16, 3)}    DDM\n"
+    s += "Ident Status    Normal    Normal\nClearance\n"
+    s += f"RF Level    {_v(rnd, 95, 105, 1)}    {_v(rnd, 95, 105, 1)}    %\n"
+    s += f"Clearance 1 DDM    {_v(rnd, .17, .19, 3)}    {_v(rnd, .17, .19, 3)}    DDM\n"
+    s += f"SDM    {_v(rnd, 39, 41, 1)}    {_v(rnd, 39, 41, 1)}    %\n"
+    s += f"Ident Mod Percent    {_v(rnd, 9, 11, 1)}    {_v(rnd, 9, 11, 1)}    %\n"
+    s += f"Clearance 2 DDM    {_v(rnd, .17, .19, 3)}    {_v(rnd, .17, .19, 3)}    DDM\n"
+    s += "Ident Status    Normal    Normal\n"
+    s += f"RF Freq Difference    {_v(rnd, 7, 9)}    kHz    {_v(rnd, 7, 9)}    kHz\n"
+    s += "Antenna Fault    Normal    Normal\n"
+    return s
+
+def _gp_monitor(rnd):
+    s = "Monitor Data\n          Monitor 1    Monitor 2\nCourse\n"
+    s += f"Path RF Level    {_v(rnd, 95, 105, 1)}    {_v(rnd, 95, 105, 1)}    %\n"
+    s += f"Path DDM    {_v(rnd, -.01, .01, 4)}    {_v(rnd, -.01, .01, 4)}    DDM\n"
+    s += f"Path SDM    {_v(rnd, 79, 81, 1)}    {_v(rnd, 79, 81, 1)}    %\n"
+    s += f"Width DDM    {_v(rnd, .17, .18, 3)}    {_v(rnd, .17, .18, 3)}    DDM\n"
+    s += "Clearance\n"
+    s += f"RF Level    {_v(rnd, 95, 105, 1)}    {_v(rnd, 95, 105, 1)}    %\n"
+    s += f"150Hz Mod Percent    {_v(rnd, 39, 41, 1)}    {_v(rnd, 39, 41, 1)}    %\n"
+    s += "Synth Lock    Locked    Locked\n"
+    s += f"RF Freq Difference    {_v(rnd, 7, 9)} kHz    {_v(rnd, 7, 9)} kHz\n"
+    return s
+
+def _loc_gp_transmitter(rnd, is_gp):
+    right_fwd = "Forward Power" if is_gp else "CSB Forward Power"
+    right_ref = "Reflected Power" if is_gp else "CSB Reflected Power"
+    s = "Transmitter Data\nWattmeter\n"
+    s += f"CSB Forward Power    {_v(rnd, 10, 20)} Watts    {right_fwd}    {_v(rnd, 2, 4)} Watts\n"
+    s += f"CSB Reflected Power    {_v(rnd, 0, 1)} Watts    {right_ref}    {_v(rnd, 0, .2)} Watts\n"
+    for p in ("SBO Forward Power", "SBO Reflected Power"):
+        s += f"{p}    {_v(rnd, 0, 3)} Watts" + ("" if is_gp else f"    {p}    {_v(rnd, 0, 1)} Watts") + "\n"
+    s += "Standby\n"
+    s += f"CSB Forward Power    {_v(rnd, 0, .1)} Watts    {right_fwd}    {_v(rnd, 0, .1)} Watts\n"
+    s += f"SBO Forward Power    {_v(rnd, 0, .1)} Watts" + ("" if is_gp else f"    SBO Forward Power    {_v(rnd, 0, .1)} Watts") + "\n"
+    if is_gp:
+        for ant in ("Upper", "Middle", "Lower"):
+            s += f"{ant} Antenna Forward Power    {_v(rnd, 0, 5)} Watts\n"
+    return s
+
+def _marker_monitor(rnd):
+    s = "Monitor Data\nMonitor 1 Enabled\n"
+    for mon in (1, 2):
+        s += f"Monitor {mon}\n"
+        s += f"RF Level    {_v(rnd, -1, 1)}    {_v(rnd, -1, 1)}    {_v(rnd, -1, 1)}    dB\n"
+        s += f"Ident Modulation    {_v(rnd, 90, 100, 1)}    {_v(rnd, 90, 100, 1)}    {_v(rnd, 90, 100, 1)}    %\n"
+    return s
+
+def _marker_transmitter(rnd):
+    s = "Transmitter Data\n"
+    for tx in (1, 2):
+        s += f"Transmitter {tx}\n"
+        s += f"Forward Power    {_v(rnd, 1, 3)} Watts\nReflected Power    {_v(rnd, 0, .1)} Watts\nVSWR    {_v(rnd, 1, 1.2)} : 1\n"
+    return s
+
+def pmdt_parts(kind, rnd):
+    """Return (monitor_text, transmitter_text) seperti file TXT arsip robot_pmdt."""
+    header = rms_header(rnd)
+    if kind == "LOC": mon, tx = _loc_monitor(rnd), _loc_gp_transmitter(rnd, False)
+    elif kind == "GP": mon, tx = _gp_monitor(rnd), _loc_gp_transmitter(rnd, True)
+    else: mon, tx = _marker_monitor(rnd), _marker_transmitter(rnd)
+    return header + mon, header + tx
+
+def pmdt_capture(kind, rnd):
+    """Combined text (Monitor + Transmitter) yang diparse robot_pmdt."""
+    mon, tx = pmdt_parts(kind, rnd)
+    return mon + "\n\n" + tx
+
+# --- MARU ---
+def dvor_capture(rnd):
+    s = "# MARU 220 DVOR\n; ► Main Status\n- Status   NORMAL   NORMAL\n"
+    s += f"- CARRIER Output Power   {_v(rnd, 90, 110, 1)}W   {_v(rnd, 90, 110, 1)}W\n"
+    s += "; ► Monitor Measurement\n- IDENT Code   SLO   SLO\n"
+    s += "- CARRIER Frequency   113.100MHz   113.100MHz\n"
+    s += "- USB Frequency   113.109960 MHz   113.109960 MHz\n- LSB Frequency   113.090040 MHz   113.090040 MHz\n"
+    s += f"- CARRIER Output Power   {_v(rnd, 90, 110, 1)} W   {_v(rnd, 90, 110, 1)} W\n"
+    s += f"- RF Input Level   {_v(rnd, -20, -10)}dB   {_v(rnd, -20, -10)}dB\n"
+    s += f"- Azimuth   {_v(rnd, 0, 360)} deg   {_v(rnd, 0, 360)}deg\n"
+    s += f"- 9960Hz FM Index   {_v(rnd, 15, 17)}   {_v(rnd, 15, 17)}\n"
+    for p in ("30Hz AM Modulation Depth", "9960Hz AM Modulation Depth", "1020Hz AM Modulation Depth"):
+        s += f"- {p}   {_v(rnd, 10, 31, 1)}%   {_v(rnd, 10, 31, 1)} %\n"
+    for p in ("USB SIN Output Power", "USB COS Output Power", "LSB SIN Output Power", "LSB COS Output Power"):
+        s += f"- {p}   {_v(rnd, 1, 3)}Watts   {_v(rnd, 1, 3)}Watts\n"
+    s += f"- CPA Temperature   {_v(rnd, 25, 45, 1)}   {_v(rnd, 25, 45, 1)}\n"
+    s += f"- MSG Temperature   {_v(rnd, 25, 45, 1)}   {_v(rnd, 25, 45, 1)}\n"
+    s += "; DC Status\n"
+    s += f"- DC +5V   {_v(rnd, 4.9, 5.1)}V   {_v(rnd, 1, 2)}A   - DC +7V   {_v(rnd, 6.9, 7.1)} V   {_v(rnd, .5, 1)} A\n"
+    s += f"- DC +15V   {_v(rnd, 14.9, 15.1)}V   {_v(rnd, .1, .5)}A   - DC +28V   {_v(rnd, 27, 29)}V   {_v(rnd, 1, 3)}A\n"
+    s += f"- DC -15V   {_v(rnd, -15.1, -14.9)}V   {_v(rnd, .1, .5)}A\n"
+    s += f"; Battery Status\n- Battery +24V   {_v(rnd, 24, 27)}V   {_v(rnd, 0, 1)}A\n"
+    s += f"; AC Status\n- AC +28V   {_v(rnd, 27, 29)}V   {_v(rnd, 1, 3)}A\n"
+    if rnd.random() < .5: s += f"\n\n# [PDF_EVIDENCE] Active TX: TX{rnd.choice([1, 2])}"
+    return s
+
+def dme_capture(rnd):
+    s = "# MARU 310 DME\n; Configuration\n- Output Power   1000 W   1000 W\n"
+    s += f"- Active TXP   TXP{rnd.choice([1, 2])}\n"
+    s += "; ► MON Major Measurement\n- IDENT Code   SLO   SLO\n"
+    s += f"- Output Power   {_v(rnd, 900, 1100, 0)}W   {_v(rnd, 900, 1100, 0)} W\n"
+    s += "- Frequency   1151MHz   1151 MHz\n"
+    s += f"- System Delay   {_v(rnd, 49, 51)}usec   {_v(rnd, 49, 51)} usec\n"
+    s += f"- Reply Pulse Spacing   {_v(rnd, 11.9, 12.1)} usec   {_v(rnd, 11.9, 12.1)}usec\n"
+    s += f"- Reply Efficiency   {_v(rnd, 90, 100, 1)}%   {_v(rnd, 90, 100, 1)} %\n"
+    s += f"- Reply Pulse Rate   {_v(rnd, 800, 2700, 0)}pp/s   {_v(rnd, 800, 2700, 0)} pp/s\n"
+    for p in ("Reply Pulse Rise Time", "Reply Pulse Decay Time", "Reply Pulse Duration"):
+        s += f"- {p}   {_v(rnd, 1, 4)} usec   {_v(rnd, 1, 4)} usec\n"
+    s += f"; Temperature\n- HPA Temperature   {_v(rnd, 30, 40, 1)}   {_v(rnd, 30, 40, 1)}LPA Temperature   {_v(rnd, 30, 40, 1)}   {_v(rnd, 30, 40, 1)}\n"
+    s += "; Power Supply\n"
+    for part in ("AC/DC", "DC/DC", "Battery"):
+        s += f"- {part} Status   NORMAL   NORMAL\n"
+        s += f"- {part} Voltage   {_v(rnd, 24, 28)}V   {_v(rnd, 24, 28)}V\n"
+        s += f"- {part} Current   {_v(rnd, 0, 3)} A   {_v(rnd, 0, 3)}A\n"
+    return s
+
+def capture(kind, rnd):
+    if kind == "DVOR": return dvor_capture(rnd)
+    if kind == "DME": return dme_capture(rnd)
+    return pmdt_capture(kind, rnd)
+
+def generate(kind, count, seed=0):
+    """Hasilkan `count` capture teks untuk satu jenis alat."""
+    rnd = random.Random(f"{kind}-{seed}")
+    return [capture(kind, rnd) for _ in range(count)]
+
+def write_archive(root, count, seed=0, start=None, step=timedelta(hours=1)):
+    """
+    Tulis arsip palsu dengan struktur output/ robot:
+    PMDT/<ALAT>/Monitor_Data|Transmitter_Data/*.txt dan MARU/<ALAT>/*.txt
+    """
+    start = start or datetime(2025, 1, 1)
+    written = 0
+    for kind in ALL_KINDS:
+        rnd = random.Random(f"{kind}-{seed}")
+        for i in range(count):
+            ts = (start + step * i).strftime("%Y%m%d_%H%M%S")
+            if kind in PMDT_FOLDERS:
+                station = PMDT_FOLDERS[kind]
+                for data_type, text in zip(("Monitor_Data", "Transmitter_Data"), pmdt_parts(kind, rnd)):
+                    folder = os.path.join(root, "PMDT", station, data_type)
+                    os.makedirs(folder, exist_ok=True)
+                    with open(os.path.join(folder, f"{station}_{data_type}_{ts}.txt"), "w", encoding="utf-8") as f:
+                        f.write(text)
+                    written += 1
+            else:
+                folder = os.path.join(root, "MARU", kind)
+                os.makedirs(folder, exist_ok=True)
+                with open(os.path.join(folder, f"{kind}_{ts}.txt"), "w", encoding="utf-8") as f:
+                    f.write(capture(kind, rnd))
+                written += 1
+    return written
@@ -30,6 +30,7 @@ sys.path.append(BIN_DIR)
 import config 
 import sheet_handler 
 import batik_parser 
+import batik_read
 
 # --- SETUP ---
 CREDENTIALS_FILE = os.path.join(BASE_DIR, 'credentials.json')
@@ -103,6 +104,25 @@ def get_gspread_client():
     gc = gspread.authorize(creds)
     return gc, creds
 
+# Nama stasiun di SQLite lokal (sama dengan yang ditulis robot)
+DB_STATION_NAMES = {
+    "LOC": "LOCALIZER", "GP": "GLIDE PATH", "MM": "MIDDLE MARKER",
+    "OM": "OUTER MARKER", "DVOR": "DVOR", "DME": "DME"
+}
+
+@st.cache_resource
+def get_local_reader():
+    try: return batik_read.get_reader()
+    except Exception: return None
+
+# Read API ber-cache (invalidasi via PRAGMA data_version): rerun tanpa data baru tidak menyentuh SQL
+def get_last_local_save(tool_code):
+    reader = get_local_reader()
+    if not reader: return None
+    try: capture = reader.latest(DB_STATION_NAMES.get(tool_code, tool_code))
+    except Exception: return None
+    return capture["timestamp"] if capture else None
+
 def set_sheet_visibility(sh, sheet_id, visible=True):
     body = {
         "requests": [{"updateSheetProperties": {
@@ -429,6 +449,9 @@ def render_tool_card(tool_name, tool_code, script, args, is_ils=True, pad_height
         if pad_height > 0:
             st.markdown(f'<div style="height: {pad_height}px;"></div>', unsafe_allow_html=True)
 
+        last_local = get_last_local_save(tool_code)
+        if last_local: st.caption(f"💾 Tersimpan lokal: {last_local}")
+
         st.write("")
         with st.expander("📸 Lihat Evidence"):
             if evidence_file:
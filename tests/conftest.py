@@ -0,0 +1,6 @@
+# FILE: tests/conftest.py
+# Modul BATIK ada di bin/ (flat, diimpor langsung seperti oleh robot & dashboard)
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bin"))
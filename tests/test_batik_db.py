@@ -0,0 +1,119 @@
+# FILE: tests/test_batik_db.py
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+import batik_db
+import batik_parser
+import import_archive
+import synthetic_captures
+
+ARCHIVE_YEARS = list(range(2011, 2011 + batik_db.MAX_ATTACHED + 2))
+
+@pytest.fixture
+def archived_db(tmp_path):
+    """DB dengan satu session per tahun, semuanya dipindah ke arsip (> MAX_ATTACHED file)."""
+    db = batik_db.BatikDB(str(tmp_path / "batik.db"))
+    ids = {}
+    for year in ARCHIVE_YEARS:
+        rows = [batik_parser.ParamRow("Power", f"{year - 2000}.5 W", "-")]
+        ids[year] = db.save_session("DVOR", None, f"capture tahun {year}", None, timestamp=datetime(year, 6, 1), series=rows)
+    moved = db.archive_old(now=datetime(2030, 1, 1))
+    assert sorted(moved) == ARCHIVE_YEARS
+    yield db, ids
+    db.close()
+
+def test_query_series_reads_every_archive(archived_db):
+    db, _ = archived_db
+    rows = db.query_series("DVOR", "Power")
+    assert [r[0][:4] for r in rows] == [str(y) for y in ARCHIVE_YEARS]
+    assert [r[1] for r in rows] == [y - 2000 + 0.5 for y in ARCHIVE_YEARS]
+    assert len(db.attached) <= batik_db.MAX_ATTACHED
+
+def test_rebuild_rollups_includes_every_archive(archived_db):
+    db, _ = archived_db
+    assert db.rebuild_rollups() == len(ARCHIVE_YEARS)
+    assert len(db.query_rollup("DVOR", "Power", "daily")) == len(ARCHIVE_YEARS)
+
+def test_raw_and_existing_sessions_from_every_archive(archived_db):
+    db, ids = archived_db
+    for year in ARCHIVE_YEARS:
+        assert db.get_raw(ids[year]) == f"capture tahun {year}"
+    assert len(import_archive.load_existing(db)["DVOR"]) == len(ARCHIVE_YEARS)
+    if db.fts_live:
+        assert len(db.search_raw("capture", limit=50)) == len(ARCHIVE_YEARS)
+
+def legacy_db(path, captures=4):
+    """DB lama robot (schema baseline, raw di sessions.raw_clipboard, user_version 0)."""
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE sessions (id INTEGER PRIMARY KEY AUTOINCREMENT, station_name TEXT, timestamp DATETIME, evidence_path TEXT, raw_clipboard TEXT)")
+    conn.execute("CREATE TABLE measurements (id INTEGER PRIMARY KEY AUTOINCREMENT, session_id INTEGER, parameter_name TEXT, value_mon1 TEXT, value_mon2 TEXT)")
+    loc = synthetic_captures.generate("LOC", captures, seed=9)
+    dvor = synthetic_captures.generate("DVOR", captures, seed=9)
+    for i in range(captures):
+        ts = f"2026-03-0{i + 1} 08:00:0"
+        conn.execute("INSERT INTO sessions (station_name, timestamp, raw_clipboard) VALUES (?, ?, ?)", ("LOCALIZER", ts + "0", loc[i]))
+        conn.execute("INSERT INTO sessions (station_name, timestamp, raw_clipboard) VALUES (?, ?, ?)",
+                     ("LOCALIZER", ts + "5", "Transmitter Data\nCourse CSB Forward Power  10.1 W  10.2 W\n"))
+        conn.execute("INSERT INTO sessions (station_name, timestamp, raw_clipboard) VALUES (?, ?, ?)", ("DVOR", ts + "9", dvor[i]))
+    conn.commit()
+    conn.close()
+
+def table(db, name, order):
+    return db.conn.execute(f"SELECT * FROM {name} ORDER BY {order}").fetchall()
+
+def test_migration_is_ddl_only_and_backfill_runs_in_chunks(tmp_path, monkeypatch):
+    legacy_db(str(tmp_path / "chunked.db"))
+    legacy_db(str(tmp_path / "oneshot.db"))
+    db = batik_db.BatikDB(str(tmp_path / "chunked.db"))
+    try:
+        # membuka DB hanya menjalankan DDL; data lama menunggu "batik_db.py backfill"
+        assert [t[0] for t in db.pending_backfills()] == [t for t in batik_db.BACKFILL_TASKS if t != "fts" or db.has_fts]
+        assert db.conn.execute("SELECT COUNT(*) FROM series").fetchone()[0] == 0
+        assert db.get_raw(2).startswith("Transmitter Data") # raw lama tetap terbaca sebelum dipindah
+
+        monkeypatch.setattr(batik_db, "BACKFILL_CHUNK", 4) # batas chunk jatuh di tengah pasangan Monitor/Transmitter
+        commits = db.write_seq
+        done = db.run_backfills(log=None)
+        assert db.write_seq - commits > len(done) + 1 # banyak transaksi kecil, bukan satu transaksi besar
+        assert db.pending_backfills() == []
+        assert db.conn.execute("SELECT COUNT(*) FROM sessions WHERE raw_clipboard IS NOT NULL").fetchone()[0] == 0
+
+        monkeypatch.setattr(batik_db, "BACKFILL_CHUNK", 5000)
+        ref = batik_db.BatikDB(str(tmp_path / "oneshot.db"))
+        try:
+            ref.run_backfills(log=None)
+            assert table(db, "series", "session_id, parameter_name") == table(ref, "series", "session_id, parameter_name")
+            assert table(db, "rollup_daily", "1, 2, 3, 4") == table(ref, "rollup_daily", "1, 2, 3, 4")
+        finally:
+            ref.close()
+        assert {r[0] for r in db.conn.execute("SELECT session_id FROM series")} == {1, 3, 4, 6, 7, 9, 10, 12}
+        if db.has_fts:
+            assert len(db.search_raw('"Forward Power"', limit=50)) == 8
+    finally:
+        db.close()
+
+def test_incremental_rollups_match_rebuild(tmp_path):
+    db = batik_db.BatikDB(str(tmp_path / "batik.db"))
+    try:
+        # melintasi batas jam & hari; satu capture datang terlambat (urut insert != urut waktu)
+        stamps = [datetime(2026, 3, 1, 22, 59, 59), datetime(2026, 3, 1, 23, 0, 0), datetime(2026, 3, 1, 23, 59, 59),
+                  datetime(2026, 3, 2, 0, 0, 0), datetime(2026, 3, 1, 23, 30, 0), datetime(2026, 3, 2, 0, 45, 0)]
+        for i, ts in enumerate(stamps):
+            rows = [batik_parser.ParamRow("Power", f"{10 + i}.5 W", f"{20 - i} W" if i % 2 else "-"),
+                    batik_parser.ParamRow("Status", "NORMAL", "NORMAL")]
+            db.save_session("DVOR", None, f"capture {i}", None, timestamp=ts, series=rows)
+        incremental = {p: table(db, f"rollup_{p}", "1, 2, 3, 4") for p in batik_db.ROLLUP_PERIODS}
+        assert db.rebuild_rollups() == len(stamps) # baris Status (teks) tidak masuk series
+        for period, rows in incremental.items():
+            assert table(db, f"rollup_{period}", "1, 2, 3, 4") == rows
+
+        assert db.query_rollup("DVOR", "Power", "hourly", monitor=1) == [
+            ("2026-03-01 22", 1, 1, 10.5, 10.5, 10.5, 10.5),
+            ("2026-03-01 23", 1, 3, 11.5, 14.5, 38.5 / 3, 12.5), # vlast = 23:59:59, bukan insert terakhir
+            ("2026-03-02 00", 1, 2, 13.5, 15.5, 14.5, 15.5)]
+        assert db.query_rollup("DVOR", "Power", "daily", monitor=2) == [
+            ("2026-03-01", 2, 1, 19.0, 19.0, 19.0, 19.0), ("2026-03-02", 2, 2, 15.0, 17.0, 16.0, 15.0)]
+    finally:
+        db.close()
@@ -0,0 +1,14 @@
+# FILE: tests/test_batik_delta.py
+import json
+
+import batik_delta
+import batik_parser
+
+def test_last_capture_saved_as_row_dicts(tmp_path):
+    rows = [batik_parser.ParamRow("Power", "12.3 W", "-"), batik_parser.ParamRow("RF Level", "NORMAL", "NORMAL")]
+    delta = batik_delta.diff_rows("DVOR", None, rows, 1)
+    batik_delta.save_last_capture(delta, str(tmp_path))
+    with open(batik_delta._state_path("DVOR", str(tmp_path)), encoding="utf-8") as f: data = json.load(f)
+    assert data["rows"][0] == {"Parameter": "Power", "Monitor 1": "12.3 W", "Monitor 2": "-"}
+    loaded = batik_delta.load_last_capture("DVOR", str(tmp_path))
+    assert loaded.rows == rows and loaded.fingerprint == delta.fingerprint
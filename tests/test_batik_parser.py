@@ -0,0 +1,74 @@
+# FILE: tests/test_batik_parser.py
+import io
+import math
+
+import pytest
+
+import batik_parser
+import bench_parser
+import synthetic_captures
+from batik_parser import STATUS_MISSING, STATUS_NUMERIC, STATUS_TEXT
+
+@pytest.mark.parametrize("val, expected", [
+    ("12.3 W", (12.3, "W")),
+    ("1.5 watts", (1.5, "W")),
+    ("-3.2 DDM", (-3.2, "DDM")),
+    ("40 %", (40.0, "%")),
+    ("1020Hz", (1020.0, "Hz")),
+    ("5 kHz", (5.0, "kHz")),
+    ("7", (7.0, "")),
+])
+def test_parse_numeric_with_known_unit(val, expected):
+    num, unit, status = batik_parser.parse_numeric(batik_parser.normalize_with_unit(val))
+    assert (num, unit, status) == expected + (STATUS_NUMERIC,)
+
+@pytest.mark.parametrize("val", ["12:30:45", "1.2.3", "12.3 W ALARM", "3 dB FAULT", "NORMAL", "Tx 1"])
+def test_parse_numeric_rejects_trailing_text(val):
+    num, unit, status = batik_parser.parse_numeric(batik_parser.normalize_with_unit(val))
+    assert math.isnan(num) and unit == "" and status == STATUS_TEXT
+
+def test_parse_numeric_missing():
+    assert batik_parser.parse_numeric("-")[2] == STATUS_MISSING
+    assert batik_parser.parse_numeric("")[2] == STATUS_MISSING
+
+def test_parse_cache_keeps_same_named_parsers_apart():
+    def parser_a(station_type, text): return [("A", text, "-")], 1
+    def parser_b(station_type, text): return [("B", text, "-")], 2
+    parser_b.__qualname__ = parser_a.__qualname__ # mis. parse_data di dua modul berbeda
+    parser_b.__module__ = "robot_lain"
+    cache = batik_parser.ParseCache()
+    assert cache.get_or_parse(parser_a, "LOC", "teks") == ([("A", "teks", "-")], 1)
+    assert cache.get_or_parse(parser_b, "LOC", "teks") == ([("B", "teks", "-")], 2)
+    assert cache.get_or_parse(parser_a, "LOC", "teks")[1] == 1
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_param_row_behaves_like_legacy_dict():
+    row = batik_parser.ParamRow("Power", "12.3 W", "-")
+    assert "Monitor 1" in row and "Parameter" in row
+    assert "12.3 W" not in row and "Unknown" not in row
+    assert dict(row) == {"Parameter": "Power", "Monitor 1": "12.3 W", "Monitor 2": "-"}
+    assert row["Monitor 1"] == row[1] == row.mon1
+
+def test_normalize_matches_legacy_chain_on_samples():
+    assert bench_parser.check_normalize_equivalence(0) == []
+
+@pytest.mark.parametrize("seed", [20, 1, 2])
+def test_normalize_matches_legacy_chain_fuzz(seed):
+    values = list(bench_parser.fuzz_values(20000, seed))
+    assert [v for v in values if batik_parser.normalize_with_unit(v) != bench_parser.reference_normalize(v)] == []
+
+@pytest.mark.parametrize("kind", synthetic_captures.ALL_KINDS)
+def test_streaming_splits_lines_like_text(tmp_path, kind):
+    lines_func, text_func = ((batik_parser.parse_maru_lines, batik_parser.parse_maru_data) if kind in synthetic_captures.MARU_KINDS
+                             else (batik_parser.parse_pmdt_lines, batik_parser.parse_pmdt_strict))
+    text = synthetic_captures.generate(kind, 1, seed=4)[0]
+    # ganti beberapa \n dengan pemisah lain yang juga dipecah str.splitlines() (form feed dari PDF, dsb.)
+    for i, sep in enumerate(["\x0c", "\x0b", "\x1c", "\x1d", "\x1e", "\x85", "\u2028", "\u2029", "\r"]):
+        pos = text.find("\n", (i + 1) * len(text) // 11)
+        if pos > 0: text = text[:pos] + sep + text[pos + 1:]
+    path = tmp_path / "capture.txt"
+    path.write_text(text, encoding="utf-8", newline="")
+    expected = text_func(kind, text)
+    assert lines_func(kind, io.StringIO(text)) == expected
+    with open(path, encoding="utf-8", newline="") as f: assert lines_func(kind, f) == expected
+    assert lines_func(kind, text.splitlines(keepends=True)) == expected
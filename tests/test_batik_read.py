@@ -0,0 +1,30 @@
+# FILE: tests/test_batik_read.py
+from datetime import datetime
+
+import batik_db
+import batik_parser
+import batik_read
+
+def save(db, value, ts):
+    rows = [batik_parser.ParamRow("Power", f"{value} W", "-")]
+    return db.save_session("DVOR", None, f"capture {value}", rows, timestamp=ts)
+
+def test_cache_invalidates_on_write_from_another_connection(tmp_path):
+    path = str(tmp_path / "batik.db")
+    reader_db, writer_db = batik_db.BatikDB(path), batik_db.BatikDB(path) # mis. dashboard & robot
+    try:
+        reader = batik_read.BatikReader(reader_db)
+        save(writer_db, 10.5, datetime(2026, 3, 1, 8, 0))
+        assert reader.latest("DVOR")["rows"][0].mon1 == "10.5 W"
+        assert reader.history("DVOR", "Power") == (("2026-03-01 08:00:00", 10.5, None),)
+        reader.latest("DVOR"), reader.history("DVOR", "Power")
+        assert reader.stats()["hits"] == 2 # tanpa tulisan baru -> dari cache
+
+        sid = save(writer_db, 11.5, datetime(2026, 3, 1, 9, 0))
+        latest = reader.latest("DVOR")
+        assert (latest["session_id"], latest["rows"][0].mon1) == (sid, "11.5 W")
+        assert reader.history("DVOR", "Power") == (("2026-03-01 08:00:00", 10.5, None), ("2026-03-01 09:00:00", 11.5, None))
+        assert reader.stats()["hits"] == 2
+    finally:
+        reader_db.close()
+        writer_db.close()
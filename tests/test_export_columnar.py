@@ -0,0 +1,58 @@
+# FILE: tests/test_export_columnar.py
+import math
+from datetime import datetime
+
+import pytest
+
+import batik_db
+import batik_parser
+import export_columnar
+
+# (timestamp, Power mon1, RF Level mon1, RF Level mon2); 2025-06 masuk arsip, 2025-12 tetap di DB utama
+CAPTURES = [(datetime(2025, 6, 1, 8, 0), "12.5 W", "-3.2 DDM", "-3.1 DDM"),
+            (datetime(2025, 12, 15, 8, 0), "12.7 W", "-3.0 DDM", "-"),
+            (datetime(2026, 1, 10, 8, 0), "13.1 W", "-2.9 DDM", "-2.8 DDM")]
+
+@pytest.fixture
+def db(tmp_path):
+    db = batik_db.BatikDB(str(tmp_path / "batik.db"))
+    for ts, power, rf1, rf2 in CAPTURES:
+        rows = [batik_parser.ParamRow("Power", power, "-"), batik_parser.ParamRow("RF Level", rf1, rf2)]
+        db.save_session("DVOR", None, f"capture {ts}", rows, timestamp=ts)
+    assert db.archive_old(keep_days=365, now=datetime(2026, 12, 1)) == {2025: 1}
+    yield db
+    db.close()
+
+def expected_rows(year):
+    """Baris partisi DVOR satu tahun: (ts, parameter, mon1, mon2, unit), mon kosong = None."""
+    out = []
+    for ts, power, rf1, rf2 in CAPTURES:
+        if ts.year != year: continue
+        for param, m1, m2 in [("Power", power, "-"), ("RF Level", rf1, rf2)]:
+            v1, unit = batik_db._numeric(m1)
+            out.append((ts, param, v1, batik_db._numeric(m2)[0], unit))
+    return sorted(out)
+
+def nan_to_none(v):
+    return None if v is None or math.isnan(v) else v
+
+def test_export_npz_round_trip(tmp_path, db):
+    files = export_columnar.export_columnar(db, str(tmp_path / "export"), "npz")
+    assert [(p.split("DVOR_")[-1], n) for p, n in files] == [("2025.npz", 4), ("2026.npz", 2)]
+    for path, _ in files:
+        cols = export_columnar.load_npz(path)
+        assert {k: cols[k].dtype.kind for k in ["ts", "param", "mon1", "mon2", "unit"]} == \
+            {"ts": "M", "param": "i", "mon1": "f", "mon2": "f", "unit": "i"}
+        rows = sorted((ts.astype(datetime), str(cols["params"][p]), nan_to_none(m1), nan_to_none(m2), str(cols["units"][u]))
+                      for ts, p, m1, m2, u in zip(cols["ts"], cols["param"], cols["mon1"], cols["mon2"], cols["unit"]))
+        assert rows == expected_rows(int(path[-8:-4]))
+
+def test_export_parquet_round_trip(tmp_path, db):
+    pq = pytest.importorskip("pyarrow.parquet")
+    files = export_columnar.export_columnar(db, str(tmp_path / "export"), "parquet")
+    assert [(p.split("DVOR_")[-1], n) for p, n in files] == [("2025.parquet", 4), ("2026.parquet", 2)]
+    for path, _ in files:
+        table = pq.read_table(path)
+        assert table.column_names == ["ts", "parameter", "mon1", "mon2", "unit"]
+        rows = sorted((r["ts"], r["parameter"], nan_to_none(r["mon1"]), nan_to_none(r["mon2"]), r["unit"]) for r in table.to_pylist())
+        assert rows == expected_rows(int(path[-12:-8]))
@@ -0,0 +1,46 @@
+# FILE: tests/test_import_archive.py
+import os
+
+import pytest
+
+import batik_db
+import import_archive
+import synthetic_captures
+
+def write_capture(root, *parts, text):
+    path = os.path.join(root, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f: f.write(text)
+
+@pytest.fixture
+def archive_root(tmp_path):
+    root = str(tmp_path / "output")
+    loc = synthetic_captures.generate("LOC", 1, seed=5)[0]
+    write_capture(root, "PMDT", "LOCALIZER", "Monitor_Data", "LOCALIZER_Monitor_Data_20260301_080000.txt", text=loc)
+    write_capture(root, "PMDT", "LOCALIZER", "Transmitter_Data", "LOCALIZER_Transmitter_Data_20260301_080005.txt",
+                  text="Transmitter Data\nCourse CSB Forward Power  10.1 W  10.2 W\n")
+    write_capture(root, "MARU", "DVOR", "DVOR_20260301_080100.txt", text=synthetic_captures.generate("DVOR", 1, seed=5)[0])
+    return root
+
+def test_import_writes_sessions_like_the_robots(tmp_path, archive_root):
+    db = batik_db.BatikDB(str(tmp_path / "batik.db"))
+    try:
+        imported, errors = import_archive.import_archive(db, archive_root, workers=1)
+        assert (imported, errors) == (2, 0)
+        sessions = db.conn.execute("SELECT id, station_name, evidence_path, tx_status FROM sessions ORDER BY id").fetchall()
+        # PMDT: session Monitor + Transmitter (seperti robot_pmdt), MARU: satu session
+        assert [s[1] for s in sessions] == ["LOCALIZER", "LOCALIZER", "DVOR"]
+        assert "Monitor_Data" in sessions[0][2] and "Transmitter_Data" in sessions[1][2]
+        assert all(s[3] is None for s in sessions) # tidak ada status TX karangan
+        with_series = [r[0] for r in db.conn.execute("SELECT DISTINCT session_id FROM series ORDER BY session_id")]
+        assert with_series == [sessions[0][0], sessions[2][0]]
+        assert db.get_raw(sessions[1][0]).startswith("Transmitter Data")
+
+        # isi ulang series dari raw (migrasi / backfill-series) memberi hasil yang sama
+        before = db.conn.execute("SELECT * FROM series ORDER BY session_id, parameter_name").fetchall()
+        db.backfill_series()
+        assert db.conn.execute("SELECT * FROM series ORDER BY session_id, parameter_name").fetchall() == before
+
+        assert import_archive.import_archive(db, archive_root, workers=1) == (0, 0) # sudah ada -> dilewati
+    finally:
+        db.close()
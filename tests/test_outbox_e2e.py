@@ -0,0 +1,89 @@
+# FILE: tests/test_outbox_e2e.py
+# Robot enqueue -> outbox -> sheet_handler -> fake_gspread (Sheets lokal), termasuk error kuota 429
+import time
+from datetime import datetime
+
+import pytest
+
+import batik_parser
+import fake_gspread
+import sheet_handler
+import sheet_outbox
+import synthetic_captures
+
+CAPTURE_TS = [datetime(2026, 3, 1, 8, 0, 0), datetime(2026, 3, 1, 9, 0, 0)]
+
+@pytest.fixture
+def backend():
+    backend = fake_gspread.FakeBackend(seed=7)
+    backend.create(sheet_handler.SHEET_NAME)
+    sheet_handler.set_client_factory(backend.client)
+    yield backend
+    sheet_handler.set_client_factory(None)
+
+@pytest.fixture
+def outbox(tmp_path):
+    outbox = sheet_outbox.SheetOutbox(str(tmp_path / "outbox.db"))
+    yield outbox
+    outbox.close()
+
+def enqueue_captures(outbox):
+    """Seperti robot: parse capture lalu enqueue. Return {judul sheet: baris payload yang diharapkan}."""
+    expected = {}
+    for kind in ["LOC", "GP", "DVOR"]:
+        parse = batik_parser.parse_maru_data if kind in synthetic_captures.MARU_KINDS else batik_parser.parse_pmdt_strict
+        for ts, text in zip(CAPTURE_TS, synthetic_captures.generate(kind, len(CAPTURE_TS), seed=3)):
+            rows, active_tx = parse(kind, text)
+            outbox.enqueue(kind, rows, ts, active_tx)
+            expected.setdefault(sheet_handler.raw_sheet_title(kind, ts), []).extend(
+                sheet_handler.build_payload(rows, ts, active_tx))
+    return expected
+
+def sheet_rows(backend, title):
+    ws = backend.spreadsheets[sheet_handler.SHEET_NAME]._by_title(title)
+    return [[fake_gspread._cell_text(v) for v in r] for r in ws.values]
+
+def assert_delivered(backend, outbox, expected):
+    st = outbox.stats()
+    assert (st["items"], st["dead"]) == (0, 0)
+    for title, rows in expected.items():
+        want = [sheet_handler.RAW_HEADER] + [[fake_gspread._cell_text(v) for v in r] for r in rows]
+        assert sheet_rows(backend, title) == want
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_enqueue_flush_reaches_sheets(backend, outbox, batched):
+    expected = enqueue_captures(outbox)
+    assert outbox.drain(batched=batched) == sum(len(r) for r in expected.values())
+    assert_delivered(backend, outbox, expected)
+    if batched: assert backend.calls["batch_update"] == 1
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_quota_errors_retry_in_order_without_duplicates(backend, outbox, batched):
+    expected = enqueue_captures(outbox)
+    sheet_handler.get_spreadsheet() # login sebelum error disuntikkan
+    backend.error_rate = 0.3
+    clock = time.time()
+    for _ in range(200):
+        clock += sheet_outbox.BACKOFF_MAX * 1.2 # lompat melewati backoff terpanjang
+        outbox.flush(now=clock, batched=batched)
+        if not outbox.stats()["items"]: break
+    assert backend.errors > 0
+    assert_delivered(backend, outbox, expected)
+
+def test_upload_pending_flushes_and_logs(monkeypatch, backend, outbox):
+    expected = enqueue_captures(outbox)
+    monkeypatch.setattr(sheet_outbox, "_outbox", outbox)
+    monkeypatch.delenv(sheet_outbox.DEFER_ENV, raising=False)
+    logs = []
+    sheet_outbox.upload_pending(lambda module, msg, status: logs.append(status))
+    assert logs == ["SUCCESS"]
+    assert_delivered(backend, outbox, expected)
+
+def test_upload_pending_deferred_to_run_all(monkeypatch, outbox):
+    monkeypatch.setattr(sheet_outbox, "_outbox", outbox)
+    monkeypatch.setenv(sheet_outbox.DEFER_ENV, "1")
+    outbox.enqueue_payload("RAW_LOC_2026", [["x"]])
+    logs = []
+    sheet_outbox.upload_pending(lambda module, msg, status: logs.append(status))
+    assert logs == ["QUEUED"]
+    assert outbox.stats()["items"] == 1
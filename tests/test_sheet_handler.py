@@ -0,0 +1,59 @@
+# FILE: tests/test_sheet_handler.py
+import gspread
+import pytest
+
+import fake_gspread
+import sheet_handler
+
+TITLE = "RAW_DVOR_2026"
+ROW = ["2026-01-01 00:00:00", "2026-01-01", "00:00:00", "Power", "12.3 W", "-", 1, "TEST"]
+
+@pytest.fixture
+def backend():
+    backend = fake_gspread.FakeBackend()
+    backend.create(sheet_handler.SHEET_NAME)
+    sheet_handler.set_client_factory(backend.client)
+    sheet_handler.get_spreadsheet() # login awal di luar hitungan test
+    backend.reset_stats()
+    yield backend
+    sheet_handler.set_client_factory(None)
+
+def fail_once(monkeypatch, backend, method, error):
+    sh = backend.spreadsheets[sheet_handler.SHEET_NAME]
+    original = getattr(sh, method)
+    state = {"raised": False}
+    def wrapper(*args, **kwargs):
+        if not state["raised"]:
+            state["raised"] = True
+            raise error
+        return original(*args, **kwargs)
+    monkeypatch.setattr(sh, method, wrapper)
+
+def rows_of(backend, title):
+    return backend.spreadsheets[sheet_handler.SHEET_NAME].worksheet(title).get_all_values()[1:]
+
+@pytest.mark.parametrize("error", [fake_gspread.api_error(401, "Invalid Credentials", "UNAUTHENTICATED"),
+                                   ConnectionError("connection reset")])
+def test_auth_and_transport_errors_reconnect_and_retry(monkeypatch, backend, error):
+    fail_once(monkeypatch, backend, "batch_update", error)
+    sheet_handler.append_many({TITLE: [ROW]})
+    assert backend.logins == 1
+    assert len(rows_of(backend, TITLE)) == 1
+
+@pytest.mark.parametrize("error", [fake_gspread.quota_error(), fake_gspread.api_error(400, "Invalid request")])
+def test_quota_and_client_errors_are_raised_without_retry(monkeypatch, backend, error):
+    fail_once(monkeypatch, backend, "batch_update", error)
+    with pytest.raises(gspread.exceptions.APIError):
+        sheet_handler.append_many({TITLE: [ROW]})
+    assert backend.logins == 0
+    sheet_handler.append_many({TITLE: [ROW]}) # percobaan berikutnya (backoff outbox) berhasil
+    assert len(rows_of(backend, TITLE)) == 1
+
+def test_append_raw_quota_error_is_not_retried(monkeypatch, backend):
+    sheet_handler.append_raw(TITLE, [ROW])
+    backend.reset_stats()
+    fail_once(monkeypatch, backend, "values_append", fake_gspread.quota_error())
+    with pytest.raises(gspread.exceptions.APIError):
+        sheet_handler.append_raw(TITLE, [ROW])
+    assert backend.logins == 0
+    assert len(rows_of(backend, TITLE)) == 1
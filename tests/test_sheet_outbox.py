@@ -0,0 +1,103 @@
+# FILE: tests/test_sheet_outbox.py
+import threading
+import time
+
+import pytest
+
+import fake_gspread
+import sheet_outbox
+
+FAR_FUTURE = 1e12 # flush(now=...) melewati semua jeda backoff
+
+@pytest.fixture
+def outbox(tmp_path):
+    outbox = sheet_outbox.SheetOutbox(str(tmp_path / "outbox.db"), max_attempts=3)
+    yield outbox
+    outbox.close()
+
+def fill(outbox, sheets):
+    for sheet in sheets: outbox.enqueue_payload(sheet, [[sheet, 1]])
+
+class BatchSender:
+    """Sender batched palsu: gagal jika batch berisi sheet `bad`, error bisa diganti (mis. 429)."""
+    def __init__(self, bad=None, error=None):
+        self.bad, self.error, self.sent, self.calls = bad, error, {}, 0
+
+    def __call__(self, groups):
+        self.calls += 1
+        if self.error is not None: raise self.error
+        if self.bad in groups: raise ValueError(f"sheet {self.bad} rusak")
+        for sheet, rows in groups.items(): self.sent.setdefault(sheet, []).extend(rows)
+
+def test_batched_failure_isolates_bad_sheet(outbox):
+    fill(outbox, ["RAW_LOC_2026", "RAW_BAD_2026", "RAW_GP_2026"])
+    sender = BatchSender(bad="RAW_BAD_2026")
+    assert outbox.flush(sender, batched=True) == (2, 1)
+    assert sorted(sender.sent) == ["RAW_GP_2026", "RAW_LOC_2026"]
+    st = outbox.stats()
+    assert (st["items"], st["retrying"]) == (1, 1)
+
+def test_batched_quota_error_backs_off_everything(outbox):
+    fill(outbox, ["RAW_LOC_2026", "RAW_GP_2026"])
+    sender = BatchSender(error=fake_gspread.quota_error())
+    assert outbox.flush(sender, batched=True) == (0, 2)
+    assert sender.calls == 1
+    assert outbox.stats()["retrying"] == 2
+
+def test_dead_letter_after_max_attempts(outbox):
+    fill(outbox, ["RAW_BAD_2026", "RAW_LOC_2026"])
+    sender = BatchSender(bad="RAW_BAD_2026")
+    for _ in range(outbox.max_attempts):
+        outbox.flush(sender, now=FAR_FUTURE, batched=True)
+    st = outbox.stats()
+    assert (st["items"], st["dead"], st["dead_rows"]) == (0, 1, 1)
+    assert "RAW_BAD_2026" in st["dead_error"]
+    assert "DEAD-LETTER 1" in sheet_outbox.format_stats(st)
+    assert outbox.due(FAR_FUTURE) == []
+    # item baru untuk sheet yang sama tidak tertahan oleh item dead-letter
+    outbox.enqueue_payload("RAW_BAD_2026", [["baru", 2]])
+    assert len(outbox.due(time.time())) == 1
+    assert outbox.retry_dead() == 1
+    assert outbox.stats()["dead"] == 0
+
+def test_concurrent_drainers_send_each_item_once(tmp_path):
+    path = str(tmp_path / "outbox.db")
+    outboxes = [sheet_outbox.SheetOutbox(path) for _ in range(3)]
+    try:
+        for i in range(30): outboxes[0].enqueue_payload(f"RAW_{i % 3}_2026", [[i]])
+        sent, lock = [], threading.Lock()
+        def sender(sheet, rows):
+            time.sleep(0.01) # request Sheets yang lambat: pengirim lain sempat melihat antrian
+            with lock: sent.extend(r[0] for r in rows)
+        threads = [threading.Thread(target=o.drain, args=(sender,)) for o in outboxes]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        assert sorted(sent) == list(range(30))
+        for n in range(3): assert [i for i in sent if i % 3 == n] == list(range(n, 30, 3)) # urut per sheet
+        assert outboxes[0].stats()["items"] == 0
+    finally:
+        for o in outboxes: o.close()
+
+def test_claimed_sheet_is_skipped_until_lease_expires(tmp_path):
+    path = str(tmp_path / "outbox.db")
+    a, b = sheet_outbox.SheetOutbox(path), sheet_outbox.SheetOutbox(path)
+    try:
+        fill(a, ["RAW_LOC_2026", "RAW_LOC_2026"])
+        now = time.time()
+        assert [i[0] for i in a.claim(now, limit=1)] == [1]
+        # item ke-2 sheet yang sama tidak boleh mendahului item ke-1 yang sedang dikirim a
+        assert b.claim(now) == []
+        # a mati tanpa melepas klaim -> setelah lease habis b mengirim semuanya
+        sender = BatchSender()
+        assert b.flush(sender, now=now + sheet_outbox.CLAIM_LEASE + 1, batched=True) == (2, 0)
+        assert sender.sent == {"RAW_LOC_2026": [["RAW_LOC_2026", 1], ["RAW_LOC_2026", 1]]}
+    finally:
+        a.close()
+        b.close()
+
+def test_interrupted_send_releases_claim(outbox):
+    fill(outbox, ["RAW_LOC_2026"])
+    def sender(sheet, rows): raise KeyboardInterrupt
+    with pytest.raises(KeyboardInterrupt):
+        outbox.flush(sender)
+    assert outbox.stats()["retrying"] == 0 and len(outbox.due()) == 1